@@ -2,6 +2,8 @@ import collections
 import datetime
 import json
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -209,6 +211,22 @@ class TestAdminPageListing(AdminAPITestCase, TestPageListing):
                 'title': "Blog index"
             })
 
+    def test_fields_parent_fetched_in_bulk(self):
+        self.get_response(limit=20, fields='parent')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_response(limit=20)
+
+        with CaptureQueriesContext(connection) as parent_queries:
+            response = self.get_response(limit=20, fields='parent')
+
+        content = json.loads(response.content.decode('UTF-8'))
+        for page in content['items']:
+            self.assertEqual(page['meta']['parent']['id'], Page.objects.get(id=page['id']).get_parent().id)
+
+        # The parents of all the pages are fetched with one query
+        self.assertEqual(len(parent_queries), len(queries) + 1)
+
     def test_fields_descendants(self):
         response = self.get_response(fields='descendants')
         content = json.loads(response.content.decode('UTF-8'))
@@ -1,22 +1,78 @@
+import base64
+import binascii
+import json
 from collections import OrderedDict
 
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
 from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
 
 from .utils import BadRequestError
 
 
-class WagtailPagination(BasePagination):
-    def paginate_queryset(self, queryset, request, view=None):
-        limit_max = getattr(settings, 'WAGTAILAPI_LIMIT_MAX', 20)
+def get_keyset_ordering(queryset):
+    """
+    Returns the ordering of the given queryset as a list of (field name, model
+    field, descending) tuples that can be used for cursor pagination. The primary
+    key is added to the end if none of the fields are unique, so that every object
+    has a distinct position.
+    """
+    model = queryset.model
+    order_by = queryset.query.order_by or model._meta.ordering
+    ordering = []
+
+    for term in order_by:
+        if not isinstance(term, str) or term == '?':
+            raise BadRequestError("cursor pagination is not supported with this ordering")
+
+        descending = term.startswith('-')
+        field_name = term.lstrip('-')
 
         try:
-            offset = int(request.GET.get('offset', 0))
-            if offset < 0:
-                raise ValueError()
-        except ValueError:
-            raise BadRequestError("offset must be a positive integer")
+            field = model._meta.pk if field_name == 'pk' else model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            raise BadRequestError("cursor pagination is not supported with this ordering")
+
+        if field.is_relation or field.null:
+            raise BadRequestError("cursor pagination cannot be used when ordering by '%s'" % field_name)
+
+        # Querysets ordered with .reverse() keep their order_by terms but flip their direction
+        if not queryset.query.standard_ordering:
+            descending = not descending
+
+        ordering.append((field_name, field, descending))
+
+    if not any(field.unique for field_name, field, descending in ordering):
+        ordering.append(('pk', model._meta.pk, False))
+
+    return ordering
+
+
+def encode_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeError, ValueError):
+        raise BadRequestError("cursor is invalid")
+
+
+class WagtailPagination(BasePagination):
+    """
+    Paginates listings with the ?offset and ?limit parameters.
+
+    Listings can also be paginated with the ?cursor parameter instead of ?offset,
+    starting with an empty cursor. The items are then fetched from the position
+    after the last item of the previous page (keyset pagination), so deep pages
+    are as fast to fetch as the first one, and each page gives the cursor of the
+    next one.
+    """
+    def get_limit(self, request):
+        limit_max = getattr(settings, 'WAGTAILAPI_LIMIT_MAX', 20)
 
         try:
             limit_default = 20 if not limit_max else min(20, limit_max)
@@ -30,18 +86,107 @@ class WagtailPagination(BasePagination):
             raise BadRequestError(
                 "limit cannot be higher than %d" % limit_max)
 
+        return limit
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        self.request = request
+
+        if 'cursor' in request.GET:
+            return self.paginate_queryset_with_cursor(queryset, request)
+
+        try:
+            offset = int(request.GET.get('offset', 0))
+            if offset < 0:
+                raise ValueError()
+        except ValueError:
+            raise BadRequestError("offset must be a positive integer")
+
+        limit = self.get_limit(request)
+
         start = offset
         stop = offset + limit
 
-        self.view = view
+        self.cursor = None
         self.total_count = queryset.count()
         return queryset[start:stop]
 
+    def paginate_queryset_with_cursor(self, queryset, request):
+        if 'offset' in request.GET:
+            raise BadRequestError("cursor cannot be used with offset")
+
+        if not isinstance(queryset, QuerySet):
+            raise BadRequestError("cursor cannot be used with search")
+
+        limit = self.get_limit(request)
+        if limit == 0:
+            raise BadRequestError("limit must be higher than 0 when using cursor")
+
+        ordering = get_keyset_ordering(queryset)
+        order_by = [('-' if descending else '') + field_name for field_name, field, descending in ordering]
+
+        # The ordering is given in full, so undo any .reverse()
+        queryset = queryset.order_by(*order_by)
+        if not queryset.query.standard_ordering:
+            queryset = queryset.reverse()
+
+        if request.GET['cursor']:
+            cursor = decode_cursor(request.GET['cursor'])
+
+            try:
+                if cursor['order'] != order_by or len(cursor['after']) != len(ordering):
+                    raise BadRequestError("cursor doesn't match the ordering of this listing")
+
+                values = [field.to_python(value) for (field_name, field, descending), value in zip(ordering, cursor['after'])]
+                total_count = cursor.get('total_count')
+            except (KeyError, TypeError, ValidationError):
+                raise BadRequestError("cursor is invalid")
+
+            # Find the items after the last item of the previous page. For example, when
+            # ordering by (title, pk): title > t OR (title = t AND pk > p)
+            after = Q()
+            for i, (field_name, field, descending) in enumerate(ordering):
+                condition = Q(**{field_name + ('__lt' if descending else '__gt'): values[i]})
+                for j in range(i):
+                    condition &= Q(**{ordering[j][0]: values[j]})
+                after |= condition
+
+            queryset = queryset.filter(after)
+        elif getattr(settings, 'WAGTAILAPI_CURSOR_TOTAL_COUNT', True):
+            # The total count is only worked out for the first page, and passed on to
+            # the next pages in their cursors
+            total_count = queryset.count()
+        else:
+            total_count = None
+
+        # Fetch an extra item to find out if there is a next page
+        items = list(queryset[:limit + 1])
+
+        if len(items) > limit:
+            items = items[:limit]
+            cursor = OrderedDict([
+                ('order', order_by),
+                ('after', [field.value_to_string(items[-1]) for field_name, field, descending in ordering]),
+            ])
+            if total_count is not None:
+                cursor['total_count'] = total_count
+            self.cursor = encode_cursor(cursor)
+        else:
+            self.cursor = None
+
+        self.total_count = total_count
+        return items
+
     def get_paginated_response(self, data):
+        meta = OrderedDict()
+        if self.total_count is not None:
+            meta['total_count'] = self.total_count
+
+        if 'cursor' in self.request.GET:
+            meta['next'] = self.cursor
+
         data = OrderedDict([
-            ('meta', OrderedDict([
-                ('total_count', self.total_count),
-            ])),
+            ('meta', meta),
             ('items', data),
         ])
         return Response(data)
@@ -1,12 +1,16 @@
+import functools
 from collections import OrderedDict
 
+from django.db.models import prefetch_related_objects
 from django.urls.exceptions import NoReverseMatch
+from django.utils.functional import cached_property
 from modelcluster.models import get_all_child_relations
 from rest_framework import relations, serializers
 from rest_framework.fields import Field, SkipField
 from taggit.managers import _TaggableManager
 
 from wagtail.core import fields as wagtailcore_fields
+from wagtail.core.models import Page
 
 from .utils import get_object_detail_url
 
@@ -59,7 +63,8 @@ class PageHtmlUrlField(Field):
 
     def to_representation(self, page):
         try:
-            return page.full_url
+            # Passing the request lets the site root paths be looked up once per request
+            return page.get_full_url(self.context['request'])
         except NoReverseMatch:
             return None
 
@@ -104,9 +109,13 @@ class RelatedField(relations.RelatedField):
         self.serializer_class = kwargs.pop('serializer_class')
         super().__init__(*args, **kwargs)
 
+    @cached_property
+    def serializer(self):
+        # Shared by all the objects this field serializes
+        return self.serializer_class(context=self.context)
+
     def to_representation(self, value):
-        serializer = self.serializer_class(context=self.context)
-        return serializer.to_representation(value)
+        return self.serializer.to_representation(value)
 
 
 class PageParentField(relations.RelatedField):
@@ -118,16 +127,45 @@ class PageParentField(relations.RelatedField):
 
     The representation is the same as the RelatedField class.
     """
+    def load_parents(self, pages):
+        """
+        Looks up the parents of all the given pages with a single query, so that
+        get_attribute doesn't need to query the database for each page
+        """
+        steplen = Page.steplen
+        parent_paths = {page.path[:-steplen] for page in pages if page.depth > 1}
+        parents = {
+            parent.path: parent
+            for parent in self.context['base_queryset'].filter(path__in=parent_paths)
+        }
+
+        self._parents = {page.pk: parents.get(page.path[:-steplen]) for page in pages}
+
     def get_attribute(self, instance):
+        try:
+            return self._parents[instance.pk]
+        except (AttributeError, KeyError):
+            pass
+
         parent = instance.get_parent()
 
         if self.context['base_queryset'].filter(id=parent.id).exists():
             return parent
 
+    def get_serializer(self, model):
+        try:
+            serializers = self._serializers
+        except AttributeError:
+            serializers = self._serializers = {}
+
+        try:
+            return serializers[model]
+        except KeyError:
+            serializer = serializers[model] = get_page_parent_serializer_class(model)(context=self.context)
+            return serializer
+
     def to_representation(self, value):
-        serializer_class = get_serializer_class(value.__class__, ['id', 'type', 'detail_url', 'html_url', 'title'], meta_fields=['type', 'detail_url', 'html_url'], base=PageSerializer)
-        serializer = serializer_class(context=self.context)
-        return serializer.to_representation(value)
+        return self.get_serializer(value.__class__).to_representation(value)
 
 
 class ChildRelationField(Field):
@@ -172,8 +210,13 @@ class ChildRelationField(Field):
         self.serializer_class = kwargs.pop('serializer_class')
         super().__init__(*args, **kwargs)
 
+    @cached_property
+    def serializer(self):
+        # Shared by all the objects this field serializes
+        return self.serializer_class(context=self.context)
+
     def to_representation(self, value):
-        serializer = self.serializer_class(context=self.context)
+        serializer = self.serializer
 
         return [
             serializer.to_representation(child_object)
@@ -248,16 +291,44 @@ class BaseSerializer(serializers.ModelSerializer):
     type = TypeField(read_only=True)
     detail_url = DetailUrlField(read_only=True)
 
-    def to_representation(self, instance):
-        data = OrderedDict()
+    @cached_property
+    def field_plan(self):
+        """
+        Returns a (meta fields, core fields) tuple of the readable fields of this
+        serializer. This is worked out once, rather than for each object serialized.
+        """
         fields = [field for field in self.fields.values() if not field.write_only]
 
         # Split meta fields from core fields
         meta_fields = [field for field in fields if field.field_name in self.meta_fields]
         fields = [field for field in fields if field.field_name not in self.meta_fields]
 
+        return meta_fields, fields
+
+    def get_prefetch_lookups(self, prefix=''):
+        """
+        Returns the lookups to pass to prefetch_related to fetch the related objects
+        and child relations serialized by this serializer (and the serializers nested
+        in it) in bulk, when serializing a list of objects
+        """
+        lookups = []
+
+        for field in self.field_plan[1]:
+            if not isinstance(field, (RelatedField, ChildRelationField)) or '.' in field.source:
+                continue
+
+            lookup = prefix + field.source
+            lookups.append(lookup)
+            lookups.extend(field.serializer.get_prefetch_lookups(lookup + '__'))
+
+        return lookups
+
+    def to_representation(self, instance):
+        data = OrderedDict()
+        meta_fields, fields = self.field_plan
+
         # Make sure id is always first. This will be filled in later
-        if 'id' in [field.field_name for field in fields]:
+        if any(field.field_name == 'id' for field in fields):
             data['id'] = None
 
         # Serialise meta fields
@@ -308,11 +379,36 @@ class BaseSerializer(serializers.ModelSerializer):
         return field_class, field_kwargs
 
 
+class PageListSerializer(serializers.ListSerializer):
+    """
+    Serializes a list of pages.
+
+    The related objects, child relations and parents of all the pages are fetched
+    up front in bulk, rather than with several queries for each page.
+    """
+    def to_representation(self, data):
+        pages = list(data)
+        meta_fields, fields = self.child.field_plan
+
+        prefetch_related_objects(pages, *self.child.get_prefetch_lookups())
+
+        for field in meta_fields + fields:
+            if isinstance(field, PageParentField):
+                field.load_parents(pages)
+
+        return [self.child.to_representation(page) for page in pages]
+
+
 class PageSerializer(BaseSerializer):
     type = PageTypeField(read_only=True)
     html_url = PageHtmlUrlField(read_only=True)
     parent = PageParentField(read_only=True)
 
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs['child'] = cls(*args, **kwargs)
+        return PageListSerializer(*args, **kwargs)
+
     def build_relational_field(self, field_name, relation_info):
         # Find all relation fields that point to child class and make them use
         # the ChildRelationField class.
@@ -346,3 +442,12 @@ def get_serializer_class(model, field_names, meta_fields, field_serializer_overr
         attrs.update(field_serializer_overrides)
 
     return type(str(model_.__name__ + 'Serializer'), (base, ), attrs)
+
+
+@functools.lru_cache(maxsize=None)
+def get_page_parent_serializer_class(model):
+    """
+    Returns the serializer class used for the "parent" field of pages whose parent
+    is of the given model
+    """
+    return get_serializer_class(model, ['id', 'type', 'detail_url', 'html_url', 'title'], meta_fields=['type', 'detail_url', 'html_url'], base=PageSerializer)
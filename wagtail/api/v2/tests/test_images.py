@@ -317,6 +317,22 @@ class TestImageListing(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content, {'message': "offset must be a positive integer"})
 
+    # CURSOR
+
+    def test_cursor_walks_all_images(self):
+        image_ids = []
+        cursor = ''
+
+        while cursor is not None:
+            response = self.get_response(cursor=cursor, limit=5)
+            content = json.loads(response.content.decode('UTF-8'))
+            self.assertEqual(content['meta']['total_count'], get_image_model().objects.count())
+
+            image_ids.extend(self.get_image_id_list(content))
+            cursor = content['meta']['next']
+
+        self.assertEqual(image_ids, list(get_image_model().objects.order_by('pk').values_list('pk', flat=True)))
+
     # SEARCH
 
     def test_search_for_james_joyce(self):
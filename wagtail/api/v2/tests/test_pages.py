@@ -3,14 +3,19 @@ import json
 from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
+from rest_framework.generics import GenericAPIView
 
 from wagtail.api.v2 import signal_handlers
+from wagtail.api.v2.utils import parse_fields_parameter
+from wagtail.api.v2.views import PagesAPIViewSet
 from wagtail.core.models import Page, Site
 from wagtail.tests.demosite import models
 from wagtail.tests.testapp.models import StreamPage
+from wagtail.tests.urls import api_router
 
 
 def get_total_page_count():
@@ -690,6 +695,100 @@ class TestPageListing(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content, {'message': "offset must be a positive integer"})
 
+    # CURSOR
+
+    def get_all_pages_with_cursor(self, **params):
+        pages = []
+        cursor = ''
+
+        while cursor is not None:
+            response = self.get_response(cursor=cursor, **params)
+            self.assertEqual(response.status_code, 200)
+            content = json.loads(response.content.decode('UTF-8'))
+
+            pages.extend(content['items'])
+            cursor = content['meta']['next']
+
+        return pages
+
+    def test_cursor_walks_all_pages(self):
+        response = self.get_response(limit=20)
+        content = json.loads(response.content.decode('UTF-8'))
+
+        pages = self.get_all_pages_with_cursor(limit=3)
+
+        self.assertEqual([page['id'] for page in pages], self.get_page_id_list(content))
+
+    def test_cursor_with_ordering(self):
+        pages = self.get_all_pages_with_cursor(limit=3, order='-title')
+        titles = [page['title'] for page in pages]
+
+        self.assertEqual(len(pages), get_total_page_count())
+        self.assertEqual(len(set(page['id'] for page in pages)), len(pages))
+        self.assertEqual(titles, sorted(titles, reverse=True))
+
+    def test_cursor_total_count(self):
+        response = self.get_response(cursor='', limit=3)
+        content = json.loads(response.content.decode('UTF-8'))
+        self.assertEqual(content['meta']['total_count'], get_total_page_count())
+
+        # The total count is carried over to the next page
+        response = self.get_response(cursor=content['meta']['next'], limit=3)
+        content = json.loads(response.content.decode('UTF-8'))
+        self.assertEqual(content['meta']['total_count'], get_total_page_count())
+
+    @override_settings(WAGTAILAPI_CURSOR_TOTAL_COUNT=False)
+    def test_cursor_without_total_count(self):
+        response = self.get_response(cursor='', limit=3)
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertNotIn('total_count', content['meta'])
+        self.assertIn('next', content['meta'])
+
+    def test_cursor_last_page(self):
+        response = self.get_response(cursor='', limit=20)
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertIsNone(content['meta']['next'])
+
+    def test_cursor_invalid_gives_error(self):
+        response = self.get_response(cursor='abc')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "cursor is invalid"})
+
+    def test_cursor_with_other_ordering_gives_error(self):
+        response = self.get_response(cursor='', limit=3)
+        content = json.loads(response.content.decode('UTF-8'))
+
+        response = self.get_response(cursor=content['meta']['next'], limit=3, order='title')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "cursor doesn't match the ordering of this listing"})
+
+    def test_cursor_with_offset_gives_error(self):
+        response = self.get_response(cursor='', offset=3)
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "cursor cannot be used with offset"})
+
+    def test_cursor_with_search_gives_error(self):
+        response = self.get_response(cursor='', search='blog')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "cursor cannot be used with search"})
+
+    def test_cursor_with_random_ordering_gives_error(self):
+        response = self.get_response(cursor='', order='random')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "cursor pagination is not supported with this ordering"})
+
     # SEARCH
 
     def test_search_for_blog(self):
@@ -790,6 +889,63 @@ class TestPageListing(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestPageListingQueries(TestCase):
+    fixtures = ['demosite.json']
+
+    def get_response(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('wagtailapi_v2:pages:listing'), params)
+
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('UTF-8')), queries.captured_queries
+
+    def test_specific_pages_fetched_by_type(self):
+        content, queries = self.get_response(limit=20)
+
+        page_types = {page['meta']['type'] for page in content['items']}
+        specific_queries = [query['sql'] for query in queries if 'FROM "demosite_' in query['sql']]
+        self.assertEqual(len(specific_queries), len(page_types))
+
+        # Each page's html_url is worked out with the specific page
+        for page in content['items']:
+            self.assertEqual(page['meta']['html_url'], Page.objects.get(id=page['id']).specific.full_url)
+
+    def test_related_fields_fetched_in_bulk(self):
+        fields = 'carousel_items,related_links,feed_image'
+        self.get_response(type='demosite.BlogEntryPage', fields=fields, limit=1)
+
+        content, queries = self.get_response(type='demosite.BlogEntryPage', fields=fields, limit=1)
+        self.assertEqual(len(content['items']), 1)
+
+        content, more_queries = self.get_response(type='demosite.BlogEntryPage', fields=fields, limit=3)
+        self.assertEqual(len(content['items']), 3)
+
+        self.assertEqual(len(more_queries), len(queries))
+
+    def test_bad_fields_rejected_before_pages_fetched(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('wagtailapi_v2:pages:listing'), {'fields': 'parent'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse([query['sql'] for query in queries if 'FROM "demosite_' in query['sql']])
+
+    def test_serialised_through_get_serializer(self):
+        with mock.patch.object(GenericAPIView, 'get_serializer', autospec=True, side_effect=GenericAPIView.get_serializer) as get_serializer:
+            content, queries = self.get_response(limit=1)
+
+        self.assertEqual(len(content['items']), 1)
+        self.assertEqual(get_serializer.call_count, 1)
+        self.assertTrue(get_serializer.call_args[1]['many'])
+
+    def test_serializer_class_built_once(self):
+        with mock.patch.object(PagesAPIViewSet, '_get_serializer_class', side_effect=PagesAPIViewSet._get_serializer_class) as get_serializer_class:
+            content, queries = self.get_response(limit=1)
+
+        self.assertEqual(len(content['items']), 1)
+        self.assertEqual(get_serializer_class.call_count, 1)
+
+
 class TestPageDetail(TestCase):
     fixtures = ['demosite.json']
 
@@ -1052,6 +1208,33 @@ class TestPageDetail(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content, {'message': "'title' does not support nested fields"})
 
+    def test_object_fetched_once(self):
+        with mock.patch.object(GenericAPIView, 'get_object', autospec=True, side_effect=GenericAPIView.get_object) as get_object:
+            response = self.get_response(16)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_object.call_count, 1)
+
+    def test_serializer_class_is_cached(self):
+        fields_config = parse_fields_parameter('title,related_links(title),carousel_items(-embed_url)')
+        serializer_class = PagesAPIViewSet._get_serializer_class(api_router, models.BlogEntryPage, fields_config, show_details=True)
+
+        self.assertIs(
+            PagesAPIViewSet._get_serializer_class(api_router, models.BlogEntryPage, fields_config, show_details=True),
+            serializer_class
+        )
+        self.assertIsNot(
+            PagesAPIViewSet._get_serializer_class(api_router, models.BlogEntryPage, fields_config),
+            serializer_class
+        )
+
+        # The fields of the cached class are unaffected by other requests
+        self.get_response(16, fields='-title')
+        response = self.get_response(16, fields='title,related_links(title),carousel_items(-embed_url)')
+        content = json.loads(response.content.decode('UTF-8'))
+        self.assertIn('title', content)
+        self.assertEqual(set(content['carousel_items'][0].keys()), {'id', 'meta', 'image', 'link', 'caption'})
+
 
 class TestPageFind(TestCase):
     fixtures = ['demosite.json']
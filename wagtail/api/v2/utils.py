@@ -55,6 +55,28 @@ def filter_page_type(queryset, page_models):
     return qs
 
 
+def get_specific_pages(pages):
+    """
+    Returns a list of the specific instances of the given pages, in the same order.
+
+    The pages of each type are fetched with a single query, and pages that are
+    already instances of their specific class are used as they are.
+    """
+    pages = list(pages)
+
+    pks_by_model = {}
+    for page in pages:
+        model = page.specific_class
+        if model is not None and model is not type(page):
+            pks_by_model.setdefault(model, []).append(page.pk)
+
+    specific_pages = {}
+    for model, pks in pks_by_model.items():
+        specific_pages.update((page.pk, page) for page in model.objects.filter(pk__in=pks))
+
+    return [specific_pages.get(page.pk, page) for page in pages]
+
+
 class FieldsParameterParseError(ValueError):
     pass
 
@@ -218,6 +240,17 @@ def parse_fields_parameter(fields_str):
     return fields
 
 
+def freeze_fields_config(fields_config):
+    """
+    Converts the list returned by parse_fields_parameter (including any nested
+    lists of sub fields) into tuples, so that it can be used as a cache key
+    """
+    return tuple(
+        (field_name, negated, freeze_fields_config(sub_fields) if sub_fields else sub_fields)
+        for field_name, negated, sub_fields in fields_config
+    )
+
+
 def parse_boolean(value):
     """
     Parses strings into booleans using the following mapping (case-sensitive):
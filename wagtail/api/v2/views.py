@@ -1,3 +1,4 @@
+import functools
 from collections import OrderedDict
 
 from django.conf.urls import url
@@ -18,8 +19,11 @@ from .filters import ChildOfFilter, DescendantOfFilter, FieldsFilter, OrderingFi
 from .pagination import WagtailPagination
 from .serializers import BaseSerializer, PageSerializer, get_serializer_class
 from .utils import (
-    BadRequestError, filter_page_type, get_object_detail_url, page_models_from_string,
-    parse_fields_parameter)
+    BadRequestError, filter_page_type, freeze_fields_config, get_object_detail_url, get_specific_pages,
+    page_models_from_string, parse_fields_parameter)
+
+# The maximum number of serializer classes remembered by BaseAPIViewSet._get_serializer_class
+SERIALIZER_CLASS_CACHE_SIZE = 256
 
 
 class BaseAPIViewSet(GenericViewSet):
@@ -33,6 +37,7 @@ class BaseAPIViewSet(GenericViewSet):
     known_query_parameters = frozenset([
         'limit',
         'offset',
+        'cursor',
         'fields',
         'order',
         'search',
@@ -67,10 +72,22 @@ class BaseAPIViewSet(GenericViewSet):
         queryset = self.get_queryset()
         self.check_query_parameters(queryset)
         queryset = self.filter_queryset(queryset)
+        # Build the serializer class first, so that a bad fields parameter is rejected
+        # before any objects are fetched
+        self.get_serializer_class()
         queryset = self.paginate_queryset(queryset)
         serializer = self.get_serializer(queryset, many=True)
         return self.get_paginated_response(serializer.data)
 
+    def get_object(self):
+        # The object is needed both to choose the serializer class and to serialise,
+        # so only fetch it once per request
+        try:
+            return self._object
+        except AttributeError:
+            self._object = super().get_object()
+            return self._object
+
     def detail_view(self, request, pk):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -192,6 +209,20 @@ class BaseAPIViewSet(GenericViewSet):
 
     @classmethod
     def _get_serializer_class(cls, router, model, fields_config, show_details=False, nested=False):
+        """
+        Returns the serializer class for the given model and fields configuration
+        (as returned by parse_fields_parameter). Classes are built once for each
+        combination of these arguments, and remembered for later requests.
+        """
+        return cls._get_cached_serializer_class(router, model, freeze_fields_config(fields_config), show_details, nested)
+
+    @classmethod
+    @functools.lru_cache(maxsize=SERIALIZER_CLASS_CACHE_SIZE)
+    def _get_cached_serializer_class(cls, router, model, fields_config, show_details, nested):
+        return cls._build_serializer_class(router, model, fields_config, show_details=show_details, nested=nested)
+
+    @classmethod
+    def _build_serializer_class(cls, router, model, fields_config, show_details=False, nested=False):
         # Get all available fields
         body_fields = cls.get_body_fields_names(model)
         meta_fields = cls.get_meta_fields_names(model)
@@ -261,8 +292,7 @@ class BaseAPIViewSet(GenericViewSet):
                 # Inline (aka "child") models should display all fields by default
                 if isinstance(getattr(django_field, 'field', None), ParentalKey):
                     if not child_sub_fields or child_sub_fields[0][0] not in ['*', '_']:
-                        child_sub_fields = list(child_sub_fields)
-                        child_sub_fields.insert(0, ('*', False, None))
+                        child_sub_fields = (('*', False, None), ) + tuple(child_sub_fields)
 
                 # Get a serializer class for the related object
                 child_model = django_field.related_model
@@ -289,6 +319,13 @@ class BaseAPIViewSet(GenericViewSet):
         )
 
     def get_serializer_class(self):
+        # Listings build the serializer class before fetching objects and again to
+        # serialise them, so only build it once per request
+        try:
+            return self._serializer_class
+        except AttributeError:
+            pass
+
         request = self.request
 
         # Get model
@@ -313,7 +350,8 @@ class BaseAPIViewSet(GenericViewSet):
         else:
             show_details = True
 
-        return self._get_serializer_class(self.request.wagtailapi_router, model, fields_config, show_details=show_details)
+        self._serializer_class = self._get_serializer_class(self.request.wagtailapi_router, model, fields_config, show_details=show_details)
+        return self._serializer_class
 
     def get_serializer_context(self):
         """
@@ -448,6 +486,11 @@ class PagesAPIViewSet(BaseAPIViewSet):
         base = super().get_object()
         return base.specific
 
+    def paginate_queryset(self, queryset):
+        # Listings can mix many page types, so fetch the specific pages of each type
+        # in one query rather than one page at a time
+        return get_specific_pages(super().paginate_queryset(queryset))
+
     def find_object(self, queryset, request):
         if 'html_path' in request.GET and request.site is not None:
             path = request.GET['html_path']
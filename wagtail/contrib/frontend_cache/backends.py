@@ -1,21 +1,75 @@
 import logging
+import threading
 import uuid
 from collections import defaultdict
-from urllib.error import HTTPError, URLError
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, urlunparse
-from urllib.request import Request, urlopen
 
 import requests
 from django.core.exceptions import ImproperlyConfigured
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from wagtail import __version__
 
 logger = logging.getLogger('wagtail.frontendcache')
 
+# Sessions used by HTTPBackend.purge_batch, keyed by the cache location and connection
+# settings, so that connections to each cache are kept alive between batches
+_http_sessions = {}
+_http_sessions_lock = threading.Lock()
 
-class PurgeRequest(Request):
-    def get_method(self):
-        return 'PURGE'
+# Runs the batches of HTTPBackends with BACKGROUND enabled, one at a time and in order
+_background_executor = None
+_background_executor_lock = threading.Lock()
+
+
+def get_http_session(cache_scheme, cache_netloc, max_connections, retries):
+    """
+    Return the requests session used to send PURGE requests to the given cache, which
+    keeps up to max_connections connections open and retries requests that fail to
+    connect or get a 502, 503 or 504 response
+    """
+    key = (cache_scheme, cache_netloc, max_connections, retries)
+
+    with _http_sessions_lock:
+        try:
+            return _http_sessions[key]
+        except KeyError:
+            pass
+
+        retry_kwargs = {
+            'total': retries,
+            'backoff_factor': 0.1,
+            'status_forcelist': (502, 503, 504),
+            'raise_on_status': False,
+        }
+        try:
+            retry = Retry(allowed_methods=frozenset(['PURGE']), **retry_kwargs)
+        except TypeError:
+            # urllib3 < 1.26
+            retry = Retry(method_whitelist=frozenset(['PURGE']), **retry_kwargs)
+
+        session = requests.Session()
+        session.mount(cache_scheme + '://', HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_connections, max_retries=retry))
+
+        _http_sessions[key] = session
+        return session
+
+
+def get_background_executor():
+    """
+    Return the executor that runs purges in the background, starting it if necessary
+    """
+    global _background_executor
+
+    with _background_executor_lock:
+        if _background_executor is None:
+            _background_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='wagtail-frontendcache')
+
+    return _background_executor
 
 
 class BaseBackend:
@@ -34,7 +88,12 @@ class HTTPBackend(BaseBackend):
         self.cache_scheme = location_url_parsed.scheme
         self.cache_netloc = location_url_parsed.netloc
 
-    def purge(self, url):
+        self.timeout = params.pop('TIMEOUT', 10)
+        self.retries = params.pop('RETRIES', 2)
+        self.concurrency = params.pop('CONCURRENCY', 4)
+        self.background = params.pop('BACKGROUND', False)
+
+    def _get_purge_url_and_headers(self, url):
         url_parsed = urlparse(url)
         host = url_parsed.hostname
 
@@ -42,27 +101,64 @@ class HTTPBackend(BaseBackend):
         if url_parsed.port:
             host += (':' + str(url_parsed.port))
 
-        request = PurgeRequest(
-            url=urlunparse([
-                self.cache_scheme,
-                self.cache_netloc,
-                url_parsed.path,
-                url_parsed.params,
-                url_parsed.query,
-                url_parsed.fragment
-            ]),
-            headers={
-                'Host': host,
-                'User-Agent': 'Wagtail-frontendcache/' + __version__
-            }
-        )
+        purge_url = urlunparse([
+            self.cache_scheme,
+            self.cache_netloc,
+            url_parsed.path,
+            url_parsed.params,
+            url_parsed.query,
+            url_parsed.fragment
+        ])
+        headers = {
+            'Host': host,
+            'User-Agent': 'Wagtail-frontendcache/' + __version__
+        }
+
+        return purge_url, headers
+
+    def purge(self, url):
+        purge_url, headers = self._get_purge_url_and_headers(url)
+        session = get_http_session(self.cache_scheme, self.cache_netloc, self.concurrency, self.retries)
+
+        try:
+            response = session.request('PURGE', purge_url, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            logger.error("Couldn't purge '%s' from HTTP cache. HTTPError: %d %s", url, e.response.status_code, e.response.reason)
+        except requests.exceptions.RequestException as e:
+            logger.error("Couldn't purge '%s' from HTTP cache. %s: %s", url, type(e).__name__, e)
+
+    def purge_batch(self, urls):
+        """
+        Purge the URLs over a pool of kept-alive connections, sending up to CONCURRENCY
+        requests to the cache at once. With BACKGROUND enabled, this returns straight
+        away and the purge happens on a background thread.
+        """
+        # Each URL only needs purging once
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+
+        if self.background:
+            get_background_executor().submit(self._purge_batch_in_background, urls)
+        else:
+            self._purge_batch(urls)
+
+    def _purge_batch(self, urls):
+        if self.concurrency <= 1 or len(urls) == 1:
+            for url in urls:
+                self.purge(url)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(urls))) as executor:
+                # Consume the results so that unexpected errors are raised here
+                list(executor.map(self.purge, urls))
 
+    def _purge_batch_in_background(self, urls):
         try:
-            urlopen(request)
-        except HTTPError as e:
-            logger.error("Couldn't purge '%s' from HTTP cache. HTTPError: %d %s", url, e.code, e.reason)
-        except URLError as e:
-            logger.error("Couldn't purge '%s' from HTTP cache. URLError: %s", url, e.reason)
+            self._purge_batch(urls)
+        except Exception:
+            # Nobody is waiting for the result, so catch and log all errors
+            logger.exception("Exception raised while purging %d URLs from HTTP cache", len(urls))
 
 
 class CloudflareBackend(BaseBackend):
@@ -0,0 +1,139 @@
+"""
+Queueing of the purges requested by the signal handlers, so that the pages changed in
+a transaction are purged once it has been committed, with each URL purged once
+"""
+
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+
+from wagtail.contrib.frontend_cache.utils import PurgeBatch, purge_urls_from_cache
+
+logger = logging.getLogger('wagtail.frontendcache')
+
+# Pages changed by the current thread that are waiting for their transaction to be committed
+_local = threading.local()
+
+# URLs waiting for the end of the WAGTAILFRONTENDCACHE_PURGE_DELAY window
+_pending_urls = OrderedDict()
+_pending_lock = threading.Lock()
+_pending_timer = None
+
+
+class PurgeQueue:
+    """
+    A set of pages that need to be purged from the frontend cache. Each page is only
+    recorded once, so a page that is published several times is only purged once.
+    """
+    def __init__(self):
+        self.pages = OrderedDict()
+
+    def __len__(self):
+        return len(self.pages)
+
+    def add_page(self, page):
+        # Pages may be deleted by the time the queue is flushed, so find the specific
+        # page (which gives the cached paths) now
+        self.pages[page.pk] = page.specific
+
+    def flush(self):
+        """
+        Purge the URLs of the queued pages, in one batch for each backend, and empty
+        the queue. If WAGTAILFRONTENDCACHE_PURGE_DELAY is set, the URLs are held back
+        for that many seconds instead, and purged along with any others queued in
+        the meantime.
+        """
+        pages, self.pages = self.pages, OrderedDict()
+        if not pages:
+            return
+
+        batch = PurgeBatch()
+        batch.add_pages(pages.values())
+        urls = list(OrderedDict.fromkeys(batch.urls))
+        if not urls:
+            return
+
+        delay = getattr(settings, 'WAGTAILFRONTENDCACHE_PURGE_DELAY', None)
+        if delay:
+            add_pending_urls(urls, delay)
+        else:
+            purge_urls_from_cache(urls)
+
+
+def add_pending_urls(urls, delay):
+    global _pending_timer
+
+    with _pending_lock:
+        _pending_urls.update(OrderedDict.fromkeys(urls))
+
+        if _pending_timer is None:
+            _pending_timer = threading.Timer(delay, flush_pending_urls)
+            _pending_timer.daemon = True
+            _pending_timer.start()
+
+
+def flush_pending_urls():
+    """
+    Purge the URLs that are being held back by WAGTAILFRONTENDCACHE_PURGE_DELAY now
+    """
+    global _pending_timer
+
+    with _pending_lock:
+        if _pending_timer is not None:
+            _pending_timer.cancel()
+            _pending_timer = None
+
+        urls = list(_pending_urls)
+        _pending_urls.clear()
+
+    if urls:
+        try:
+            purge_urls_from_cache(urls)
+        except Exception:
+            # Catch and log all errors, as this may run on the timer thread
+            logger.exception("Exception raised while purging %d URLs from the frontend cache", len(urls))
+
+
+atexit.register(flush_pending_urls)
+
+
+def get_transaction_queue():
+    """
+    Return the queue of pages changed by the current thread in the current transaction
+    """
+    try:
+        return _local.queue
+    except AttributeError:
+        _local.queue = PurgeQueue()
+        return _local.queue
+
+
+def commit_transaction_queue():
+    """
+    Called once the current transaction is committed, to purge the pages that were
+    queued during it
+    """
+    purge_queue = get_transaction_queue()
+    if not purge_queue:
+        # Already handled by an earlier callback of this transaction
+        return
+
+    _local.queue = PurgeQueue()
+    purge_queue.flush()
+
+
+def enqueue_page(page):
+    """
+    Queue the given page to be purged from the frontend cache once the current
+    transaction is committed (or straight away, outside of a transaction)
+    """
+    get_transaction_queue().add_page(page)
+
+    # The callbacks of a transaction that is rolled back are discarded, so register one
+    # for every page. Pages left behind by the rolled back transaction are purged along
+    # with the next one, which is harmless.
+    transaction.on_commit(commit_transaction_queue)
@@ -1,13 +1,14 @@
 from unittest import mock
-from urllib.error import HTTPError, URLError
 
 import requests
 from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
 from django.test.utils import override_settings
 
+from wagtail.contrib.frontend_cache import queue
 from wagtail.contrib.frontend_cache.backends import (
-    BaseBackend, CloudflareBackend, CloudfrontBackend, HTTPBackend)
+    BaseBackend, CloudflareBackend, CloudfrontBackend, HTTPBackend, get_background_executor,
+    get_http_session)
 from wagtail.contrib.frontend_cache.utils import get_backends
 from wagtail.core.models import Page
 from wagtail.tests.testapp.models import EventIndex
@@ -69,38 +70,35 @@ class TestBackendConfiguration(TestCase):
         self.assertEqual(backends['cloudfront'].cloudfront_distribution_id, 'frontend')
 
     def test_http(self):
-        """Test that `HTTPBackend.purge` works when urlopen succeeds"""
-        self._test_http_with_side_effect(urlopen_side_effect=None)
+        """Test that `HTTPBackend.purge` works when the request succeeds"""
+        self._test_http_with_side_effect(request_side_effect=None)
 
     def test_http_httperror(self):
         """Test that `HTTPBackend.purge` can handle `HTTPError`"""
-        http_error = HTTPError(
-            url='http://localhost:8000/home/events/christmas/',
-            code=500,
-            msg='Internal Server Error',
-            hdrs={},
-            fp=None
-        )
+        response = requests.Response()
+        response.status_code = 500
+        response.reason = 'Internal Server Error'
+        http_error = requests.exceptions.HTTPError(response=response)
         with self.assertLogs(level='ERROR') as log_output:
-            self._test_http_with_side_effect(urlopen_side_effect=http_error)
+            self._test_http_with_side_effect(request_side_effect=http_error)
 
         self.assertIn(
             "Couldn't purge 'http://www.wagtail.io/home/events/christmas/' from HTTP cache. HTTPError: 500 Internal Server Error",
             log_output.output[0]
         )
 
-    def test_http_urlerror(self):
-        """Test that `HTTPBackend.purge` can handle `URLError`"""
-        url_error = URLError(reason='just for tests')
+    def test_http_connectionerror(self):
+        """Test that `HTTPBackend.purge` can handle `ConnectionError`"""
+        connection_error = requests.exceptions.ConnectionError('just for tests')
         with self.assertLogs(level='ERROR') as log_output:
-            self._test_http_with_side_effect(urlopen_side_effect=url_error)
+            self._test_http_with_side_effect(request_side_effect=connection_error)
         self.assertIn(
-            "Couldn't purge 'http://www.wagtail.io/home/events/christmas/' from HTTP cache. URLError: just for tests",
+            "Couldn't purge 'http://www.wagtail.io/home/events/christmas/' from HTTP cache. ConnectionError: just for tests",
             log_output.output[0]
         )
 
-    @mock.patch('wagtail.contrib.frontend_cache.backends.urlopen')
-    def _test_http_with_side_effect(self, urlopen_mock, urlopen_side_effect):
+    @mock.patch.object(requests.Session, 'request')
+    def _test_http_with_side_effect(self, request_mock, request_side_effect):
         # given a backends configuration with one HTTP backend
         backends = get_backends(backend_settings={
             'varnish': {
@@ -110,17 +108,78 @@ class TestBackendConfiguration(TestCase):
         })
         self.assertEqual(set(backends.keys()), set(['varnish']))
         self.assertIsInstance(backends['varnish'], HTTPBackend)
-        # and mocked urlopen that may or may not raise network-related exception
-        urlopen_mock.side_effect = urlopen_side_effect
+        # and mocked request that may or may not raise network-related exception
+        request_mock.side_effect = request_side_effect
 
         # when making a purge request
         backends.get('varnish').purge('http://www.wagtail.io/home/events/christmas/')
 
         # then no exception is raised
-        # and mocked urlopen is called with a proper purge request
-        self.assertEqual(urlopen_mock.call_count, 1)
-        (purge_request,), _call_kwargs = urlopen_mock.call_args
-        self.assertEqual(purge_request.full_url, 'http://localhost:8000/home/events/christmas/')
+        # and mocked request is called with a proper purge request
+        self.assertEqual(request_mock.call_count, 1)
+        (method, purge_url), _call_kwargs = request_mock.call_args
+        self.assertEqual(method, 'PURGE')
+        self.assertEqual(purge_url, 'http://localhost:8000/home/events/christmas/')
+
+    def get_http_backend(self, **params):
+        return get_backends(backend_settings={
+            'varnish': dict({
+                'BACKEND': 'wagtail.contrib.frontend_cache.backends.HTTPBackend',
+                'LOCATION': 'http://localhost:8000',
+            }, **params),
+        })['varnish']
+
+    @mock.patch.object(requests.Session, 'request')
+    def test_http_purge_batch(self, request_mock):
+        backend = self.get_http_backend(TIMEOUT=5)
+
+        backend.purge_batch([
+            'http://www.wagtail.io/home/events/christmas/',
+            'http://www.wagtail.io:8080/home/events/',
+            'http://www.wagtail.io/home/events/christmas/',
+        ])
+
+        # duplicate URLs are only purged once
+        self.assertEqual(request_mock.call_count, 2)
+        calls = sorted(request_mock.call_args_list, key=lambda call: call[0][1])
+        self.assertEqual(calls[0], mock.call(
+            'PURGE', 'http://localhost:8000/home/events/',
+            headers={'Host': 'www.wagtail.io:8080', 'User-Agent': mock.ANY}, timeout=5
+        ))
+        self.assertEqual(calls[1][0], ('PURGE', 'http://localhost:8000/home/events/christmas/'))
+
+    @mock.patch.object(requests.Session, 'request')
+    def test_http_purge_batch_error(self, request_mock):
+        request_mock.side_effect = requests.exceptions.ConnectionError('just for tests')
+        backend = self.get_http_backend()
+
+        with self.assertLogs(level='ERROR') as log_output:
+            backend.purge_batch(['http://www.wagtail.io/home/events/christmas/'])
+
+        self.assertIn(
+            "Couldn't purge 'http://www.wagtail.io/home/events/christmas/' from HTTP cache. ConnectionError: just for tests",
+            log_output.output[0]
+        )
+
+    def test_http_purge_batch_reuses_session(self):
+        self.assertIs(
+            get_http_session('http', 'localhost:8000', 4, 2),
+            get_http_session('http', 'localhost:8000', 4, 2)
+        )
+        self.assertIsNot(
+            get_http_session('http', 'localhost:8000', 4, 2),
+            get_http_session('http', 'localhost:8001', 4, 2)
+        )
+
+    @mock.patch.object(requests.Session, 'request')
+    def test_http_purge_batch_in_background(self, request_mock):
+        backend = self.get_http_backend(BACKGROUND=True)
+
+        backend.purge_batch(['http://www.wagtail.io/home/events/christmas/'])
+
+        # Batches are run in order, so once this one has run the purge is complete
+        get_background_executor().submit(lambda: None).result()
+        self.assertEqual(request_mock.call_count, 1)
 
     def test_cloudfront_validate_distribution_id(self):
         with self.assertRaises(ImproperlyConfigured):
@@ -280,15 +339,28 @@ class TestCachePurgingSignals(TestCase):
     def setUp(self):
         # Reset PURGED_URLS to an empty list
         PURGED_URLS[:] = []
+        queue._local.queue = queue.PurgeQueue()
+
+        # TestCase never commits its transaction, so run the on_commit callbacks by hand
+        self.callbacks = []
+        patcher = mock.patch('wagtail.contrib.frontend_cache.queue.transaction.on_commit', side_effect=self.callbacks.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def commit(self):
+        for callback in self.callbacks:
+            callback()
 
     def test_purge_on_publish(self):
         page = EventIndex.objects.get(url_path='/home/events/')
         page.save_revision().publish()
+        self.commit()
         self.assertEqual(PURGED_URLS, ['http://localhost/events/', 'http://localhost/events/past/'])
 
     def test_purge_on_unpublish(self):
         page = EventIndex.objects.get(url_path='/home/events/')
         page.unpublish()
+        self.commit()
         self.assertEqual(PURGED_URLS, ['http://localhost/events/', 'http://localhost/events/past/'])
 
     def test_purge_with_unroutable_page(self):
@@ -296,8 +368,50 @@ class TestCachePurgingSignals(TestCase):
         page = EventIndex(title='new top-level page')
         root.add_child(instance=page)
         page.save_revision().publish()
+        self.commit()
+        self.assertEqual(PURGED_URLS, [])
+
+    def test_purge_after_commit(self):
+        page = EventIndex.objects.get(url_path='/home/events/')
+        page.save_revision().publish()
+
         self.assertEqual(PURGED_URLS, [])
 
+        self.commit()
+
+        self.assertEqual(PURGED_URLS, ['http://localhost/events/', 'http://localhost/events/past/'])
+
+    @mock.patch.object(MockBackend, 'purge_batch', autospec=True)
+    def test_purge_deduplicated_in_one_batch(self, purge_batch_mock):
+        events_page = EventIndex.objects.get(url_path='/home/events/')
+        events_page.save_revision().publish()
+        events_page.unpublish()
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/').specific
+        christmas_page.save_revision().publish()
+
+        self.commit()
+
+        self.assertEqual(purge_batch_mock.call_count, 1)
+        self.assertEqual(purge_batch_mock.call_args[0][1], [
+            'http://localhost/events/', 'http://localhost/events/past/', 'http://localhost/events/christmas/'
+        ])
+
+    @override_settings(WAGTAILFRONTENDCACHE_PURGE_DELAY=60)
+    def test_purge_delay(self):
+        EventIndex.objects.get(url_path='/home/events/').unpublish()
+        self.commit()
+        Page.objects.get(url_path='/home/events/christmas/').specific.save_revision().publish()
+        self.commit()
+
+        # URLs are held back until the end of the delay
+        self.assertEqual(PURGED_URLS, [])
+
+        queue.flush_pending_urls()
+
+        self.assertEqual(PURGED_URLS, [
+            'http://localhost/events/', 'http://localhost/events/past/', 'http://localhost/events/christmas/'
+        ])
+
     @override_settings(ROOT_URLCONF='wagtail.tests.urls_multilang',
                        LANGUAGE_CODE='en',
                        WAGTAILFRONTENDCACHE_LANGUAGES=['en'])
@@ -306,6 +420,7 @@ class TestCachePurgingSignals(TestCase):
         PURGED_URLS[:] = []  # reset PURGED_URLS to the empty list
         page = EventIndex.objects.get(url_path='/home/events/')
         page.save_revision().publish()
+        self.commit()
         self.assertEqual(len(PURGED_URLS), len(settings.WAGTAILFRONTENDCACHE_LANGUAGES) * 2)
         for isocode, description in settings.WAGTAILFRONTENDCACHE_LANGUAGES:
             self.assertIn('http://localhost/%s/events/' % isocode, PURGED_URLS)
@@ -407,6 +407,9 @@ class PostgresSearchRebuilder:
 
 
 class PostgresSearchAtomicRebuilder(PostgresSearchRebuilder):
+    # The whole rebuild happens in one transaction on the index's connection
+    transactional = True
+
     def __init__(self, index):
         super().__init__(index)
         self.transaction = transaction.atomic(using=index.db_alias)
@@ -1,6 +1,9 @@
+import uuid
 from urllib.parse import urlparse
 
 from django import http
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.encoding import uri_to_iri
 
@@ -20,7 +23,81 @@ def _get_redirect(request, path):
         return None
 
 
+REDIRECT_CACHE_VERSION_KEY = 'wagtail_redirect_cache_version'
+
+# Per-process map of old_path to {site_id (or None for all sites): redirect_id}, valid
+# for as long as the shared version stored under REDIRECT_CACHE_VERSION_KEY is unchanged
+_redirect_cache = {'version': None, 'paths': {}}
+
+
+def get_redirect_cache_version():
+    version = cache.get(REDIRECT_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(REDIRECT_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(REDIRECT_CACHE_VERSION_KEY)
+    return version
+
+
+def clear_redirect_cache():
+    """
+    Invalidate the redirect paths cached by get_cached_redirect_paths in every
+    process sharing the Django cache.
+    """
+    cache.set(REDIRECT_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_cached_redirect_paths():
+    """
+    Return a dict mapping the old_path of every redirect to a dict of the site IDs
+    it applies to (None for redirects that apply to all sites) and the redirect's
+    ID. This is loaded with a single query and kept in process memory until the
+    shared redirect cache version is bumped by clear_redirect_cache.
+    """
+    version = get_redirect_cache_version()
+    if _redirect_cache['version'] != version:
+        paths = {}
+        for old_path, site_id, redirect_id in models.Redirect.objects.values_list('old_path', 'site_id', 'id'):
+            paths.setdefault(old_path, {})[site_id] = redirect_id
+
+        _redirect_cache['paths'] = paths
+        _redirect_cache['version'] = version
+
+    return _redirect_cache['paths']
+
+
+def _get_cached_redirect(request, path):
+    sites = get_cached_redirect_paths().get(path)
+    if sites is None:
+        # The path doesn't match any redirect, so there is no need to query the database
+        return None
+
+    if request.site:
+        # Prefer a site-specific redirect over a site-ambivalent one
+        redirect_id = sites.get(request.site.pk) or sites.get(None)
+    elif len(sites) == 1:
+        # No site matched the request, so any redirect for the path applies, as with
+        # Redirect.get_for_site(None)
+        redirect_id, = sites.values()
+    else:
+        redirect_id = sites.get(None)
+
+    if redirect_id is None:
+        return None
+
+    try:
+        return models.Redirect.objects.select_related('redirect_page').get(id=redirect_id)
+    except models.Redirect.DoesNotExist:
+        return None
+
+
 def get_redirect(request, path):
+    if getattr(settings, 'WAGTAILREDIRECTS_CACHE', False):
+        redirect = _get_cached_redirect(request, path)
+        if not redirect:
+            # try unencoding the path
+            redirect = _get_cached_redirect(request, uri_to_iri(path))
+        return redirect
+
     redirect = _get_redirect(request, path)
     if not redirect:
         # try unencoding the path
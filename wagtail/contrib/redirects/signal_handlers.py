@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from wagtail.contrib.redirects.middleware import clear_redirect_cache
+from wagtail.contrib.redirects.models import Redirect
+
+
+def redirect_changed_signal_handler(**kwargs):
+    clear_redirect_cache()
+
+
+def register_signal_handlers():
+    post_save.connect(redirect_changed_signal_handler, sender=Redirect)
+    post_delete.connect(redirect_changed_signal_handler, sender=Redirect)
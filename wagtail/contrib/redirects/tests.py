@@ -3,6 +3,7 @@ from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.middleware import clear_redirect_cache
 from wagtail.core.models import Page, Site
 from wagtail.tests.utils import WagtailTestUtils
 
@@ -176,6 +177,23 @@ class TestRedirects(TestCase):
         response = self.client.get('/xmas/', HTTP_HOST='localhost')
         self.assertEqual(response.status_code, 404)
 
+    def test_redirect_without_matching_site(self):
+        # No site matches the request and there is no default site, so request.site is None
+        Site.objects.update(is_default_site=False)
+
+        contact_page = Page.objects.get(url_path='/home/contact-us/')
+        other_site = Site.objects.create(hostname='other.example.com', port=80, root_page=contact_page)
+        models.Redirect.objects.create(old_path='/xmas', redirect_link='/site-specific', site=other_site)
+
+        response = self.client.get('/xmas/', HTTP_HOST='test.example.com')
+        self.assertRedirects(response, '/site-specific', status_code=301, fetch_redirect_response=False)
+
+        # The site-ambivalent redirect is preferred when there are several
+        models.Redirect.objects.create(old_path='/xmas', redirect_link='/generic')
+
+        response = self.client.get('/xmas/', HTTP_HOST='test.example.com')
+        self.assertRedirects(response, '/generic', status_code=301, fetch_redirect_response=False)
+
     def test_redirect_without_page_or_link_target(self):
         models.Redirect.objects.create(old_path='/xmas/', redirect_link='')
 
@@ -302,6 +320,74 @@ class TestRedirects(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
+@override_settings(WAGTAILREDIRECTS_CACHE=True)
+class TestCachedRedirects(TestRedirects):
+    """
+    Run all the redirect tests again with the redirect paths cached in memory
+    """
+
+
+@override_settings(
+    ALLOWED_HOSTS=['testserver', 'localhost', 'other.example.com'],
+    WAGTAILREDIRECTS_CACHE=True,
+    WAGTAIL_SITE_CACHE=True,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class TestRedirectCache(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        clear_redirect_cache()
+        # load the redirect paths (and the site) so they don't count towards the queries below
+        self.client.get('/does-not-exist/')
+
+    def test_no_queries_for_unknown_path(self):
+        # the only query is the one made by the page router before returning the 404
+        with self.assertNumQueries(1):
+            response = self.client.get('/does-not-exist/?foo=bar')
+        self.assertEqual(response.status_code, 404)
+
+    def test_one_query_for_known_path(self):
+        models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+        self.client.get('/does-not-exist/')
+
+        # page router query + fetching the matched redirect
+        with self.assertNumQueries(2):
+            response = self.client.get('/redirectme/?foo=bar')
+        self.assertRedirects(response, '/redirectto', status_code=301, fetch_redirect_response=False)
+
+    def test_prefers_site_specific_redirect(self):
+        contact_page = Page.objects.get(url_path='/home/contact-us/')
+        site = Site.objects.create(hostname='other.example.com', port=80, root_page=contact_page)
+        models.Redirect.objects.create(old_path='/xmas', redirect_link='/generic')
+        models.Redirect.objects.create(site=site, old_path='/xmas', redirect_link='/specific')
+
+        response = self.client.get('/xmas/', HTTP_HOST='other.example.com')
+        self.assertRedirects(response, '/specific', status_code=301, fetch_redirect_response=False)
+
+        response = self.client.get('/xmas/')
+        self.assertRedirects(response, '/generic', status_code=301, fetch_redirect_response=False)
+
+    def test_cache_cleared_when_redirect_changes(self):
+        redirect = models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+
+        response = self.client.get('/redirectme/')
+        self.assertRedirects(response, '/redirectto', status_code=301, fetch_redirect_response=False)
+
+        redirect.old_path = '/redirectme-now'
+        redirect.save()
+
+        response = self.client.get('/redirectme/')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get('/redirectme-now/')
+        self.assertRedirects(response, '/redirectto', status_code=301, fetch_redirect_response=False)
+
+        redirect.delete()
+
+        response = self.client.get('/redirectme-now/')
+        self.assertEqual(response.status_code, 404)
+
+
 class TestRedirectsIndexView(TestCase, WagtailTestUtils):
     def setUp(self):
         self.login()
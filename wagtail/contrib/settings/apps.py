@@ -5,3 +5,7 @@ class WagtailSettingsAppConfig(AppConfig):
     name = 'wagtail.contrib.settings'
     label = 'wagtailsettings'
     verbose_name = "Wagtail site settings"
+
+    def ready(self):
+        from wagtail.contrib.settings.signal_handlers import register_signal_handlers
+        register_signal_handlers()
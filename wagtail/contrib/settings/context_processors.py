@@ -3,13 +3,15 @@ from .registry import registry
 
 class SettingsProxy(dict):
     """
-    Get a SettingModuleProxy for an app using proxy['app_label']
+    Get a SettingModuleProxy for an app using proxy['app_label']. If a request
+    is given, settings are looked up for its site and remembered on it.
     """
-    def __init__(self, site):
+    def __init__(self, site, request=None):
         self.site = site
+        self.request = request
 
     def __missing__(self, app_label):
-        self[app_label] = value = SettingModuleProxy(self.site, app_label)
+        self[app_label] = value = SettingModuleProxy(self.site, app_label, request=self.request)
         return value
 
     def __str__(self):
@@ -20,9 +22,10 @@ class SettingModuleProxy(dict):
     """
     Get a setting instance using proxy['modelname']
     """
-    def __init__(self, site, app_label):
+    def __init__(self, site, app_label, request=None):
         self.site = site
         self.app_label = app_label
+        self.request = request
 
     def __getitem__(self, model_name):
         """ Get a setting instance for a model """
@@ -42,6 +45,8 @@ class SettingModuleProxy(dict):
         if Model is None:
             return None
 
+        if self.request is not None:
+            return Model.for_request(self.request)
         return Model.for_site(self.site)
 
     def __str__(self):
@@ -57,4 +62,4 @@ def settings(request):
         # objects that don't have a request.site.
         return {}
     else:
-        return {'settings': SettingsProxy(site)}
+        return {'settings': SettingsProxy(site, request=request)}
@@ -17,23 +17,32 @@ class ContextCache(dict):
     """
     A cache of Sites and their Settings for a template Context
     """
+    def __init__(self, request=None):
+        super().__init__()
+        self.request = request
+
     def __missing__(self, key):
         """
         Make a SiteSetting for a new Site
         """
         if not(isinstance(key, Site)):
             raise TypeError
-        out = self[key] = SiteSettings(key)
+        if self.request is not None and getattr(self.request, 'site', None) == key:
+            out = self[key] = SiteSettings(key, request=self.request)
+        else:
+            out = self[key] = SiteSettings(key)
         return out
 
 
 class SiteSettings(dict):
     """
-    A cache of Settings for a specific Site
+    A cache of Settings for a specific Site. If a request for the site is given,
+    settings are also remembered on the request.
     """
-    def __init__(self, site):
+    def __init__(self, site, request=None):
         super().__init__()
         self.site = site
+        self.request = request
 
     def __getitem__(self, key):
         # Normalise all keys to lowercase
@@ -51,7 +60,10 @@ class SiteSettings(dict):
         if Model is None:
             raise KeyError('Unknown setting: {}'.format(key))
 
-        out = self[key] = Model.for_site(self.site)
+        if self.request is not None:
+            out = self[key] = Model.for_request(self.request)
+        else:
+            out = self[key] = Model.for_site(self.site)
         return out
 
 
@@ -70,7 +82,7 @@ def get_setting(context, model_string, use_default_site=False):
     try:
         context_cache = settings_cache[context]
     except KeyError:
-        context_cache = settings_cache[context] = ContextCache()
+        context_cache = settings_cache[context] = ContextCache(request=context.get('request'))
     # These ones all implement __missing__ in a useful way though
     return context_cache[site][model_string]
 
@@ -1,11 +1,38 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 
 from wagtail.core.models import Site
+from wagtail.core.sites import copy_instance
 
 from .registry import register_setting
 
 __all__ = ['BaseSetting', 'register_setting']
 
+SETTINGS_CACHE_VERSION_KEY = 'wagtail_settings_cache_version'
+
+# Per-process map of (setting model label, site ID) to setting instance, valid for as
+# long as the shared version stored under SETTINGS_CACHE_VERSION_KEY is unchanged
+_settings_cache = {'version': None, 'settings': {}}
+
+
+def get_settings_cache_version():
+    version = cache.get(SETTINGS_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(SETTINGS_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SETTINGS_CACHE_VERSION_KEY)
+    return version
+
+
+def clear_settings_cache():
+    """
+    Invalidate the setting instances cached by BaseSetting.for_site in every
+    process sharing the Django cache.
+    """
+    cache.set(SETTINGS_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
 
 class BaseSetting(models.Model):
     """
@@ -24,5 +51,44 @@ class BaseSetting(models.Model):
         """
         Get an instance of this setting for the site.
         """
+        if getattr(settings, 'WAGTAILSETTINGS_CACHE', False):
+            return cls._get_cached_for_site(site)
+
         instance, created = cls.objects.get_or_create(site=site)
         return instance
+
+    @classmethod
+    def _get_cached_for_site(cls, site):
+        version = get_settings_cache_version()
+        if _settings_cache['version'] != version:
+            _settings_cache['settings'] = {}
+            _settings_cache['version'] = version
+        cached_settings = _settings_cache['settings']
+
+        key = (cls._meta.label_lower, site.pk)
+        try:
+            instance = cached_settings[key]
+        except KeyError:
+            instance, created = cls.objects.get_or_create(site=site)
+            cached_settings[key] = instance
+
+        # Hand out a copy so that changes made during one request are not shared with others
+        return copy_instance(instance)
+
+    @classmethod
+    def for_request(cls, request):
+        """
+        Get an instance of this setting for the site of the request. The instance
+        is remembered on the request, so it is only looked up once per request.
+        """
+        attr_name = cls._get_cache_attr_name()
+        if hasattr(request, attr_name):
+            return getattr(request, attr_name)
+
+        instance = cls.for_site(request.site)
+        setattr(request, attr_name, instance)
+        return instance
+
+    @classmethod
+    def _get_cache_attr_name(cls):
+        return '_{}.{}'.format(cls._meta.app_label, cls._meta.model_name).lower()
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+
+from wagtail.contrib.settings.models import clear_settings_cache
+from wagtail.contrib.settings.registry import registry
+
+
+def setting_changed_signal_handler(sender, instance, **kwargs):
+    clear_settings_cache()
+
+
+def register_signal_handlers():
+    for model in registry:
+        post_save.connect(setting_changed_signal_handler, sender=model)
+        post_delete.connect(setting_changed_signal_handler, sender=model)
@@ -11,11 +11,13 @@ register = Library()
 def get_settings(context, use_default_site=False):
     if use_default_site:
         site = Site.objects.get(is_default_site=True)
+        request = None
     elif 'request' in context:
-        site = context['request'].site
+        request = context['request']
+        site = request.site
     else:
         raise RuntimeError('No request found in context, and use_default_site '
                            'flag not set')
 
-    context['settings'] = SettingsProxy(site)
+    context['settings'] = SettingsProxy(site, request=request)
     return ''
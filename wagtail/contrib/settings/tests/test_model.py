@@ -0,0 +1,118 @@
+from unittest import mock
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail.contrib.settings.models import clear_settings_cache
+from wagtail.core.models import Page, Site
+from wagtail.tests.testapp.models import TestSetting
+
+
+class SettingModelTestCase(TestCase):
+    def setUp(self):
+        root = Page.objects.first()
+        other_home = Page(title='Other Root')
+        root.add_child(instance=other_home)
+
+        self.default_site = Site.objects.get(is_default_site=True)
+        self.other_site = Site.objects.create(hostname='other', root_page=other_home)
+
+        self.test_setting = TestSetting.objects.create(
+            title='Site title',
+            email='initial@example.com',
+            site=self.default_site)
+
+        self.other_setting = TestSetting.objects.create(
+            title='Other title',
+            email='other@example.com',
+            site=self.other_site)
+
+    def get_request(self, site=None):
+        if site is None:
+            site = self.default_site
+        request = RequestFactory().get('/test/', HTTP_HOST=site.hostname)
+        request.site = site
+        return request
+
+
+class TestForRequest(SettingModelTestCase):
+    def test_for_request(self):
+        request = self.get_request(site=self.other_site)
+        self.assertEqual(TestSetting.for_request(request), self.other_setting)
+
+    def test_for_request_remembers_setting(self):
+        request = self.get_request()
+
+        with self.assertNumQueries(1):
+            setting = TestSetting.for_request(request)
+
+        with self.assertNumQueries(0):
+            self.assertIs(TestSetting.for_request(request), setting)
+
+        # a new request looks it up again
+        with self.assertNumQueries(1):
+            TestSetting.for_request(self.get_request())
+
+    def test_for_request_creates_setting(self):
+        self.test_setting.delete()
+
+        setting = TestSetting.for_request(self.get_request())
+
+        self.assertEqual(setting.site, self.default_site)
+        self.assertTrue(TestSetting.objects.filter(site=self.default_site).exists())
+
+
+@override_settings(
+    WAGTAILSETTINGS_CACHE=True,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class TestSettingsCache(SettingModelTestCase):
+    def setUp(self):
+        super().setUp()
+        clear_settings_cache()
+
+    def test_no_queries_once_cached(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(TestSetting.for_site(self.default_site).title, 'Site title')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(TestSetting.for_site(self.default_site).title, 'Site title')
+            self.assertEqual(TestSetting.for_request(self.get_request()).title, 'Site title')
+
+    def test_cached_per_site(self):
+        self.assertEqual(TestSetting.for_site(self.default_site), self.test_setting)
+        self.assertEqual(TestSetting.for_site(self.other_site), self.other_setting)
+
+    def test_returns_copies(self):
+        setting = TestSetting.for_site(self.default_site)
+        setting.title = 'Changed but not saved'
+
+        self.assertEqual(TestSetting.for_site(self.default_site).title, 'Site title')
+
+    def test_cache_cleared_on_save(self):
+        TestSetting.for_site(self.default_site)
+
+        self.test_setting.title = 'New title'
+        self.test_setting.save()
+
+        self.assertEqual(TestSetting.for_site(self.default_site).title, 'New title')
+
+    def test_cache_cleared_on_delete(self):
+        TestSetting.for_site(self.default_site)
+
+        self.test_setting.delete()
+
+        self.assertEqual(TestSetting.for_site(self.default_site).title, '')
+
+    def test_cache_not_cleared_for_other_models(self):
+        with mock.patch('wagtail.contrib.settings.signal_handlers.clear_settings_cache') as clear:
+            self.default_site.save()
+            clear.assert_not_called()
+
+            self.test_setting.save()
+            clear.assert_called_once_with()
+
+    def test_copies_do_not_share_related_objects(self):
+        setting = TestSetting.for_site(self.default_site)
+        setting.site.site_name = 'Changed but not saved'
+
+        self.assertNotEqual(TestSetting.for_site(self.default_site).site.site_name, 'Changed but not saved')
@@ -77,15 +77,26 @@ class TestContextProcessor(TemplateTestCase):
 
     def test_models_cached(self):
         """ Accessing a setting should only hit the DB once per render """
-        request = self.get_request()
         get_title = '{{ settings.tests.testsetting.title }}'
 
         for i in range(1, 4):
+            request = self.get_request()
             with self.assertNumQueries(1):
                 self.assertEqual(
                     self.render(request, get_title * i),
                     self.test_setting.title * i)
 
+    def test_settings_remembered_on_request(self):
+        """ Settings should only be looked up once per request, across renders """
+        request = self.get_request()
+        get_title = '{{ settings.tests.testsetting.title }}'
+
+        with self.assertNumQueries(1):
+            self.render(request, get_title)
+            self.render(request, get_title)
+
+        self.assertEqual(getattr(request, '_tests.testsetting'), self.test_setting)
+
 
 class TestTemplateTag(TemplateTestCase):
     def test_no_context_processor(self):
@@ -217,10 +228,10 @@ class TestSettingsJinja(TemplateTestCase):
         # Cant use the default 'self.render()' as it does DB queries to get
         # site, dummy request
         site = Site.objects.get(is_default_site=True)
-        request = self.client.get('/test/', HTTP_HOST=site.hostname)
-        request.site = site
 
         for i in range(1, 4):
+            request = self.client.get('/test/', HTTP_HOST=site.hostname)
+            request.site = site
             with self.assertNumQueries(1):
                 context = {'request': request}
                 template = self.engine.from_string(get_title * i)
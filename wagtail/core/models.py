@@ -2,7 +2,7 @@ import json
 import logging
 from collections import defaultdict
 from io import StringIO
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
 from warnings import warn
 
 from django.conf import settings
@@ -18,9 +18,10 @@ from django.db.models import Case, Q, Value, When
 from django.db.models.functions import Concat, Substr
 from django.http import Http404
 from django.template.response import TemplateResponse
-from django.urls import reverse
-from django.utils import timezone
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils import timezone, translation
 from django.utils.functional import cached_property
+from django.utils.http import RFC3986_SUBDELIMS
 from django.utils.text import capfirst, slugify
 from django.utils.translation import ugettext_lazy as _
 from modelcluster.models import (
@@ -29,7 +30,8 @@ from treebeard.mp_tree import MP_Node
 
 from wagtail.core.query import PageQuerySet, TreeQuerySet
 from wagtail.core.signals import page_published, page_unpublished
-from wagtail.core.sites import get_site_for_hostname
+from wagtail.core.sites import (
+    get_cached_site_for_hostname, get_site_for_hostname, get_site_root_paths_index)
 from wagtail.core.url_routing import RouteResult
 from wagtail.core.utils import WAGTAIL_APPEND_SLASH, camelcase_to_underscore, resolve_model_string
 from wagtail.search import index
@@ -40,6 +42,10 @@ logger = logging.getLogger('wagtail.core')
 
 PAGE_TEMPLATE_VAR = 'page'
 
+# Per-process map of (URLconf, script prefix, language) to the URL of the wagtail_serve
+# view for the site root, which page URLs are built on
+_serve_url_prefixes = {}
+
 
 class SiteManager(models.Manager):
     def get_by_natural_key(self, hostname, port):
@@ -109,10 +115,15 @@ class Site(models.Model):
 
         NB this means that high-numbered ports on an extant hostname may
         still be routed to a different hostname which is set as the default
+
+        If the ``WAGTAIL_SITE_CACHE`` setting is enabled, the result is kept
+        in process memory until Site records (or their root pages) change.
         """
 
         hostname = request.get_host().split(':')[0]
         port = request.get_port()
+        if getattr(settings, 'WAGTAIL_SITE_CACHE', False):
+            return get_cached_site_for_hostname(hostname, port)
         return get_site_for_hostname(hostname, port)
 
     @property
@@ -167,6 +178,27 @@ class Site(models.Model):
 PAGE_MODEL_CLASSES = []
 
 
+def _get_serve_url_prefix_key():
+    """
+    Return the URLconf, script prefix and language that the result of
+    _get_serve_url_prefix depends on
+    """
+    return (get_urlconf() or settings.ROOT_URLCONF, get_script_prefix(), translation.get_language())
+
+
+def _get_serve_url_prefix():
+    """
+    Return reverse('wagtail_serve', args=('',)), remembering the result for the
+    URLconf, script prefix and language it depends on
+    """
+    key = _get_serve_url_prefix_key()
+    try:
+        return _serve_url_prefixes[key]
+    except KeyError:
+        prefix = _serve_url_prefixes[key] = reverse('wagtail_serve', args=('',))
+        return prefix
+
+
 def get_page_models():
     """
     Returns a list of all non-abstract Page model classes defined in this project.
@@ -340,6 +372,8 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         index.FilterField('latest_revision_created_at'),
     ]
 
+    search_timestamp_fields = ['latest_revision_created_at', 'last_published_at']
+
     # Do not allow plain Page instances to be created through the Wagtail admin
     is_creatable = False
 
@@ -620,6 +654,40 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             else:
                 raise Http404
 
+    def route_by_url_path(self, request, path_components):
+        """
+        Equivalent to ``self.specific.route(request, path_components)``, but
+        looks up every page along the path in a single query on ``url_path``
+        rather than one query per path component. Control is handed over to
+        the page's own ``route`` method at the first page (including this one)
+        whose class overrides ``route``, such as ``RoutablePageMixin`` pages.
+        """
+        url_paths = [self.url_path]
+        for component in path_components:
+            url_paths.append(url_paths[-1] + component + '/')
+
+        pages_by_url_path = {
+            page.url_path: page
+            for page in Page.objects.filter(
+                url_path__in=url_paths[1:],
+                depth__gt=self.depth,
+                depth__lte=self.depth + len(path_components),
+            )
+        }
+
+        page = self
+        for i, component in enumerate(path_components):
+            if page.specific_class is not None and page.specific_class.route is not Page.route:
+                # this page has custom routing, so let it handle the rest of the path
+                return page.specific.route(request, path_components[i:])
+
+            child = pages_by_url_path.get(url_paths[i + 1])
+            if child is None or child.depth != page.depth + 1:
+                raise Http404
+            page = child
+
+        return page.specific.route(request, [])
+
     def get_admin_display_title(self):
         """
         Return the title for this page as it should appear in the admin backend;
@@ -745,6 +813,20 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             cache_object._wagtail_cached_site_root_paths = Site.get_site_root_paths()
             return cache_object._wagtail_cached_site_root_paths
 
+    def _get_site_root_paths_index(self, request=None):
+        """
+        Return the index of ``_get_site_root_paths()`` built by
+        ``get_site_root_paths_index``, cached alongside it on the request object
+        if available, so that it is only built once.
+        """
+        cache_object = request if request else self
+        try:
+            return cache_object._wagtail_cached_site_root_paths_index
+        except AttributeError:
+            cache_object._wagtail_cached_site_root_paths_index = get_site_root_paths_index(
+                self._get_site_root_paths(request))
+            return cache_object._wagtail_cached_site_root_paths_index
+
     def get_url_parts(self, request=None):
         """
         Determine the URL for this page and return it as a tuple of
@@ -757,40 +839,67 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         the custom URLs.
 
         Accepts an optional keyword argument ``request``, which may be used
-        to avoid repeated database / cache lookups. Typically, a page model
+        to avoid repeated database / cache lookups. The result is also
+        remembered on the request, so that linking to the same page many
+        times while rendering it is cheap. Typically, a page model
         that overrides ``get_url_parts`` should not need to deal with
         ``request`` directly, and should just pass it to the original method
         when calling ``super``.
         """
 
-        possible_sites = [
-            (pk, path, url)
-            for pk, path, url in self._get_site_root_paths(request)
-            if self.url_path.startswith(path)
-        ]
+        # URLs are remembered on the request, as templates such as menus often link
+        # to the same pages many times over
+        if request is not None:
+            try:
+                url_parts_cache = request._wagtail_cached_url_parts
+            except AttributeError:
+                url_parts_cache = request._wagtail_cached_url_parts = {}
+
+            current_site = getattr(request, 'site', None)
+            cache_key = (
+                self.pk, self.url_path, current_site.pk if current_site else None, _get_serve_url_prefix_key())
+            try:
+                return url_parts_cache[cache_key]
+            except KeyError:
+                pass
+
+        # Look up the sites rooted at each ancestor of the page, longest path first
+        site_root_paths_index = self._get_site_root_paths_index(request)
+        possible_sites = []
+        path = self.url_path
+        while path:
+            possible_sites.extend(site_root_paths_index.get(path, ()))
+            path = path[:path.rstrip('/').rfind('/') + 1]
 
         if not possible_sites:
-            return None
+            url_parts = None
+        else:
+            site_id, root_path, root_url = possible_sites[0]
 
-        site_id, root_path, root_url = possible_sites[0]
+            if hasattr(request, 'site'):
+                for site_id, root_path, root_url in possible_sites:
+                    if site_id == request.site.pk:
+                        break
+                else:
+                    site_id, root_path, root_url = possible_sites[0]
 
-        if hasattr(request, 'site'):
-            for site_id, root_path, root_url in possible_sites:
-                if site_id == request.site.pk:
-                    break
-            else:
-                site_id, root_path, root_url = possible_sites[0]
+            # Equivalent to reverse('wagtail_serve', args=(self.url_path[len(root_path):],)),
+            # without resolving the URLconf for every page
+            page_path = _get_serve_url_prefix() + quote(
+                self.url_path[len(root_path):], safe=RFC3986_SUBDELIMS + '/~:@')
+
+            # Remove the trailing slash from the URL reverse generates if
+            # WAGTAIL_APPEND_SLASH is False and we're not trying to serve
+            # the root path
+            if not WAGTAIL_APPEND_SLASH and page_path != '/':
+                page_path = page_path.rstrip('/')
 
-        page_path = reverse(
-            'wagtail_serve', args=(self.url_path[len(root_path):],))
+            url_parts = (site_id, root_url, page_path)
 
-        # Remove the trailing slash from the URL reverse generates if
-        # WAGTAIL_APPEND_SLASH is False and we're not trying to serve
-        # the root path
-        if not WAGTAIL_APPEND_SLASH and page_path != '/':
-            page_path = page_path.rstrip('/')
+        if request is not None:
+            url_parts_cache[cache_key] = url_parts
 
-        return (site_id, root_url, page_path)
+        return url_parts
 
     def get_full_url(self, request=None):
         """Return the full URL (including protocol / domain) to this page, or None if it is not routable"""
@@ -1,3 +1,5 @@
+from typing import List
+
 from django.db.models import Model
 from django.utils.safestring import mark_safe
 
@@ -25,8 +27,14 @@ def expand_db_html(html):
         embed_rules = features.get_embed_types()
         link_rules = features.get_link_types()
         FRONTEND_REWRITER = MultiRuleRewriter([
-            LinkRewriter({linktype: handler.expand_db_attributes for linktype, handler in link_rules.items()}),
-            EmbedRewriter({embedtype: handler.expand_db_attributes for embedtype, handler in embed_rules.items()})
+            LinkRewriter(
+                {linktype: handler.expand_db_attributes for linktype, handler in link_rules.items()},
+                {linktype: handler.expand_db_attributes_many for linktype, handler in link_rules.items()}
+            ),
+            EmbedRewriter(
+                {embedtype: handler.expand_db_attributes for embedtype, handler in embed_rules.items()},
+                {embedtype: handler.expand_db_attributes_many for embedtype, handler in embed_rules.items()}
+            )
         ])
 
     return FRONTEND_REWRITER(html)
@@ -76,6 +84,20 @@ class EntityHandler:
         model = cls.get_model()
         return model._default_manager.get(id=attrs['id'])
 
+    @classmethod
+    def get_many(cls, attrs_list: List[dict]) -> List[Model]:
+        """
+        Given a list of attribute dicts, returns the corresponding model instances
+        (or None for those that do not exist), fetched in a single query.
+        """
+        model = cls.get_model()
+        ids = [attrs['id'] for attrs in attrs_list if 'id' in attrs]
+        instances = {
+            str(instance.pk): instance
+            for instance in model._default_manager.filter(id__in=ids)
+        }
+        return [instances.get(str(attrs.get('id'))) for attrs in attrs_list]
+
     @staticmethod
     def expand_db_attributes(attrs: dict) -> str:
         """
@@ -84,6 +106,47 @@ class EntityHandler:
         """
         raise NotImplementedError
 
+    @classmethod
+    def expand_db_attributes_for_instance(cls, instance: Model, attrs: dict) -> str:
+        """
+        Given the model instance referenced by an entity tag (or None if it does not
+        exist) and the tag's dict of attributes, returns the real HTML representation.
+        Handlers that implement this have all their tags within a piece of rich text
+        expanded with a single ``get_many`` call.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def expands_in_bulk(cls) -> bool:
+        """
+        Returns whether tags can be expanded with ``expand_db_attributes_for_instance``,
+        which is not the case if a subclass only overrides ``expand_db_attributes``
+        """
+        for klass in cls.__mro__:
+            if klass is EntityHandler:
+                return False
+            if 'expand_db_attributes_for_instance' in vars(klass):
+                return True
+            if 'expand_db_attributes' in vars(klass):
+                return False
+        return False
+
+    @classmethod
+    def expand_db_attributes_many(cls, attrs_list: List[dict]) -> List[str]:
+        """
+        Given a list of attribute dicts from all the entity tags of this type within a
+        piece of rich text, returns the list of their real HTML representations. The
+        instances of handlers implementing ``expand_db_attributes_for_instance`` are
+        looked up all at once using ``get_many``; otherwise each tag is expanded
+        separately.
+        """
+        if cls.expands_in_bulk():
+            return [
+                cls.expand_db_attributes_for_instance(instance, attrs)
+                for attrs, instance in zip(attrs_list, cls.get_many(attrs_list))
+            ]
+        return [cls.expand_db_attributes(attrs) for attrs in attrs_list]
+
 
 class LinkHandler(EntityHandler):
     pass
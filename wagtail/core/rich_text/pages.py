@@ -1,7 +1,8 @@
 from django.utils.html import escape
 
-from wagtail.core.models import Page
+from wagtail.core.models import Page, Site
 from wagtail.core.rich_text import LinkHandler
+from wagtail.core.sites import get_site_root_paths_index
 
 
 class PageLinkHandler(LinkHandler):
@@ -19,6 +20,28 @@ class PageLinkHandler(LinkHandler):
     def expand_db_attributes(cls, attrs):
         try:
             page = cls.get_instance(attrs)
-            return '<a href="%s">' % escape(page.specific.url)
         except Page.DoesNotExist:
+            page = None
+        return cls.expand_db_attributes_for_instance(page, attrs)
+
+    @classmethod
+    def expand_db_attributes_for_instance(cls, page, attrs):
+        if page is None:
             return "<a>"
+        return '<a href="%s">' % escape(page.specific.url)
+
+    @classmethod
+    def get_many(cls, attrs_list):
+        ids = [attrs['id'] for attrs in attrs_list if 'id' in attrs]
+        pages = {str(page.pk): page for page in Page.objects.filter(id__in=ids).specific()}
+
+        # Share one copy of the site root paths and their index between the pages, rather
+        # than each page fetching and indexing its own when its URL is built
+        if pages:
+            site_root_paths = Site.get_site_root_paths()
+            site_root_paths_index = get_site_root_paths_index(site_root_paths)
+            for page in pages.values():
+                page._wagtail_cached_site_root_paths = site_root_paths
+                page._wagtail_cached_site_root_paths_index = site_root_paths_index
+
+        return [pages.get(str(attrs.get('id'))) for attrs in attrs_list]
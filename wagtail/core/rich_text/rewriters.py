@@ -3,6 +3,7 @@ Utility classes for rewriting elements of HTML-like strings
 """
 
 import re
+from collections import defaultdict
 
 FIND_A_TAG = re.compile(r'<a(\b[^>]*)>')
 FIND_EMBED_TAG = re.compile(r'<embed(\b[^>]*)/>')
@@ -20,14 +21,57 @@ def extract_attrs(attr_string):
     return attributes
 
 
+def rewrite_tags_in_bulk(pattern, html, get_rule_type, bulk_rules, replace_tag):
+    """
+    Rewrite all tags in html matching pattern. Tags whose rule type (as returned by
+    get_rule_type for the tag's attributes) has an entry in bulk_rules are passed to
+    that rule together, as a list of attribute dicts, so that the rule can look up
+    all the objects they refer to at once; the rule returns a list of HTML fragments
+    in the same order. All other tags are rewritten individually by replace_tag.
+    """
+    matches = list(pattern.finditer(html))
+    replacements = [None] * len(matches)
+    pending_tags = defaultdict(list)
+
+    for i, match in enumerate(matches):
+        attrs = extract_attrs(match.group(1))
+        rule_type = get_rule_type(attrs)
+        if rule_type in bulk_rules:
+            pending_tags[rule_type].append((i, attrs))
+        else:
+            replacements[i] = replace_tag(match)
+
+    for rule_type, tags in pending_tags.items():
+        fragments = bulk_rules[rule_type]([attrs for i, attrs in tags])
+        for (i, attrs), fragment in zip(tags, fragments):
+            replacements[i] = fragment
+
+    result = []
+    position = 0
+    for match, replacement in zip(matches, replacements):
+        result.append(html[position:match.start()])
+        result.append(replacement)
+        position = match.end()
+    result.append(html[position:])
+    return ''.join(result)
+
+
 class EmbedRewriter:
     """
     Rewrites <embed embedtype="foo" /> tags within rich text into the HTML fragment given by the
     embed rule for 'foo'. Each embed rule is a function that takes a dict of attributes and
     returns the HTML fragment.
+
+    If bulk_embed_rules is given, embeds of each type found in it are instead rewritten together
+    by a function that takes a list of attribute dicts and returns a list of HTML fragments.
     """
-    def __init__(self, embed_rules):
+    def __init__(self, embed_rules, bulk_embed_rules=None):
         self.embed_rules = embed_rules
+        self.bulk_embed_rules = bulk_embed_rules or {}
+
+    @staticmethod
+    def get_embed_type(attrs):
+        return attrs.get('embedtype')
 
     def replace_tag(self, match):
         attrs = extract_attrs(match.group(1))
@@ -39,6 +83,10 @@ class EmbedRewriter:
         return rule(attrs)
 
     def __call__(self, html):
+        if self.bulk_embed_rules:
+            return rewrite_tags_in_bulk(
+                FIND_EMBED_TAG, html, self.get_embed_type, self.bulk_embed_rules, self.replace_tag
+            )
         return FIND_EMBED_TAG.sub(self.replace_tag, html)
 
 
@@ -47,31 +95,37 @@ class LinkRewriter:
     Rewrites <a linktype="foo"> tags within rich text into the HTML fragment given by the
     rule for 'foo'. Each link rule is a function that takes a dict of attributes and
     returns the HTML fragment for the opening tag (only).
+
+    If bulk_link_rules is given, links of each type found in it are instead rewritten together
+    by a function that takes a list of attribute dicts and returns a list of HTML fragments.
     """
-    def __init__(self, link_rules):
+    def __init__(self, link_rules, bulk_link_rules=None):
         self.link_rules = link_rules
+        self.bulk_link_rules = bulk_link_rules or {}
 
-    def replace_tag(self, match):
-        attrs = extract_attrs(match.group(1))
+    @staticmethod
+    def get_link_type(attrs):
         try:
-            link_type = attrs['linktype']
+            return attrs['linktype']
         except KeyError:
-            link_type = None
             href = attrs.get('href', None)
             if href:
                 # From href attribute we try to detect only the linktypes that we
                 # currently support (`external` & `email`, `page` has a default handler)
                 # from the link chooser.
                 if href.startswith(('http:', 'https:')):
-                    link_type = 'external'
+                    return 'external'
                 elif href.startswith('mailto:'):
-                    link_type = 'email'
+                    return 'email'
                 elif href.startswith('#'):
-                    link_type = 'anchor'
+                    return 'anchor'
 
-            if not link_type:
-                # otherwise return ordinary links without a linktype unchanged
-                return match.group(0)
+    def replace_tag(self, match):
+        attrs = extract_attrs(match.group(1))
+        link_type = self.get_link_type(attrs)
+        if link_type is None:
+            # return ordinary links without a linktype unchanged
+            return match.group(0)
 
         try:
             rule = self.link_rules[link_type]
@@ -86,6 +140,10 @@ class LinkRewriter:
         return rule(attrs)
 
     def __call__(self, html):
+        if self.bulk_link_rules:
+            return rewrite_tags_in_bulk(
+                FIND_A_TAG, html, self.get_link_type, self.bulk_link_rules, self.replace_tag
+            )
         return FIND_A_TAG.sub(self.replace_tag, html)
 
 
@@ -1,20 +1,49 @@
 import logging
 
+from django.conf import settings
 from django.core.cache import cache
 from django.db.models.signals import post_delete, post_save, pre_delete
 
-from wagtail.core.models import Page, Site
+from wagtail.core.models import Page, Site, get_page_models
+from wagtail.core.sites import clear_site_cache, get_site_root_page_ids
+from wagtail.core.slugs import SLUG_CACHE_FIELDS, clear_slug_cache
 
 logger = logging.getLogger('wagtail.core')
 
 
-# Clear the wagtail_site_root_paths from the cache whenever Site records are updated.
+# Clear the wagtail_site_root_paths and cached Site lookups whenever Site records are updated.
 def post_save_site_signal_handler(instance, update_fields=None, **kwargs):
     cache.delete('wagtail_site_root_paths')
+    clear_site_cache()
 
 
 def post_delete_site_signal_handler(instance, **kwargs):
     cache.delete('wagtail_site_root_paths')
+    clear_site_cache()
+
+
+# Clear the pages cached for slugurl whenever pages are created, published, unpublished,
+# moved or deleted (all of which save the page's slug and location), or sites change
+def clear_slug_cache_signal_handler(**kwargs):
+    if getattr(settings, 'WAGTAIL_SLUGURL_CACHE', False):
+        clear_slug_cache()
+
+
+def post_save_page_clear_slug_cache(sender, instance, update_fields=None, **kwargs):
+    if not getattr(settings, 'WAGTAIL_SLUGURL_CACHE', False):
+        return
+
+    if update_fields is None or SLUG_CACHE_FIELDS.intersection(update_fields):
+        clear_slug_cache()
+
+
+# Cached Site lookups carry a copy of the root page, so refresh them when a root page is saved
+def post_save_page_clear_site_cache(sender, instance, **kwargs):
+    if not getattr(settings, 'WAGTAIL_SITE_CACHE', False):
+        return
+
+    if instance.pk in get_site_root_page_ids():
+        clear_site_cache()
 
 
 def pre_delete_page_unpublish(sender, instance, **kwargs):
@@ -31,6 +60,14 @@ def post_delete_page_log_deletion(sender, instance, **kwargs):
 def register_signal_handlers():
     post_save.connect(post_save_site_signal_handler, sender=Site)
     post_delete.connect(post_delete_site_signal_handler, sender=Site)
+    post_save.connect(clear_slug_cache_signal_handler, sender=Site)
+    post_delete.connect(clear_slug_cache_signal_handler, sender=Site)
+    post_delete.connect(clear_slug_cache_signal_handler, sender=Page)
+
+    # post_save is sent with the specific page model as the sender
+    for model in get_page_models():
+        post_save.connect(post_save_page_clear_site_cache, sender=model)
+        post_save.connect(post_save_page_clear_slug_cache, sender=model)
 
     pre_delete.connect(pre_delete_page_unpublish, sender=Page)
     post_delete.connect(post_delete_page_log_deletion, sender=Page)
@@ -1,4 +1,8 @@
+import copy
+import uuid
+
 from django.apps import apps
+from django.core.cache import cache
 from django.db.models import Case, IntegerField, Q, When
 
 MATCH_HOSTNAME_PORT = 0
@@ -6,6 +10,15 @@ MATCH_HOSTNAME_DEFAULT = 1
 MATCH_DEFAULT = 2
 MATCH_HOSTNAME = 3
 
+SITE_CACHE_VERSION_KEY = 'wagtail_site_cache_version'
+
+# Per-process cache of Site lookups, valid for as long as the shared version stored
+# under SITE_CACHE_VERSION_KEY is unchanged. 'hostnames' maps the hostname of each site
+# to the ports of the sites with that hostname, 'root_page_ids' is the set of site root
+# page ids, and 'sites' maps the keys given by get_site_cache_key to the Site found (or
+# None if no site matches)
+_site_cache = {'version': None, 'hostnames': None, 'root_page_ids': None, 'sites': {}}
+
 
 def get_site_for_hostname(hostname, port):
     """Return the wagtailcore.Site object for the given hostname and port."""
@@ -47,3 +60,111 @@ def get_site_for_hostname(hostname, port):
             return sites[len(sites) == 2]
 
     raise Site.DoesNotExist()
+
+
+def get_site_cache_version():
+    version = cache.get(SITE_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(SITE_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SITE_CACHE_VERSION_KEY)
+    return version
+
+
+def clear_site_cache():
+    """
+    Invalidate the Site lookups cached by get_cached_site_for_hostname in every
+    process sharing the Django cache.
+    """
+    cache.set(SITE_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_site_cache():
+    """
+    Return the per-process site cache, emptied first if the shared site cache
+    version has been bumped by clear_site_cache since it was filled.
+    """
+    version = get_site_cache_version()
+    if _site_cache['version'] != version:
+        Site = apps.get_model('wagtailcore.Site')
+
+        hostnames = {}
+        root_page_ids = set()
+        for hostname, port, root_page_id in Site.objects.values_list('hostname', 'port', 'root_page_id'):
+            hostnames.setdefault(hostname, set()).add(str(port))
+            root_page_ids.add(root_page_id)
+
+        _site_cache.update(version=version, hostnames=hostnames, root_page_ids=root_page_ids, sites={})
+
+    return _site_cache
+
+
+def get_site_cache_key(hostname, port, hostnames):
+    """
+    Return the key that the Site found for the given hostname and port is cached
+    under. The port only affects the lookup if a site has that hostname and port, and
+    the hostname only affects it if a site has that hostname, so every other request
+    shares the same entry and the number of entries can't grow beyond the number of
+    sites, whatever Host headers requests are made with.
+    """
+    if hostname not in hostnames:
+        return None
+    if str(port) in hostnames[hostname]:
+        return (hostname, str(port))
+    return (hostname, None)
+
+
+def get_site_root_page_ids():
+    """Return the set of the ids of the root pages of all sites."""
+    return get_site_cache()['root_page_ids']
+
+
+def copy_instance(instance):
+    # A shallow copy of a model instance shares its ModelState, and the related
+    # objects cached on it, with the original
+    instance_copy = copy.copy(instance)
+    instance_copy._state = copy.copy(instance._state)
+    instance_copy._state.fields_cache = {}
+    return instance_copy
+
+
+def get_cached_site_for_hostname(hostname, port):
+    """
+    Equivalent to get_site_for_hostname, but remembers the result in process
+    memory until the shared site cache version is bumped by clear_site_cache.
+    """
+    Site = apps.get_model('wagtailcore.Site')
+
+    site_cache = get_site_cache()
+    sites = site_cache['sites']
+    key = get_site_cache_key(hostname, port, site_cache['hostnames'])
+
+    try:
+        site = sites[key]
+    except KeyError:
+        try:
+            site = get_site_for_hostname(hostname, port)
+        except Site.DoesNotExist:
+            site = None
+        sites[key] = site
+
+    if site is None:
+        raise Site.DoesNotExist()
+
+    # Hand out a copy so that state attached to the site or its root page during
+    # one request (such as the cached Page.specific) is not shared with others
+    site_copy = copy_instance(site)
+    site_copy.root_page = copy_instance(site.root_page)
+    return site_copy
+
+
+def get_site_root_paths_index(site_root_paths):
+    """
+    Return a dict mapping each root path in the given list of (id, root_path, root_url)
+    tuples (as returned by Site.get_site_root_paths) to the tuples with that root path,
+    so that the sites of a page can be found by looking up each ancestor of its
+    url_path rather than by testing every site.
+    """
+    index = {}
+    for site_root_path in site_root_paths:
+        index.setdefault(site_root_path[1], []).append(site_root_path)
+    return index
@@ -0,0 +1,84 @@
+import uuid
+
+from django.apps import apps
+from django.core.cache import cache
+
+SLUG_CACHE_VERSION_KEY = 'wagtail_slug_cache_version'
+
+# Fields whose changes can alter which page a slug leads to, or where that page lives
+SLUG_CACHE_FIELDS = {'slug', 'url_path', 'path'}
+
+# Per-process map of (site ID or None, slug) to the (id, url_path) of the page that
+# slug leads to (or None if there isn't one), valid for as long as the shared version
+# stored under SLUG_CACHE_VERSION_KEY is unchanged
+_slug_cache = {'version': None, 'pages': {}}
+
+
+def get_page_for_slug(slug, site=None):
+    """
+    Return the first page with the given slug within the given site, or anywhere in
+    the tree if site is None
+    """
+    Page = apps.get_model('wagtailcore.Page')
+
+    if site is None:
+        pages = Page.objects.all()
+    else:
+        pages = Page.objects.in_site(site)
+
+    return pages.filter(slug=slug).first()
+
+
+def get_slug_cache_version(request=None):
+    # The version is only looked up once per request, as templates may use many slugs
+    try:
+        return request._wagtail_slug_cache_version
+    except AttributeError:
+        pass
+
+    version = cache.get(SLUG_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(SLUG_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SLUG_CACHE_VERSION_KEY)
+
+    if request is not None:
+        request._wagtail_slug_cache_version = version
+    return version
+
+
+def clear_slug_cache():
+    """
+    Invalidate the pages cached by get_cached_page_for_slug in every process sharing
+    the Django cache.
+    """
+    cache.set(SLUG_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_cached_page_for_slug(slug, site=None, request=None):
+    """
+    Equivalent to get_page_for_slug, but remembers the result for each (site, slug)
+    pair in process memory until the shared slug cache version is bumped by
+    clear_slug_cache. The page returned only carries the fields needed to build its
+    URL (id, slug and url_path).
+    """
+    Page = apps.get_model('wagtailcore.Page')
+
+    version = get_slug_cache_version(request)
+    if _slug_cache['version'] != version:
+        _slug_cache['pages'] = {}
+        _slug_cache['version'] = version
+    pages = _slug_cache['pages']
+
+    key = (site.pk if site is not None else None, slug)
+    try:
+        page_fields = pages[key]
+    except KeyError:
+        page = get_page_for_slug(slug, site)
+        page_fields = (page.pk, page.url_path) if page is not None else None
+        pages[key] = page_fields
+
+    if page_fields is None:
+        return None
+
+    page_id, url_path = page_fields
+    return Page(id=page_id, slug=slug, url_path=url_path)
@@ -1,12 +1,13 @@
 from django import template
+from django.conf import settings
 from django.shortcuts import reverse
 from django.template.defaulttags import token_kwargs
 from django.utils.encoding import force_str
 from django.utils.safestring import mark_safe
 
 from wagtail import VERSION, __version__
-from wagtail.core.models import Page
 from wagtail.core.rich_text import RichText, expand_db_html
+from wagtail.core.slugs import get_cached_page_for_slug, get_page_for_slug
 from wagtail.utils.version import get_main_version
 
 register = template.Library()
@@ -52,6 +53,14 @@ def slugurl(context, slug):
     that matches the slug on any site.
     """
 
+    if getattr(settings, 'WAGTAIL_SLUGURL_CACHE', False):
+        request = context.get('request')
+
+        def find_page(slug, site=None):
+            return get_cached_page_for_slug(slug, site, request=request)
+    else:
+        find_page = get_page_for_slug
+
     page = None
     try:
         current_site = context['request'].site
@@ -60,11 +69,11 @@ def slugurl(context, slug):
         pass
     else:
         if current_site is not None:
-            page = Page.objects.in_site(current_site).filter(slug=slug).first()
+            page = find_page(slug, current_site)
 
     # If no page is found, fall back to searching the whole tree.
     if page is None:
-        page = Page.objects.filter(slug=slug).first()
+        page = find_page(slug)
 
     if page:
         # call pageurl() instead of page.relative_url() here so we get the ``accepts_kwarg`` logic
@@ -1,5 +1,6 @@
 import datetime
 import json
+from unittest import mock
 from unittest.mock import Mock
 
 import pytz
@@ -7,13 +8,18 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.http import Http404, HttpRequest
 from django.test import Client, TestCase
 from django.test.client import RequestFactory
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import translation
 from freezegun import freeze_time
 
+from wagtail.core import sites
 from wagtail.core.models import Page, PageManager, Site, get_page_models
+from wagtail.core.sites import get_site_root_paths_index
 from wagtail.tests.testapp.models import (
     AbstractPage, Advert, AlwaysShowInMenusPage, BlogCategory, BlogCategoryBlogPage, BusinessChild,
     BusinessIndex, BusinessNowherePage, BusinessSubIndex, CustomManager, CustomManagerPage,
@@ -208,6 +214,124 @@ class TestSiteRouting(TestCase):
             self.assertEqual(Site.find_for_request(request), self.alternate_port_events_site)
 
 
+@override_settings(
+    ALLOWED_HOSTS=['localhost', 'events.example.com', 'unknown.site.com', 'other.site.com'],
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    WAGTAIL_SITE_CACHE=True,
+)
+class TestSiteCache(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.default_site = Site.objects.get(is_default_site=True)
+        self.events_page = Page.objects.get(url_path='/home/events/')
+        self.events_site = Site.objects.create(hostname='events.example.com', root_page=self.events_page)
+
+    def get_request(self, hostname, port='80'):
+        request = HttpRequest()
+        request.path = '/'
+        request.META['HTTP_HOST'] = hostname
+        request.META['SERVER_PORT'] = port
+        return request
+
+    def test_site_lookup_is_cached(self):
+        request = self.get_request('events.example.com')
+        # one query for the hostnames of all sites, and one for the site
+        with self.assertNumQueries(2):
+            site = Site.find_for_request(request)
+        self.assertEqual(site, self.events_site)
+
+        with self.assertNumQueries(0):
+            cached_site = Site.find_for_request(request)
+            self.assertEqual(cached_site, self.events_site)
+            self.assertEqual(cached_site.root_page, self.events_page)
+
+        # each lookup gets its own copy of the site
+        self.assertIsNot(cached_site, site)
+        self.assertIsNot(cached_site.root_page, site.root_page)
+
+    def test_unknown_hostname_lookup_is_cached(self):
+        request = self.get_request('unknown.site.com')
+        with self.assertNumQueries(2):
+            self.assertEqual(Site.find_for_request(request), self.default_site)
+        with self.assertNumQueries(0):
+            self.assertEqual(Site.find_for_request(request), self.default_site)
+
+    def test_cache_does_not_grow_with_hosts_and_ports(self):
+        Site.find_for_request(self.get_request('unknown.site.com'))
+        Site.find_for_request(self.get_request('events.example.com', '8000'))
+
+        # other unknown hostnames, and ports that no site uses, share the cached entries
+        with self.assertNumQueries(0):
+            self.assertEqual(Site.find_for_request(self.get_request('other.site.com')), self.default_site)
+            self.assertEqual(Site.find_for_request(self.get_request('unknown.site.com', '8080')), self.default_site)
+            self.assertEqual(Site.find_for_request(self.get_request('events.example.com', '8001')), self.events_site)
+
+        self.assertEqual(len(sites._site_cache['sites']), 2)
+
+        # a port used by a site has an entry of its own
+        alternate_port_site = Site.objects.create(hostname='events.example.com', port=8000, root_page=self.events_page)
+        self.assertEqual(Site.find_for_request(self.get_request('events.example.com', '8000')), alternate_port_site)
+        self.assertEqual(Site.find_for_request(self.get_request('events.example.com', '80')), self.events_site)
+        # with two sites for the hostname, other ports fall back to the default site
+        self.assertEqual(Site.find_for_request(self.get_request('events.example.com', '8001')), self.default_site)
+
+    def test_cached_site_copies_are_independent(self):
+        request = self.get_request('events.example.com')
+        site = Site.find_for_request(request)
+        site.root_page.title = "Changed"
+        site.root_page.specific
+
+        cached_site = Site.find_for_request(request)
+        self.assertEqual(cached_site.root_page.title, "Events")
+        self.assertNotIn('specific', cached_site.root_page.__dict__)
+
+    def test_saving_site_invalidates_cache(self):
+        request = self.get_request('events.example.com')
+        self.assertEqual(Site.find_for_request(request), self.events_site)
+
+        self.events_site.hostname = 'other.example.com'
+        self.events_site.save()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(Site.find_for_request(request), self.default_site)
+
+    def test_deleting_site_invalidates_cache(self):
+        request = self.get_request('events.example.com')
+        self.assertEqual(Site.find_for_request(request), self.events_site)
+
+        self.events_site.delete()
+
+        self.assertEqual(Site.find_for_request(request), self.default_site)
+
+    def test_saving_root_page_invalidates_cache(self):
+        request = self.get_request('events.example.com')
+        self.assertEqual(Site.find_for_request(request), self.events_site)
+
+        self.events_page.title = "Events and happenings"
+        self.events_page.save()
+
+        site = Site.find_for_request(request)
+        self.assertEqual(site.root_page.title, "Events and happenings")
+
+    def test_saving_other_pages_keeps_cache(self):
+        request = self.get_request('events.example.com')
+        Site.find_for_request(request)
+
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+        christmas_page.save(update_fields=['title'])
+        with override_settings(WAGTAIL_SITE_CACHE=False), CaptureQueriesContext(connection) as uncached_queries:
+            christmas_page.save(update_fields=['title'])
+
+        # the site cache doesn't add any queries to page saves
+        with CaptureQueriesContext(connection) as queries:
+            christmas_page.save(update_fields=['title'])
+        self.assertEqual(len(queries), len(uncached_queries))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Site.find_for_request(request), self.events_site)
+
+
 class TestRouting(TestCase):
     fixtures = ['test.json']
 
@@ -327,6 +451,56 @@ class TestRouting(TestCase):
         self.assertEqual(christmas_page.relative_url(default_site), '/site/events/christmas/')
         self.assertEqual(christmas_page.get_site(), default_site)
 
+    def test_url_parts_match_reverse(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        page = events_index.add_child(instance=SimplePage(title="Caf\u00e9", slug="caf\u00e9", content="hello"))
+
+        self.assertEqual(page.url, reverse('wagtail_serve', args=('events/caf\u00e9/',)))
+        self.assertEqual(page.url, '/events/caf%C3%A9/')
+
+    def test_url_parts_cached_on_request(self):
+        default_site = Site.objects.get(is_default_site=True)
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+
+        request = HttpRequest()
+        request.site = default_site
+        url_parts = christmas_page.get_url_parts(request=request)
+
+        with mock.patch('wagtail.core.models.get_site_root_paths_index') as get_site_root_paths_index:
+            self.assertEqual(christmas_page.get_url_parts(request=request), url_parts)
+            self.assertEqual(christmas_page.get_url(request=request), '/events/christmas/')
+
+        get_site_root_paths_index.assert_not_called()
+
+        # A page that has been moved gets its new URL
+        christmas_page.url_path = '/home/christmas/'
+        self.assertEqual(christmas_page.get_url(request=request), '/christmas/')
+
+    @override_settings(
+        ROOT_URLCONF='wagtail.tests.urls_multilang',
+        LANGUAGE_CODE='en',
+        LANGUAGES=[('en', "English"), ('fr', "French")],
+    )
+    def test_url_parts_cached_per_language(self):
+        request = HttpRequest()
+        request.site = Site.objects.get(is_default_site=True)
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+
+        with translation.override('en'):
+            self.assertEqual(christmas_page.get_url(request=request), '/en/events/christmas/')
+        with translation.override('fr'):
+            self.assertEqual(christmas_page.get_url(request=request), '/fr/events/christmas/')
+
+    def test_site_root_paths_indexed_once_per_request(self):
+        request = HttpRequest()
+        request.site = Site.objects.get(is_default_site=True)
+
+        with mock.patch('wagtail.core.models.get_site_root_paths_index', wraps=get_site_root_paths_index) as index_mock:
+            for page in Page.objects.filter(depth__gt=2):
+                page.get_url(request=request)
+
+        self.assertEqual(index_mock.call_count, 1)
+
     def test_request_routing(self):
         homepage = Page.objects.get(url_path='/home/')
         christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
@@ -365,6 +539,59 @@ class TestRouting(TestCase):
         with self.assertRaises(Http404):
             homepage.route(request, ['events', 'tentative-unpublished-event'])
 
+    def test_route_by_url_path(self):
+        homepage = Page.objects.get(url_path='/home/')
+        underpants_page = EventPage.objects.get(url_path='/home/secret-plans/steal-underpants/')
+
+        request = HttpRequest()
+        request.path = '/secret-plans/steal-underpants/'
+        # one query for all pages along the path, one for the specific page
+        with self.assertNumQueries(2):
+            (found_page, args, kwargs) = homepage.route_by_url_path(request, ['secret-plans', 'steal-underpants'])
+        self.assertEqual(found_page, underpants_page)
+        self.assertIsInstance(found_page, EventPage)
+
+    def test_route_by_url_path_to_site_root(self):
+        homepage = Page.objects.get(url_path='/home/')
+
+        request = HttpRequest()
+        request.path = '/'
+        (found_page, args, kwargs) = homepage.route_by_url_path(request, [])
+        self.assertEqual(found_page, homepage)
+
+    def test_route_by_url_path_to_unknown_page_returns_404(self):
+        homepage = Page.objects.get(url_path='/home/')
+
+        request = HttpRequest()
+        request.path = '/events/quinquagesima/'
+        with self.assertRaises(Http404):
+            homepage.route_by_url_path(request, ['events', 'quinquagesima'])
+
+        # a page outside the site root must not be reachable
+        request.path = '/home/events/'
+        with self.assertRaises(Http404):
+            homepage.route_by_url_path(request, ['home', 'events'])
+
+    def test_route_by_url_path_to_unpublished_page_returns_404(self):
+        homepage = Page.objects.get(url_path='/home/')
+
+        request = HttpRequest()
+        request.path = '/events/tentative-unpublished-event/'
+        with self.assertRaises(Http404):
+            homepage.route_by_url_path(request, ['events', 'tentative-unpublished-event'])
+
+    def test_route_by_url_path_defers_to_custom_route_method(self):
+        homepage = Page.objects.get(url_path='/home/')
+        saint_patrick_page = SingleEventPage.objects.get(url_path='/home/events/saint-patrick/')
+
+        # SingleEventPage.route accepts a 'pointless-suffix' path component that
+        # has no corresponding page
+        request = HttpRequest()
+        request.path = '/events/saint-patrick/pointless-suffix/'
+        (found_page, args, kwargs) = homepage.route_by_url_path(
+            request, ['events', 'saint-patrick', 'pointless-suffix'])
+        self.assertEqual(found_page, saint_patrick_page)
+
     # Override CACHES so we don't generate any cache-related SQL queries (tests use DatabaseCache
     # otherwise) and so cache.get will always return None.
     @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
@@ -436,6 +663,18 @@ class TestServeView(TestCase):
         self.assertContains(response, '<h1>Christmas</h1>')
         self.assertContains(response, '<h2>Event</h2>')
 
+    @override_settings(WAGTAIL_ROUTE_BY_URL_PATH=True)
+    def test_serve_with_route_by_url_path(self):
+        response = self.client.get('/events/christmas/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.templates[0].name, 'tests/event_page.html')
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        self.assertEqual(response.context['self'], christmas_page)
+
+        response = self.client.get('/events/quinquagesima/')
+        self.assertEqual(response.status_code, 404)
+
     def test_serve_unknown_page_returns_404(self):
         response = self.client.get('/events/quinquagesima/')
         self.assertEqual(response.status_code, 404)
@@ -1,11 +1,13 @@
 from unittest.mock import patch
 
 from django.test import TestCase
+from django.test.utils import override_settings
 
+from wagtail.core.models import Site
 from wagtail.core.rich_text import RichText, expand_db_html
 from wagtail.core.rich_text.feature_registry import FeatureRegistry
 from wagtail.core.rich_text.pages import PageLinkHandler
-from wagtail.core.rich_text.rewriters import LinkRewriter, extract_attrs
+from wagtail.core.rich_text.rewriters import EmbedRewriter, LinkRewriter, extract_attrs
 
 
 class TestPageLinktypeHandler(TestCase):
@@ -19,6 +21,58 @@ class TestPageLinktypeHandler(TestCase):
         result = PageLinkHandler.expand_db_attributes({'id': 1})
         self.assertEqual(result, '<a href="None">')
 
+    def test_expand_db_attributes_many(self):
+        result = PageLinkHandler.expand_db_attributes_many([{'id': 4}, {'id': 0}, {'id': 3}])
+        self.assertEqual(result, ['<a href="/events/christmas/">', '<a>', '<a href="/events/">'])
+
+    def test_expand_db_attributes_many_fetches_site_root_paths_once(self):
+        with patch.object(Site, 'get_site_root_paths', wraps=Site.get_site_root_paths) as get_site_root_paths:
+            PageLinkHandler.expand_db_attributes_many([{'id': 4}, {'id': 3}, {'id': 13}])
+
+        self.assertEqual(get_site_root_paths.call_count, 1)
+
+    def test_expand_db_attributes_many_indexes_site_root_paths_once(self):
+        with patch('wagtail.core.models.get_site_root_paths_index') as get_site_root_paths_index:
+            result = PageLinkHandler.expand_db_attributes_many([{'id': 4}, {'id': 3}, {'id': 13}])
+
+        self.assertEqual(result[:2], ['<a href="/events/christmas/">', '<a href="/events/">'])
+        get_site_root_paths_index.assert_not_called()
+
+    def test_expand_db_attributes_many_uses_overridden_expand_db_attributes(self):
+        class CustomPageLinkHandler(PageLinkHandler):
+            @classmethod
+            def expand_db_attributes(cls, attrs):
+                return '<a href="/custom/%s/">' % attrs['id']
+
+        result = CustomPageLinkHandler.expand_db_attributes_many([{'id': 4}, {'id': 0}])
+        self.assertEqual(result, ['<a href="/custom/4/">', '<a href="/custom/0/">'])
+
+    def test_expand_db_attributes_many_uses_overridden_expand_db_attributes_for_instance(self):
+        class CustomPageLinkHandler(PageLinkHandler):
+            @classmethod
+            def expand_db_attributes_for_instance(cls, page, attrs):
+                return '<a title="%s">' % (page.title if page else '')
+
+        result = CustomPageLinkHandler.expand_db_attributes_many([{'id': 4}, {'id': 0}])
+        self.assertEqual(result, ['<a title="Christmas">', '<a title="">'])
+        self.assertEqual(CustomPageLinkHandler.expand_db_attributes({'id': 4}), '<a title="Christmas">')
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_expand_db_html_with_multiple_page_links(self):
+        html = (
+            '<p><a linktype="page" id="4">Christmas</a>, <a linktype="page" id="13">Saint Patrick</a>'
+            ' and <a linktype="page" id="4">Christmas again</a> <a linktype="page" id="0">nowhere</a></p>'
+        )
+        # fetch the site root paths up front, so that only page lookups are counted
+        expand_db_html('<a linktype="page" id="4">Christmas</a>')
+        # one query for the pages, one per specific page type
+        with self.assertNumQueries(3):
+            result = expand_db_html(html)
+        self.assertEqual(result, (
+            '<p><a href="/events/christmas/">Christmas</a>, <a href="/events/saint-patrick/pointless-suffix/">Saint Patrick</a>'
+            ' and <a href="/events/christmas/">Christmas again</a> <a>nowhere</a></p>'
+        ))
+
 
 class TestExtractAttrs(TestCase):
     def test_extract_attr(self):
@@ -159,3 +213,42 @@ class TestLinkRewriterTagReplacing(TestCase):
         # Also call the rule if a custom linktype is mentioned.
         link_with_custom_linktype = rewriter('<a linktype="custom" href="tel:+4917640206387">')
         self.assertEqual(link_with_custom_linktype, '<a data-phone="true" href="tel:+4917640206387">')
+
+
+class TestBulkRewriting(TestCase):
+    def test_link_rewriter_with_bulk_rules(self):
+        calls = []
+
+        def expand_pages(attrs_list):
+            calls.append([attrs['id'] for attrs in attrs_list])
+            return ['<a href="/article/{}">'.format(attrs['id']) for attrs in attrs_list]
+
+        rewriter = LinkRewriter(
+            {'page': lambda attrs: '<a href="/single/{}">'.format(attrs['id'])},
+            {'page': expand_pages}
+        )
+        result = rewriter(
+            '<p><a linktype="page" id="3">three</a> <a href="https://wagtail.io/">external</a>'
+            ' <a linktype="custom">custom</a> <a linktype="page" id="4">four</a></p>'
+        )
+        self.assertEqual(result, (
+            '<p><a href="/article/3">three</a> <a href="https://wagtail.io/">external</a>'
+            ' <a>custom</a> <a href="/article/4">four</a></p>'
+        ))
+        # all page links are expanded by a single call
+        self.assertEqual(calls, [['3', '4']])
+
+    def test_embed_rewriter_with_bulk_rules(self):
+        calls = []
+
+        def expand_images(attrs_list):
+            calls.append([attrs['id'] for attrs in attrs_list])
+            return ['<img src="{}.jpg">'.format(attrs['id']) for attrs in attrs_list]
+
+        rewriter = EmbedRewriter({}, {'image': expand_images})
+        result = rewriter(
+            '<embed embedtype="image" id="1" /><p>text</p><embed embedtype="image" id="2" />'
+            '<embed embedtype="unknown" />'
+        )
+        self.assertEqual(result, '<img src="1.jpg"><p>text</p><img src="2.jpg">')
+        self.assertEqual(calls, [['1', '2']])
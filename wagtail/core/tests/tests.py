@@ -1,11 +1,14 @@
+from unittest import mock
+
 from django import template
 from django.core.cache import cache
 from django.http import HttpRequest
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls.exceptions import NoReverseMatch
 from django.utils.safestring import SafeString
 
 from wagtail.core.models import Page, Site
+from wagtail.core.slugs import clear_slug_cache
 from wagtail.core.templatetags.wagtailcore_tags import richtext, slugurl
 from wagtail.core.utils import resolve_model_string
 from wagtail.tests.testapp.models import SimplePage
@@ -114,6 +117,81 @@ class TestPageUrlTags(TestCase):
         self.assertEqual(result, '/events/')
 
 
+@override_settings(
+    WAGTAIL_SLUGURL_CACHE=True,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class TestSlugUrlCache(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        clear_slug_cache()
+
+    def get_slugurl(self, slug):
+        request = HttpRequest()
+        request.site = Site.objects.get(is_default_site=True)
+        # Warm up the site root paths cached on the request
+        Page.objects.get(url_path='/home/').get_url(request=request)
+        return slugurl(template.Context({'request': request}), slug)
+
+    def test_slugurl_is_cached(self):
+        self.assertEqual(self.get_slugurl('christmas'), '/events/christmas/')
+
+        request = HttpRequest()
+        request.site = Site.objects.get(is_default_site=True)
+        Page.objects.get(url_path='/home/').get_url(request=request)
+        with self.assertNumQueries(0):
+            self.assertEqual(slugurl(template.Context({'request': request}), 'christmas'), '/events/christmas/')
+            self.assertEqual(slugurl(template.Context({'request': request}), 'christmas'), '/events/christmas/')
+
+    def test_missing_slug_is_cached(self):
+        self.assertIsNone(self.get_slugurl('bad-slug-doesnt-exist'))
+
+        with mock.patch('wagtail.core.slugs.get_page_for_slug') as get_page_for_slug:
+            self.assertIsNone(self.get_slugurl('bad-slug-doesnt-exist'))
+
+        get_page_for_slug.assert_not_called()
+
+    def test_cache_cleared_when_page_moved(self):
+        self.assertEqual(self.get_slugurl('christmas'), '/events/christmas/')
+
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+        christmas_page.move(Page.objects.get(url_path='/home/'), pos='last-child')
+
+        self.assertEqual(self.get_slugurl('christmas'), '/christmas/')
+
+    def test_cache_cleared_when_page_published(self):
+        self.assertIsNone(self.get_slugurl('new-christmas'))
+
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/').specific
+        christmas_page.slug = 'new-christmas'
+        christmas_page.save_revision().publish()
+
+        self.assertEqual(self.get_slugurl('new-christmas'), '/events/new-christmas/')
+
+    def test_cache_cleared_when_page_deleted(self):
+        self.assertEqual(self.get_slugurl('christmas'), '/events/christmas/')
+
+        Page.objects.get(url_path='/home/events/christmas/').delete()
+
+        self.assertIsNone(self.get_slugurl('christmas'))
+
+    def test_cache_not_cleared_when_draft_saved(self):
+        self.get_slugurl('christmas')
+
+        with mock.patch('wagtail.core.signal_handlers.clear_slug_cache') as clear_slug_cache_mock:
+            Page.objects.get(url_path='/home/events/christmas/').save_revision()
+
+        clear_slug_cache_mock.assert_not_called()
+
+    @override_settings(WAGTAIL_SLUGURL_CACHE=False)
+    def test_page_save_skipped_when_disabled(self):
+        with mock.patch('wagtail.core.signal_handlers.SLUG_CACHE_FIELDS') as slug_cache_fields_mock:
+            Page.objects.get(url_path='/home/events/christmas/').save(update_fields=['title'])
+
+        slug_cache_fields_mock.intersection.assert_not_called()
+
+
 class TestSiteRootPathsCache(TestCase):
     fixtures = ['test.json']
 
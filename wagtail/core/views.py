@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
@@ -14,7 +15,10 @@ def serve(request, path):
         raise Http404
 
     path_components = [component for component in path.split('/') if component]
-    page, args, kwargs = request.site.root_page.specific.route(request, path_components)
+    if getattr(settings, 'WAGTAIL_ROUTE_BY_URL_PATH', False):
+        page, args, kwargs = request.site.root_page.route_by_url_path(request, path_components)
+    else:
+        page, args, kwargs = request.site.root_page.specific.route(request, path_components)
 
     for fn in hooks.get_hooks('before_serve_page'):
         result = fn(page, request, args, kwargs)
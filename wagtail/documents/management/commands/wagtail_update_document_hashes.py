@@ -0,0 +1,56 @@
+import hashlib
+
+from django.core.management.base import BaseCommand
+
+from wagtail.documents import get_document_model
+
+DEFAULT_CHUNK_SIZE = 100
+
+# Files are hashed a block at a time, so that large files aren't read into memory
+HASH_BLOCK_SIZE = 64 * 1024
+
+
+def get_file_hash(doc):
+    hasher = hashlib.sha1()
+    with doc.open_file() as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class Command(BaseCommand):
+    help = "Records the file hash and size of documents uploaded before they were stored"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, dest='chunk_size',
+            help="Number of documents to load at a time (default %d)" % DEFAULT_CHUNK_SIZE)
+
+    def handle(self, **options):
+        documents = get_document_model().objects.filter(file_hash='').order_by('pk')
+        last_pk = 0
+        updated_count = 0
+        error_count = 0
+
+        while True:
+            chunk = list(documents.filter(pk__gt=last_pk)[:options['chunk_size']])
+            if not chunk:
+                break
+
+            for doc in chunk:
+                try:
+                    doc.file_hash = get_file_hash(doc)
+                    doc.file_size = doc.file.size
+                except (IOError, OSError) as e:
+                    error_count += 1
+                    self.stderr.write("Failed to read the file of document %d: %s" % (doc.pk, e))
+                    continue
+
+                doc.save(update_fields=['file_hash', 'file_size'])
+                updated_count += 1
+
+            last_pk = chunk[-1].pk
+
+        self.stdout.write("Updated %d documents" % updated_count)
+        if error_count:
+            self.stdout.write("Failed to read the files of %d documents" % error_count)
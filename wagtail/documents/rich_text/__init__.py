@@ -18,6 +18,12 @@ class DocumentLinkHandler(LinkHandler):
     def expand_db_attributes(cls, attrs):
         try:
             doc = cls.get_instance(attrs)
-            return '<a href="%s">' % escape(doc.url)
         except (ObjectDoesNotExist, KeyError):
+            doc = None
+        return cls.expand_db_attributes_for_instance(doc, attrs)
+
+    @classmethod
+    def expand_db_attributes_for_instance(cls, doc, attrs):
+        if doc is None:
             return "<a>"
+        return '<a href="%s">' % escape(doc.url)
@@ -0,0 +1,54 @@
+from io import StringIO
+
+from django.core import management
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from wagtail.documents.models import Document
+
+
+class TestUpdateDocumentHashesCommand(TestCase):
+    def setUp(self):
+        self.documents = []
+        for i in range(3):
+            document = Document(title="Test document %d" % i)
+            document.file.save('example%d.doc' % i, ContentFile("A boring example document %d" % i))
+            self.documents.append(document)
+
+        Document.objects.update(file_hash='', file_size=None)
+
+    def tearDown(self):
+        for document in self.documents:
+            document.file.delete()
+
+    def run_command(self, **options):
+        output = StringIO()
+        management.call_command('wagtail_update_document_hashes', stdout=output, stderr=output, **options)
+        return output.getvalue()
+
+    def test_updates_hashes(self):
+        output = self.run_command(chunk_size=2)
+
+        self.assertIn("Updated 3 documents", output)
+        for document in Document.objects.all():
+            file_hash = document.file_hash
+            document.file_hash = ''
+            self.assertEqual(document.get_file_hash(), file_hash)
+            self.assertEqual(document.file_size, len("A boring example document 0"))
+
+    def test_skips_documents_with_hash(self):
+        Document.objects.filter(id=self.documents[0].id).update(file_hash='abc')
+
+        output = self.run_command()
+
+        self.assertIn("Updated 2 documents", output)
+        self.assertEqual(Document.objects.get(id=self.documents[0].id).file_hash, 'abc')
+
+    def test_reports_missing_files(self):
+        self.documents[0].file.delete(save=False)
+
+        output = self.run_command()
+
+        self.assertIn("Failed to read the file of document %d" % self.documents[0].id, output)
+        self.assertIn("Updated 2 documents", output)
+        self.assertEqual(Document.objects.get(id=self.documents[0].id).file_hash, '')
@@ -57,3 +57,17 @@ class TestFrontendDocumentLinkHandler(TestCase):
     def test_expand_db_attributes_with_missing_id(self):
         result = FrontendDocumentLinkHandler.expand_db_attributes({})
         self.assertEqual(result, '<a>')
+
+    def test_expand_db_attributes_many_for_frontend(self):
+        with self.assertNumQueries(1):
+            result = FrontendDocumentLinkHandler.expand_db_attributes_many([{'id': 1}, {'id': 0}, {}])
+        self.assertEqual(result, ['<a href="/documents/1/test.pdf">', '<a>', '<a>'])
+
+    def test_expand_db_attributes_many_uses_overridden_expand_db_attributes(self):
+        class CustomDocumentLinkHandler(FrontendDocumentLinkHandler):
+            @classmethod
+            def expand_db_attributes(cls, attrs):
+                return '<a href="/custom/%s/">' % attrs['id']
+
+        result = CustomDocumentLinkHandler.expand_db_attributes_many([{'id': 1}, {'id': 0}])
+        self.assertEqual(result, ['<a href="/custom/1/">', '<a href="/custom/0/">'])
@@ -68,6 +68,104 @@ class TestServeView(TestCase):
         _get_sendfile.clear()
 
 
+@override_settings(WAGTAILDOCS_SERVE_METHOD=None)
+class TestServeViewConditionalRequests(TestCase):
+    def setUp(self):
+        self.document = models.Document(title="Test document")
+        self.document.file.save('example.doc', ContentFile("A boring example document"))
+        self.etag = '"%s-25"' % self.document.get_file_hash()
+
+    def tearDown(self):
+        # delete the FieldFile directly because the TestCase does not commit
+        # transactions to trigger transaction.on_commit() in the signal handler
+        self.document.file.delete()
+
+    def get(self, **headers):
+        return self.client.get(reverse('wagtaildocs_serve', args=(self.document.id, self.document.filename)), **headers)
+
+    def test_etag_header(self):
+        response = self.get()
+
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_if_none_match(self):
+        response = self.get(HTTP_IF_NONE_MATCH=self.etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.etag)
+
+    def test_if_none_match_with_different_etag(self):
+        response = self.get(HTTP_IF_NONE_MATCH='"something-else"')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_range(self):
+        response = self.get(HTTP_RANGE='bytes=2-7')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-7/25')
+        self.assertEqual(response['Content-Length'], '6')
+        self.assertEqual(response['Content-Type'], 'application/msword')
+        self.assertEqual(b"".join(response.streaming_content), b"boring")
+
+    def test_open_ended_range(self):
+        response = self.get(HTTP_RANGE='bytes=17-')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 17-24/25')
+        self.assertEqual(b"".join(response.streaming_content), b"document")
+
+    def test_suffix_range(self):
+        response = self.get(HTTP_RANGE='bytes=-8')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"document")
+
+    def test_range_past_end_of_file(self):
+        response = self.get(HTTP_RANGE='bytes=17-1000')
+
+        self.assertEqual(response['Content-Range'], 'bytes 17-24/25')
+        self.assertEqual(b"".join(response.streaming_content), b"document")
+
+    def test_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE='bytes=25-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */25')
+
+    def test_multiple_ranges_serve_whole_file(self):
+        response = self.get(HTTP_RANGE='bytes=0-1,4-5')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"A boring example document")
+
+    def test_if_range(self):
+        response = self.get(HTTP_RANGE='bytes=2-7', HTTP_IF_RANGE=self.etag)
+
+        self.assertEqual(response.status_code, 206)
+
+    def test_if_range_with_different_etag(self):
+        response = self.get(HTTP_RANGE='bytes=2-7', HTTP_IF_RANGE='"something-else"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"A boring example document")
+
+    def test_document_without_file_hash(self):
+        # Documents uploaded before hashes were recorded are served without an ETag,
+        # rather than reading the whole file to work out its hash
+        models.Document.objects.filter(id=self.document.id).update(file_hash='')
+
+        with mock.patch.object(models.Document, 'save') as save:
+            response = self.get(HTTP_RANGE='bytes=2-7')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertEqual(b"".join(response.streaming_content), b"A boring example document")
+        save.assert_not_called()
+        self.assertEqual(models.Document.objects.get(id=self.document.id).file_hash, '')
+
+
 @override_settings(WAGTAILDOCS_SERVE_METHOD='redirect')
 class TestServeViewWithRedirect(TestCase):
     def setUp(self):
@@ -123,6 +221,7 @@ class TestServeWithExternalStorage(TestCase):
     def setUp(self):
         self.document = models.Document(title="Test document")
         self.document.file.save('example.doc', ContentFile("A boring example document"))
+        self.document.get_file_hash()
         self.serve_view_url = reverse('wagtaildocs_serve', args=(self.document.id, self.document.filename))
 
     def tearDown(self):
@@ -136,6 +235,14 @@ class TestServeWithExternalStorage(TestCase):
         response = self.client.get(self.serve_view_url)
         self.assertRedirects(response, self.document.file.url, fetch_redirect_response=False)
 
+    @override_settings(WAGTAILDOCS_SERVE_METHOD='serve_view')
+    def test_range(self):
+        response = self.client.get(self.serve_view_url, HTTP_RANGE='bytes=2-7')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-7/25')
+        self.assertEqual(b"".join(response.streaming_content), b"boring")
+
 
 @override_settings(WAGTAILDOCS_SERVE_METHOD=None)
 class TestServeViewWithSendfile(TestCase):
@@ -149,6 +256,7 @@ class TestServeViewWithSendfile(TestCase):
 
         self.document = models.Document(title="Test document")
         self.document.file.save('example.doc', ContentFile("A boring example document"))
+        self.document.get_file_hash()
 
     def tearDown(self):
         # delete the FieldFile directly because the TestCase does not commit
@@ -170,6 +278,19 @@ class TestServeViewWithSendfile(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['X-Sendfile'], self.document.file.path)
 
+    @override_settings(SENDFILE_BACKEND='sendfile.backends.xsendfile')
+    def test_sendfile_if_none_match(self):
+        self.clear_sendfile_cache()
+        etag = self.get()['ETag']
+
+        response = self.client.get(
+            reverse('wagtaildocs_serve', args=(self.document.id, self.document.filename)),
+            HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('X-Sendfile', response)
+
     @override_settings(
         SENDFILE_BACKEND='sendfile.backends.mod_wsgi',
         SENDFILE_ROOT=settings.MEDIA_ROOT,
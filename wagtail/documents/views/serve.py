@@ -1,3 +1,5 @@
+import mimetypes
+import re
 from wsgiref.util import FileWrapper
 
 from django.conf import settings
@@ -5,6 +7,7 @@ from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
 
 from wagtail.core import hooks
 from wagtail.core.forms import PasswordViewRestrictionForm
@@ -14,6 +17,106 @@ from wagtail.documents.models import document_served
 from wagtail.utils import sendfile_streaming_backend
 from wagtail.utils.sendfile import sendfile
 
+RANGE_RE = re.compile(r'^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$', re.IGNORECASE)
+
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def get_document_etag(doc):
+    """
+    Return a strong ETag for the file of the given document, derived from its hash
+    and size, or None if the file can't be read or its hash hasn't been recorded.
+    Hashes aren't worked out here, as that would mean reading the whole file on top
+    of serving it; the wagtail_update_document_hashes command records them for
+    documents uploaded before they were stored.
+    """
+    if not doc.file_hash:
+        return None
+
+    size = doc.get_file_size()
+    if size is None:
+        return None
+
+    return '"%s-%d"' % (doc.file_hash, size)
+
+
+def get_byte_range(request, etag, size):
+    """
+    Return the (first, last) byte positions requested by the Range header of the
+    request, or None if the whole file should be served. Only a single range of bytes
+    is supported; requests for several ranges are answered with the whole file, as
+    are requests whose If-Range header doesn't match the ETag of the file.
+
+    Raises RangeNotSatisfiable if the range starts after the end of the file.
+    """
+    header = request.META.get('HTTP_RANGE')
+    if not header or etag is None:
+        return None
+
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range is not None and if_range.strip() != etag:
+        # The client's copy is out of date, so it needs the whole file again
+        return None
+
+    match = RANGE_RE.match(header)
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if first:
+        first = int(first)
+        if first >= size:
+            raise RangeNotSatisfiable
+        last = min(int(last), size - 1) if last else size - 1
+        if last < first:
+            return None
+    elif last:
+        # A suffix range, for the last N bytes of the file
+        suffix_length = int(last)
+        if suffix_length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        first = max(size - suffix_length, 0)
+        last = size - 1
+    else:
+        return None
+
+    return first, last
+
+
+def iter_file_range(file, first, last):
+    """
+    Yield the contents of the given file from the first to the last byte position
+    (inclusive), closing the file at the end
+    """
+    try:
+        file.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def serve_byte_range(doc, first, last, size):
+    # Some external storage backends don't allow reopening the file, so get a fresh file instance
+    file = doc.file.storage.open(doc.file.name, 'rb')
+    content_type = mimetypes.guess_type(doc.filename)[0] or 'application/octet-stream'
+    response = StreamingHttpResponse(iter_file_range(file, first, last), status=206, content_type=content_type)
+
+    response['Content-Disposition'] = 'attachment; filename=%s' % doc.filename
+    response['Content-Range'] = 'bytes %d-%d/%d' % (first, last, size)
+    response['Content-Length'] = last - first + 1
+
+    return response
+
 
 def serve(request, document_id, document_filename):
     Document = get_document_model()
@@ -63,22 +166,53 @@ def serve(request, document_id, document_filename):
         # backwards compatibility behaviour.
         return redirect(direct_url)
 
-    if local_path:
+    # Documents are served with an ETag, so browsers can revalidate their copy with
+    # If-None-Match and resume or seek through downloads with Range / If-Range
+    etag = get_document_etag(doc)
+    if etag is not None:
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response['ETag'] = etag
+            return response
 
-        # Use wagtail.utils.sendfile to serve the file;
-        # this provides support for mimetypes, if-modified-since and django-sendfile backends
+    response = serve_file(request, doc, local_path, etag)
 
-        if hasattr(settings, 'SENDFILE_BACKEND'):
-            return sendfile(request, local_path, attachment=True, attachment_filename=doc.filename)
-        else:
-            # Fallback to streaming backend if user hasn't specified SENDFILE_BACKEND
-            return sendfile(
-                request,
-                local_path,
-                attachment=True,
-                attachment_filename=doc.filename,
-                backend=sendfile_streaming_backend.sendfile
-            )
+    if etag is not None and response.status_code in (200, 206):
+        response['ETag'] = etag
+        response['Accept-Ranges'] = 'bytes'
+
+    return response
+
+
+def serve_file(request, doc, local_path, etag):
+    # Sendfile backends hand the file over to the web server, which deals with ranges itself
+    if local_path and hasattr(settings, 'SENDFILE_BACKEND'):
+        return sendfile(request, local_path, attachment=True, attachment_filename=doc.filename)
+
+    if etag is not None:
+        size = doc.get_file_size()
+        try:
+            byte_range = get_byte_range(request, etag, size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */%d' % size
+            return response
+
+        if byte_range is not None:
+            return serve_byte_range(doc, byte_range[0], byte_range[1], size)
+
+    if local_path:
+
+        # Use wagtail.utils.sendfile to serve the file with the streaming backend, as the
+        # user hasn't specified SENDFILE_BACKEND;
+        # this provides support for mimetypes and if-modified-since
+        return sendfile(
+            request,
+            local_path,
+            attachment=True,
+            attachment_filename=doc.filename,
+            backend=sendfile_streaming_backend.sendfile
+        )
 
     else:
 
@@ -0,0 +1,124 @@
+"""
+Locks used to make sure that each rendition is only generated by one process at a time
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+try:
+    import fcntl
+except ImportError:
+    # not available on Windows
+    fcntl = None
+
+
+# Number of seconds after which a lock is considered stale, in case the process holding it died
+LOCK_TIMEOUT = 60
+
+# Number of seconds to wait for another process to finish generating a rendition, before
+# giving up and generating it ourselves
+WAIT_TIMEOUT = 30
+
+POLL_INTERVAL = 0.05
+
+# Number of lock files shared between all renditions when falling back on file locks
+FILE_LOCK_COUNT = 64
+
+
+class CacheLock:
+    """
+    A lock held by adding a key to a cache shared between processes, which may be on different
+    servers. Relies on the cache's add operation being atomic, as it is for memcached, redis
+    and the database cache.
+    """
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self.token = uuid.uuid4().hex
+
+    def acquire(self, wait_timeout):
+        deadline = time.monotonic() + wait_timeout
+        while not self.cache.add(self.key, self.token, LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+        return True
+
+    def release(self):
+        # Don't release a lock that expired and has since been taken by another process
+        if self.cache.get(self.key) == self.token:
+            self.cache.delete(self.key)
+
+
+class FileLock:
+    """
+    A lock held with flock on a file in the temporary directory, for when no shared cache is
+    available. This only excludes processes on the same server.
+    """
+    def __init__(self, key):
+        lock_number = int(hashlib.sha1(key.encode('utf-8')).hexdigest(), 16) % FILE_LOCK_COUNT
+        self.path = os.path.join(tempfile.gettempdir(), 'wagtail-rendition-%02d.lock' % lock_number)
+        self.file = None
+
+    def acquire(self, wait_timeout):
+        self.file = open(self.path, 'a')
+        deadline = time.monotonic() + wait_timeout
+        while True:
+            try:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    self.file.close()
+                    self.file = None
+                    return False
+                time.sleep(POLL_INTERVAL)
+
+    def release(self):
+        if self.file is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            self.file.close()
+            self.file = None
+
+
+def get_rendition_lock(image, filter_spec, focal_point_key):
+    """
+    Return a lock for generating the rendition of the given image, filter spec and focal point
+    key. A lock in the rendition cache (or the default cache) is used if that is shared between
+    processes, and a file lock otherwise.
+    """
+    key = 'wagtail-rendition-lock-%s-%s-%s' % (
+        image.pk, hashlib.sha1(filter_spec.encode('utf-8')).hexdigest(), focal_point_key
+    )
+    cache = caches[getattr(settings, 'WAGTAILIMAGES_RENDITION_CACHE', None) or 'default']
+
+    if isinstance(cache, (LocMemCache, DummyCache)) and fcntl is not None:
+        return FileLock(key)
+    else:
+        return CacheLock(cache, key)
+
+
+@contextmanager
+def rendition_lock(image, filter_spec, focal_point_key, wait_timeout=WAIT_TIMEOUT):
+    """
+    Context manager that waits until no other process is generating the rendition of the
+    given image, filter spec and focal point key, and holds a lock on it until the block
+    exits. Yields True if the lock was acquired, or False if waiting timed out, in which
+    case the block runs anyway.
+    """
+    lock = get_rendition_lock(image, filter_spec, focal_point_key)
+    acquired = lock.acquire(wait_timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            lock.release()
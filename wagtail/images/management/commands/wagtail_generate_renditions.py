@@ -0,0 +1,319 @@
+import multiprocessing
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.base import Lexer, TokenType
+from django.template.utils import get_app_template_dirs
+
+from wagtail.images import get_image_model
+from wagtail.images.exceptions import InvalidFilterSpecError
+from wagtail.images.models import Filter, SourceImageIOError
+from wagtail.images.templatetags.wagtailimages_tags import allowed_filter_pattern
+
+DEFAULT_CHUNK_SIZE = 100
+
+
+def get_template_dirs():
+    """
+    Return the directories searched by the Django template engines, including the
+    templates directories of installed apps
+    """
+    template_dirs = []
+    for engine in engines.all():
+        if isinstance(engine, DjangoTemplates):
+            template_dirs.extend(engine.engine.dirs)
+            if engine.engine.app_dirs:
+                template_dirs.extend(get_app_template_dirs('templates'))
+
+    # remove duplicates, keeping the order
+    return list(dict.fromkeys(str(template_dir) for template_dir in template_dirs))
+
+
+def get_filter_specs_from_template(source):
+    """
+    Return the filter specs used by the {% image %} and {% image_url %} tags in the
+    given template source
+    """
+    filter_specs = []
+
+    for token in Lexer(source).tokenize():
+        if token.token_type != TokenType.BLOCK:
+            continue
+
+        bits = token.split_contents()
+        if not bits:
+            # An empty {% %} tag
+            continue
+
+        if bits[0] == 'image' and len(bits) > 2:
+            # {% image self.photo max-320x200 [ custom-attr="value" ... ] [ as img ] %}
+            specs = []
+            for bit in bits[2:]:
+                if bit == 'as':
+                    break
+                if '=' not in bit and allowed_filter_pattern.match(bit):
+                    specs.append(bit)
+            if specs:
+                filter_specs.append('|'.join(specs))
+
+        elif bits[0] == 'image_url' and len(bits) > 2:
+            # {% image_url self.photo "max-320x200" %}; specs given as variables can't be found
+            spec = bits[2]
+            if len(spec) > 1 and spec[0] == spec[-1] and spec[0] in ('"', "'"):
+                filter_specs.append(spec[1:-1])
+
+    return filter_specs
+
+
+def find_filter_specs_in_templates():
+    """
+    Scan all templates (including the templates of StreamField blocks) for the filter
+    specs passed to the {% image %} and {% image_url %} tags
+    """
+    filter_specs = []
+
+    for template_dir in get_template_dirs():
+        for dirpath, dirnames, filenames in os.walk(template_dir):
+            for filename in filenames:
+                if not filename.endswith(('.html', '.txt', '.xml')):
+                    continue
+
+                try:
+                    with open(os.path.join(dirpath, filename), encoding='utf-8') as f:
+                        source = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+
+                for filter_spec in get_filter_specs_from_template(source):
+                    if filter_spec not in filter_specs:
+                        filter_specs.append(filter_spec)
+
+    return filter_specs
+
+
+class SizeOnlyImage:
+    """
+    Stands in for a Willow image when working out the size of a rendition, without
+    loading the original image
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def get_size(self):
+        return self.width, self.height
+
+    def crop(self, rect):
+        return SizeOnlyImage(rect.width, rect.height)
+
+    def resize(self, size):
+        return SizeOnlyImage(*size)
+
+    def set_background_color_rgb(self, color):
+        return self
+
+
+def estimate_rendition_size(image, filter):
+    """
+    Estimate the file size of a rendition, assuming it takes up the same number of bytes
+    per pixel as the original image
+    """
+    if not image.width or not image.height or not image.file_size:
+        return 0
+
+    willow = SizeOnlyImage(image.width, image.height)
+    env = {}
+    for operation in filter.operations:
+        willow = operation.run(willow, image, env) or willow
+
+    width, height = willow.get_size()
+    ratio = (width * height) / (image.width * image.height)
+    return int(image.file_size * min(ratio, 1))
+
+
+def init_worker():
+    # Worker processes may have been started without inheriting a configured Django
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+def generate_renditions(image_id, filter_specs):
+    """
+    Generate renditions of the image with the given ID for the given filter specs. Runs
+    in the worker processes, so returns the number of renditions generated and any error
+    message rather than raising.
+    """
+    try:
+        image = get_image_model().objects.get(id=image_id)
+    except get_image_model().DoesNotExist:
+        return image_id, 0, None
+
+    generated = 0
+    try:
+        for filter_spec in filter_specs:
+            image.create_rendition(Filter(spec=filter_spec))
+            generated += 1
+    except SourceImageIOError as e:
+        return image_id, generated, str(e)
+    except Exception as e:
+        # Any other failure, such as an image file that can't be decoded, only stops the
+        # renditions of this image from being generated
+        return image_id, generated, "%s: %s" % (type(e).__name__, e)
+
+    return image_id, generated, None
+
+
+class Command(BaseCommand):
+    help = "Generates any missing renditions of all images for the given filter specs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'filter_specs', nargs='*', metavar='filter_spec',
+            help="Filter spec of the renditions to generate, such as fill-300x300 or width-800|format-webp")
+        parser.add_argument(
+            '--from-templates', action='store_true', dest='from_templates', default=False,
+            help="Also generate the renditions used by {% image %} tags in templates, including StreamField block templates")
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Number of processes to generate renditions in (default 1)")
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, dest='chunk_size',
+            help="Number of images to load at a time (default %d)" % DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--start-after', type=int, default=0, dest='start_after',
+            help="Only process images with a higher ID, to resume an interrupted run")
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run', default=False,
+            help="Only report the number of missing renditions and an estimate of their total size")
+
+    def get_filters(self, options):
+        filter_specs = list(options['filter_specs'])
+
+        if options['from_templates']:
+            for filter_spec in find_filter_specs_in_templates():
+                if filter_spec not in filter_specs:
+                    filter_specs.append(filter_spec)
+
+        if not filter_specs:
+            raise CommandError("Please give at least one filter spec, or use --from-templates")
+
+        filters = []
+        for filter_spec in filter_specs:
+            filter = Filter(spec=filter_spec)
+            try:
+                filter.operations
+            except InvalidFilterSpecError as e:
+                if filter_spec in options['filter_specs']:
+                    raise CommandError("Invalid filter spec '%s': %s" % (filter_spec, e))
+
+                # Tags using a spec that doesn't exist would fail when rendered anyway
+                self.stderr.write("Skipping invalid filter spec '%s' found in templates" % filter_spec)
+                continue
+
+            filters.append(filter)
+
+        return filters
+
+    def get_image_chunks(self, image_model, chunk_size, start_after):
+        """
+        Yield the images in chunks ordered by ID. Each chunk is fetched by filtering on
+        the last ID seen, so that fetching later chunks doesn't get slower.
+        """
+        images = image_model.objects.order_by('pk')
+        last_pk = start_after
+
+        while True:
+            chunk = list(images.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                return
+
+            yield chunk
+            last_pk = chunk[-1].pk
+
+    def get_missing_renditions(self, chunk, filters):
+        """
+        Return a list of (image, filter specs) tuples for the renditions in the given
+        chunk of images that haven't been generated yet
+        """
+        Rendition = get_image_model().get_rendition_model()
+        existing = set(Rendition.objects.filter(
+            image_id__in=[image.pk for image in chunk],
+            filter_spec__in=[filter.spec for filter in filters],
+        ).values_list('image_id', 'filter_spec', 'focal_point_key'))
+
+        missing = []
+        for image in chunk:
+            missing_filters = [
+                filter for filter in filters
+                if (image.pk, filter.spec, filter.get_cache_key(image)) not in existing
+            ]
+            if missing_filters:
+                missing.append((image, missing_filters))
+
+        return missing
+
+    def handle(self, **options):
+        filters = self.get_filters(options)
+        image_model = get_image_model()
+        verbosity = options['verbosity']
+
+        if verbosity >= 1:
+            self.stdout.write("Generating renditions for filter specs: %s" % ", ".join(filter.spec for filter in filters))
+
+        total_images = image_model.objects.filter(pk__gt=options['start_after']).count()
+        processed_images = 0
+        missing_count = 0
+        estimated_size = 0
+        generated_count = 0
+        error_count = 0
+
+        pool = None
+        if options['workers'] > 1 and not options['dry_run']:
+            # Forked worker processes mustn't share the database connection of this one
+            connections.close_all()
+            pool = multiprocessing.Pool(options['workers'], initializer=init_worker)
+
+        try:
+            for chunk in self.get_image_chunks(image_model, options['chunk_size'], options['start_after']):
+                missing = self.get_missing_renditions(chunk, filters)
+
+                if options['dry_run']:
+                    for image, missing_filters in missing:
+                        missing_count += len(missing_filters)
+                        estimated_size += sum(estimate_rendition_size(image, filter) for filter in missing_filters)
+                else:
+                    tasks = [
+                        (image.pk, [filter.spec for filter in missing_filters])
+                        for image, missing_filters in missing
+                    ]
+                    if pool is not None:
+                        results = pool.starmap(generate_renditions, tasks)
+                    else:
+                        results = [generate_renditions(*task) for task in tasks]
+
+                    for image_id, generated, error in results:
+                        generated_count += generated
+                        if error:
+                            error_count += 1
+                            self.stderr.write("Failed to generate renditions for image %d: %s" % (image_id, error))
+
+                processed_images += len(chunk)
+                if verbosity >= 1:
+                    self.stdout.write("Processed %d/%d images (up to ID %d)" % (processed_images, total_images, chunk[-1].pk))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        if options['dry_run']:
+            self.stdout.write("%d renditions missing, estimated total size: %.1f MB" % (
+                missing_count, estimated_size / (1024 * 1024)))
+        else:
+            self.stdout.write("Generated %d renditions" % generated_count)
+            if error_count:
+                self.stdout.write("Failed to generate renditions for %d images" % error_count)
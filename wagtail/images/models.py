@@ -6,6 +6,8 @@ from io import BytesIO
 
 from django.conf import settings
 from django.core import checks
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.exceptions import ImproperlyConfigured
 from django.core.files import File
 from django.db import models
 from django.forms.utils import flatatt
@@ -21,6 +23,7 @@ from wagtail.admin.models import get_object_usage
 from wagtail.core import hooks
 from wagtail.core.models import CollectionMember
 from wagtail.images.exceptions import InvalidFilterSpecError
+from wagtail.images.locks import rendition_lock
 from wagtail.images.rect import Rect
 from wagtail.search import index
 from wagtail.search.queryset import SearchableQuerySetMixin
@@ -34,7 +37,38 @@ class SourceImageIOError(IOError):
 
 
 class ImageQuerySet(SearchableQuerySetMixin, models.QuerySet):
-    pass
+    def prefetch_renditions(self, *filters):
+        """
+        Prefetch the renditions of each image for the given filters (Filter objects
+        or filter spec strings), or all renditions if no filters are given, so that
+        get_rendition and get_renditions can find them without further queries.
+        """
+        Rendition = self.model.get_rendition_model()
+        renditions = Rendition.objects.all()
+        if filters:
+            renditions = renditions.filter(filter_spec__in=[
+                filter.spec if isinstance(filter, Filter) else filter for filter in filters
+            ])
+        return self.prefetch_related(
+            models.Prefetch('renditions', queryset=renditions, to_attr='prefetched_renditions')
+        )
+
+
+def get_rendition_cache():
+    """
+    Return the cache used to store rendition details, as specified by the
+    WAGTAILIMAGES_RENDITION_CACHE setting, or None if rendition caching is disabled.
+    """
+    alias = getattr(settings, 'WAGTAILIMAGES_RENDITION_CACHE', None)
+    if alias is None:
+        return None
+
+    try:
+        return caches[alias]
+    except InvalidCacheBackendError:
+        raise ImproperlyConfigured(
+            "WAGTAILIMAGES_RENDITION_CACHE refers to a cache '%s' that is not defined in CACHES" % alias
+        )
 
 
 def get_upload_to(instance, filename):
@@ -272,49 +306,150 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
         """ Get the Rendition model for this Image model """
         return cls.renditions.rel.related_model
 
+    def _get_prefetched_renditions(self):
+        # populated by ImageQuerySet.prefetch_renditions
+        return getattr(self, 'prefetched_renditions', [])
+
+    def find_existing_rendition(self, filter):
+        """
+        Return the existing rendition of this image for the given Filter, using
+        renditions prefetched by ImageQuerySet.prefetch_renditions or stored in the
+        rendition cache where available. Raises the rendition model's DoesNotExist
+        if no such rendition exists.
+        """
+        cache_key = filter.get_cache_key(self)
+        Rendition = self.get_rendition_model()
+
+        for rendition in self._get_prefetched_renditions():
+            if rendition.filter_spec == filter.spec and rendition.focal_point_key == cache_key:
+                return rendition
+
+        rendition_cache = get_rendition_cache()
+        if rendition_cache is not None:
+            rendition_fields = rendition_cache.get(
+                Rendition.construct_cache_key(self.pk, filter.spec, cache_key)
+            )
+            if rendition_fields is not None:
+                return Rendition(image=self, **rendition_fields)
+
+        rendition = self.renditions.get(
+            filter_spec=filter.spec,
+            focal_point_key=cache_key,
+        )
+        if rendition_cache is not None:
+            rendition.add_to_cache(rendition_cache)
+
+        return rendition
+
+    def create_rendition(self, filter):
+        """
+        Generate the rendition of this image for the given Filter and save it. Only
+        one process generates each rendition at a time; any others wait for it to
+        finish, and return the rendition it created.
+        """
+        cache_key = filter.get_cache_key(self)
+        Rendition = self.get_rendition_model()
+
+        with rendition_lock(self, filter.spec, cache_key):
+            try:
+                # Another process may have created the rendition while we were waiting for the lock
+                rendition = self.renditions.get(
+                    filter_spec=filter.spec,
+                    focal_point_key=cache_key,
+                )
+            except Rendition.DoesNotExist:
+                rendition = self._generate_rendition(filter, cache_key)
+
+        rendition_cache = get_rendition_cache()
+        if rendition_cache is not None:
+            rendition.add_to_cache(rendition_cache)
+
+        return rendition
+
+    def _generate_rendition(self, filter, cache_key):
+        # Generate the rendition image
+        generated_image = filter.run(self, BytesIO())
+
+        # Generate filename
+        input_filename = os.path.basename(self.file.name)
+        input_filename_without_extension, input_extension = os.path.splitext(input_filename)
+
+        # A mapping of image formats to extensions
+        FORMAT_EXTENSIONS = {
+            'jpeg': '.jpg',
+            'png': '.png',
+            'gif': '.gif',
+            'webp': '.webp',
+        }
+
+        output_extension = filter.spec.replace('|', '.') + FORMAT_EXTENSIONS[generated_image.format_name]
+        if cache_key:
+            output_extension = cache_key + '.' + output_extension
+
+        # Truncate filename to prevent it going over 60 chars
+        output_filename_without_extension = input_filename_without_extension[:(59 - len(output_extension))]
+        output_filename = output_filename_without_extension + '.' + output_extension
+
+        rendition, created = self.renditions.get_or_create(
+            filter_spec=filter.spec,
+            focal_point_key=cache_key,
+            defaults={'file': File(generated_image.f, name=output_filename)}
+        )
+
+        return rendition
+
     def get_rendition(self, filter):
         if isinstance(filter, str):
             filter = Filter(spec=filter)
 
-        cache_key = filter.get_cache_key(self)
         Rendition = self.get_rendition_model()
 
         try:
-            rendition = self.renditions.get(
-                filter_spec=filter.spec,
-                focal_point_key=cache_key,
-            )
+            rendition = self.find_existing_rendition(filter)
         except Rendition.DoesNotExist:
-            # Generate the rendition image
-            generated_image = filter.run(self, BytesIO())
-
-            # Generate filename
-            input_filename = os.path.basename(self.file.name)
-            input_filename_without_extension, input_extension = os.path.splitext(input_filename)
-
-            # A mapping of image formats to extensions
-            FORMAT_EXTENSIONS = {
-                'jpeg': '.jpg',
-                'png': '.png',
-                'gif': '.gif',
-                'webp': '.webp',
-            }
+            rendition = self.create_rendition(filter)
 
-            output_extension = filter.spec.replace('|', '.') + FORMAT_EXTENSIONS[generated_image.format_name]
-            if cache_key:
-                output_extension = cache_key + '.' + output_extension
+        return rendition
 
-            # Truncate filename to prevent it going over 60 chars
-            output_filename_without_extension = input_filename_without_extension[:(59 - len(output_extension))]
-            output_filename = output_filename_without_extension + '.' + output_extension
+    def get_renditions(self, *filters):
+        """
+        Return a dict of renditions of this image for the given filters (Filter
+        objects or filter spec strings), keyed by filter spec. Existing renditions
+        that have not been prefetched are fetched in a single query, and missing
+        ones are generated.
+        """
+        filters = [Filter(spec=filter) if isinstance(filter, str) else filter for filter in filters]
+        filters_by_key = {(filter.spec, filter.get_cache_key(self)): filter for filter in filters}
+        renditions = {}
 
-            rendition, created = self.renditions.get_or_create(
-                filter_spec=filter.spec,
-                focal_point_key=cache_key,
-                defaults={'file': File(generated_image.f, name=output_filename)}
-            )
+        for rendition in self._get_prefetched_renditions():
+            if (rendition.filter_spec, rendition.focal_point_key) in filters_by_key:
+                renditions[rendition.filter_spec] = rendition
 
-        return rendition
+        Rendition = self.get_rendition_model()
+        rendition_cache = get_rendition_cache()
+        if rendition_cache is not None:
+            rendition_cache_keys = {
+                Rendition.construct_cache_key(self.pk, filter_spec, focal_point_key): filter_spec
+                for filter_spec, focal_point_key in filters_by_key
+                if filter_spec not in renditions
+            }
+            for rendition_cache_key, rendition_fields in rendition_cache.get_many(rendition_cache_keys).items():
+                renditions[rendition_cache_keys[rendition_cache_key]] = Rendition(image=self, **rendition_fields)
+
+        missing_specs = [filter.spec for filter in filters if filter.spec not in renditions]
+        if missing_specs:
+            for rendition in self.renditions.filter(filter_spec__in=missing_specs):
+                if (rendition.filter_spec, rendition.focal_point_key) in filters_by_key:
+                    renditions[rendition.filter_spec] = rendition
+                    if rendition_cache is not None:
+                        rendition.add_to_cache(rendition_cache)
+
+        for filter in filters:
+            if filter.spec not in renditions:
+                renditions[filter.spec] = self.create_rendition(filter)
+
+        return renditions
 
     def is_portrait(self):
         return (self.width < self.height)
@@ -488,6 +623,34 @@ class AbstractRendition(models.Model):
     def alt(self):
         return self.image.title
 
+    @staticmethod
+    def construct_cache_key(image_id, filter_spec, focal_point_key):
+        """
+        Return the key under which the rendition of the given image, filter spec
+        and focal point key is stored in the rendition cache.
+        """
+        return 'wagtail-rendition-%s-%s-%s' % (
+            image_id, hashlib.sha1(filter_spec.encode('utf-8')).hexdigest(), focal_point_key
+        )
+
+    def get_cache_key(self):
+        return self.construct_cache_key(self.image_id, self.filter_spec, self.focal_point_key)
+
+    def add_to_cache(self, rendition_cache):
+        """
+        Store the details of this rendition in the rendition cache, so that it can
+        be reconstructed (with the url, width and height needed to output an <img>
+        tag) without a database query.
+        """
+        rendition_cache.set(self.get_cache_key(), {
+            'id': self.id,
+            'filter_spec': self.filter_spec,
+            'file': self.file.name,
+            'width': self.width,
+            'height': self.height,
+            'focal_point_key': self.focal_point_key,
+        })
+
     @property
     def attrs(self):
         """
@@ -23,7 +23,31 @@ class ImageEmbedHandler(EmbedHandler):
         try:
             image = cls.get_instance(attrs)
         except ObjectDoesNotExist:
+            image = None
+        return cls.expand_db_attributes_for_instance(image, attrs)
+
+    @classmethod
+    def expand_db_attributes_for_instance(cls, image, attrs):
+        if image is None:
             return '<img alt="">'
 
         image_format = get_image_format(attrs['format'])
         return image_format.image_to_html(image, attrs.get('alt', ''))
+
+    @classmethod
+    def get_many(cls, attrs_list):
+        # Prefetch the renditions needed by the image formats in use, so that
+        # expanding the embeds doesn't cost a further query per image
+        filter_specs = set()
+        for attrs in attrs_list:
+            try:
+                filter_specs.add(get_image_format(attrs['format']).filter_spec)
+            except KeyError:
+                pass
+
+        ids = [attrs['id'] for attrs in attrs_list if 'id' in attrs]
+        images = {
+            str(image.pk): image
+            for image in cls.get_model()._default_manager.filter(id__in=ids).prefetch_renditions(*filter_specs)
+        }
+        return [images.get(str(attrs.get('id'))) for attrs in attrs_list]
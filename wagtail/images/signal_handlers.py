@@ -1,8 +1,9 @@
 from django.conf import settings
 from django.db import transaction
-from django.db.models.signals import post_delete, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 
 from wagtail.images import get_image_model
+from wagtail.images.models import get_rendition_cache
 
 
 def post_delete_file_cleanup(instance, **kwargs):
@@ -18,6 +19,20 @@ def pre_save_image_feature_detection(instance, **kwargs):
             instance.set_focal_point(instance.get_suggested_focal_point())
 
 
+def post_save_image_clear_rendition_cache(instance, **kwargs):
+    rendition_cache = get_rendition_cache()
+    if rendition_cache is not None:
+        rendition_cache.delete_many([
+            rendition.get_cache_key() for rendition in instance.renditions.all()
+        ])
+
+
+def post_delete_rendition_clear_rendition_cache(instance, **kwargs):
+    rendition_cache = get_rendition_cache()
+    if rendition_cache is not None:
+        rendition_cache.delete(instance.get_cache_key())
+
+
 def register_signal_handlers():
     Image = get_image_model()
     Rendition = Image.get_rendition_model()
@@ -25,3 +40,5 @@ def register_signal_handlers():
     pre_save.connect(pre_save_image_feature_detection, sender=Image)
     post_delete.connect(post_delete_file_cleanup, sender=Image)
     post_delete.connect(post_delete_file_cleanup, sender=Rendition)
+    post_save.connect(post_save_image_clear_rendition_cache, sender=Image)
+    post_delete.connect(post_delete_rendition_clear_rendition_cache, sender=Rendition)
@@ -0,0 +1,112 @@
+"""
+Generation of renditions outside of the request/response cycle
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+from wagtail.images import get_image_model
+
+logger = logging.getLogger('wagtail.images')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def run_synchronously(func, *args):
+    """
+    Task runner that runs the task immediately, in the current thread.
+    """
+    try:
+        func(*args)
+    except Exception:
+        logger.exception("Error running image task %r", func)
+
+
+def _run_in_thread(func, *args):
+    try:
+        run_synchronously(func, *args)
+    finally:
+        # Database connections are per-thread, so close the ones opened by this task
+        connections.close_all()
+
+
+def run_in_thread_pool(func, *args):
+    """
+    Task runner that runs the task on a pool of background threads within the current
+    process. The number of threads is given by the WAGTAILIMAGES_TASK_THREADS setting
+    (default 2).
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'WAGTAILIMAGES_TASK_THREADS', 2),
+                thread_name_prefix='wagtailimages',
+            )
+
+    _executor.submit(_run_in_thread, func, *args)
+
+
+def get_task_runner():
+    """
+    Return the task runner specified by the WAGTAILIMAGES_TASK_RUNNER setting, as a
+    callable taking a function and its arguments. Defaults to run_in_thread_pool.
+    """
+    runner = getattr(settings, 'WAGTAILIMAGES_TASK_RUNNER', 'wagtail.images.tasks.run_in_thread_pool')
+    if isinstance(runner, str):
+        runner = import_string(runner)
+    return runner
+
+
+def get_eager_rendition_filter_specs(image):
+    """
+    Return the filter specs of the renditions to generate as soon as the given image is
+    uploaded, as specified by the WAGTAILIMAGES_EAGER_RENDITIONS setting. This is either a
+    list of filter specs to generate for all images, or a dict mapping collection names to
+    lists of filter specs, where the specs under the '*' key apply to all collections.
+    """
+    eager_renditions = getattr(settings, 'WAGTAILIMAGES_EAGER_RENDITIONS', [])
+
+    if isinstance(eager_renditions, dict):
+        filter_specs = list(eager_renditions.get('*', []))
+        if image.collection_id is not None:
+            filter_specs += [
+                filter_spec for filter_spec in eager_renditions.get(image.collection.name, [])
+                if filter_spec not in filter_specs
+            ]
+        return filter_specs
+
+    return list(eager_renditions)
+
+
+def generate_renditions(image_id, filter_specs):
+    """
+    Task that generates (if they don't exist already) the renditions of the image with
+    the given ID for the given filter specs.
+    """
+    try:
+        image = get_image_model().objects.get(id=image_id)
+    except get_image_model().DoesNotExist:
+        # the image was deleted before the task ran
+        return
+
+    image.get_renditions(*filter_specs)
+
+
+def generate_eager_renditions(image):
+    """
+    Schedule the generation of the eager renditions for the given image (see
+    get_eager_rendition_filter_specs) on the task runner, once the current
+    transaction has been committed.
+    """
+    filter_specs = get_eager_rendition_filter_specs(image)
+    if filter_specs:
+        image_id = image.id
+        transaction.on_commit(lambda: get_task_runner()(generate_renditions, image_id, filter_specs))
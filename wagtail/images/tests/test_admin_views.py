@@ -1,4 +1,5 @@
 import json
+from unittest import mock
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
@@ -1091,6 +1092,23 @@ class TestMultipleImageUploader(TestCase, WagtailTestUtils):
         self.assertEqual(response_json['image_id'], response.context['image'].id)
         self.assertTrue(response_json['success'])
 
+    @override_settings(
+        WAGTAILIMAGES_EAGER_RENDITIONS=['max-165x165', 'fill-100x100'],
+        WAGTAILIMAGES_TASK_RUNNER='wagtail.images.tasks.run_synchronously',
+    )
+    def test_add_post_generates_eager_renditions(self):
+        with mock.patch('wagtail.images.tasks.transaction.on_commit', side_effect=lambda func: func()):
+            response = self.client.post(reverse('wagtailimages:add_multiple'), {
+                'files[]': SimpleUploadedFile('test.png', get_test_image_file().file.getvalue()),
+            }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(response.status_code, 200)
+        image = Image.objects.get(id=json.loads(response.content.decode())['image_id'])
+        self.assertEqual(
+            set(image.renditions.values_list('filter_spec', flat=True)),
+            {'max-165x165', 'fill-100x100'}
+        )
+
     def test_add_post_noajax(self):
         """
         This tests that only AJAX requests are allowed to POST to the add view
@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from wagtail.images.locks import CacheLock, FileLock, get_rendition_lock, rendition_lock
+from wagtail.images.models import Filter
+
+from .utils import Image, get_test_image_file
+
+
+class TestCacheLock(TestCase):
+    def test_lock_excludes_other_holders(self):
+        cache = caches['default']
+        lock = CacheLock(cache, 'wagtail-test-lock')
+        other_lock = CacheLock(cache, 'wagtail-test-lock')
+
+        self.assertTrue(lock.acquire(wait_timeout=0))
+        self.assertFalse(other_lock.acquire(wait_timeout=0))
+
+        lock.release()
+        self.assertTrue(other_lock.acquire(wait_timeout=0))
+        other_lock.release()
+
+    def test_release_does_not_remove_other_holders_lock(self):
+        cache = caches['default']
+        lock = CacheLock(cache, 'wagtail-test-lock')
+        other_lock = CacheLock(cache, 'wagtail-test-lock')
+
+        # simulate the lock expiring and being taken by someone else
+        self.assertTrue(other_lock.acquire(wait_timeout=0))
+        lock.release()
+
+        self.assertEqual(cache.get('wagtail-test-lock'), other_lock.token)
+        other_lock.release()
+
+
+class TestFileLock(TestCase):
+    def test_lock_excludes_other_holders(self):
+        lock = FileLock('wagtail-test-lock')
+        other_lock = FileLock('wagtail-test-lock')
+
+        self.assertTrue(lock.acquire(wait_timeout=0))
+        self.assertFalse(other_lock.acquire(wait_timeout=0))
+
+        lock.release()
+        self.assertTrue(other_lock.acquire(wait_timeout=0))
+        other_lock.release()
+
+
+class TestRenditionLock(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+
+    def test_uses_cache_lock_with_shared_cache(self):
+        self.assertIsInstance(get_rendition_lock(self.image, 'width-400', ''), CacheLock)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_uses_file_lock_with_local_cache(self):
+        self.assertIsInstance(get_rendition_lock(self.image, 'width-400', ''), FileLock)
+
+    def test_lock_is_per_rendition(self):
+        with rendition_lock(self.image, 'width-400', '') as acquired:
+            self.assertTrue(acquired)
+
+            with rendition_lock(self.image, 'width-400', '', wait_timeout=0) as acquired:
+                self.assertFalse(acquired)
+
+            with rendition_lock(self.image, 'width-200', '', wait_timeout=0) as acquired:
+                self.assertTrue(acquired)
+
+        with rendition_lock(self.image, 'width-400', '', wait_timeout=0) as acquired:
+            self.assertTrue(acquired)
+
+    def test_create_rendition_returns_rendition_created_while_waiting(self):
+        rendition = self.image.get_rendition('width-400')
+
+        with mock.patch.object(Filter, 'run') as run:
+            self.assertEqual(self.image.create_rendition(Filter('width-400')), rendition)
+
+        run.assert_not_called()
@@ -0,0 +1,115 @@
+from io import StringIO
+
+from django.core import management
+from django.core.files.base import ContentFile
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from wagtail.images.management.commands.wagtail_generate_renditions import (
+    find_filter_specs_in_templates, get_filter_specs_from_template)
+
+from .utils import Image, get_test_image_file
+
+
+class TestGenerateRenditionsCommand(TestCase):
+    def setUp(self):
+        self.images = [
+            Image.objects.create(
+                title="Test image %d" % i,
+                file=get_test_image_file(),
+            )
+            for i in range(3)
+        ]
+
+    def run_command(self, *args, **options):
+        output = StringIO()
+        management.call_command('wagtail_generate_renditions', *args, stdout=output, stderr=StringIO(), **options)
+        output.seek(0)
+
+        return output.read()
+
+    def get_filter_specs(self, image):
+        return set(image.renditions.values_list('filter_spec', flat=True))
+
+    def test_generates_renditions(self):
+        output = self.run_command('width-400', 'fill-100x100|format-jpeg', chunk_size=2)
+
+        for image in self.images:
+            self.assertEqual(self.get_filter_specs(image), {'width-400', 'fill-100x100|format-jpeg'})
+
+        self.assertIn("Processed 3/3 images", output)
+        self.assertIn("Generated 6 renditions", output)
+
+    def test_only_generates_missing_renditions(self):
+        rendition = self.images[0].get_rendition('width-400')
+
+        output = self.run_command('width-400')
+
+        self.assertIn("Generated 2 renditions", output)
+        self.assertEqual(self.images[0].renditions.get(), rendition)
+
+    def test_start_after(self):
+        self.run_command('width-400', start_after=self.images[0].id)
+
+        self.assertEqual(self.get_filter_specs(self.images[0]), set())
+        self.assertEqual(self.get_filter_specs(self.images[1]), {'width-400'})
+        self.assertEqual(self.get_filter_specs(self.images[2]), {'width-400'})
+
+    def test_dry_run(self):
+        output = self.run_command('width-400', 'max-100x100', dry_run=True)
+
+        self.assertIn("6 renditions missing", output)
+        self.assertFalse(Image.get_rendition_model().objects.exists())
+
+    def test_reports_missing_source_files(self):
+        self.images[0].file.delete(save=False)
+
+        output = self.run_command('width-400')
+
+        self.assertIn("Generated 2 renditions", output)
+        self.assertIn("Failed to generate renditions for 1 images", output)
+
+    def test_reports_undecodable_source_files(self):
+        image = self.images[0]
+        file_name = image.file.storage.save('original_images/corrupt.png', ContentFile(b"This isn't an image"))
+        Image.objects.filter(id=image.id).update(file=file_name)
+
+        output = self.run_command('width-400')
+
+        self.assertIn("Generated 2 renditions", output)
+        self.assertIn("Failed to generate renditions for 1 images", output)
+
+    def test_requires_filter_specs(self):
+        with self.assertRaises(CommandError):
+            self.run_command()
+
+    def test_invalid_filter_spec(self):
+        with self.assertRaises(CommandError):
+            self.run_command('foo-400')
+
+
+class TestFindFilterSpecsInTemplates(TestCase):
+    def test_get_filter_specs_from_template(self):
+        source = """
+            {% load wagtailimages_tags %}
+            {% image page.photo fill-200x200 format-webp class="thumbnail" %}
+            {% image page.photo width-400 as photo %}
+            {% image_url page.photo "max-800x600" %}
+            {% image_url page.photo spec %}
+            {% if page.photo %}{{ page.photo.title }}{% endif %}
+            {% %}
+        """
+
+        self.assertEqual(
+            get_filter_specs_from_template(source),
+            ['fill-200x200|format-webp', 'width-400', 'max-800x600']
+        )
+
+    def test_find_filter_specs_in_templates(self):
+        filter_specs = find_filter_specs_in_templates()
+
+        # from tests/event_page.html
+        self.assertIn('width-200', filter_specs)
+
+        # from the templates of wagtailimages
+        self.assertIn('max-165x165', filter_specs)
@@ -2,6 +2,8 @@ import unittest
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.utils import IntegrityError
 from django.test import TestCase
@@ -252,6 +254,134 @@ class TestRenditions(TestCase):
         rendition = self.image.get_rendition('width-400')
         self.assertEqual(rendition.alt, "Test image")
 
+    def test_get_renditions(self):
+        existing_rendition = self.image.get_rendition('width-400')
+
+        renditions = self.image.get_renditions('width-400', 'max-100x100')
+
+        self.assertEqual(set(renditions.keys()), {'width-400', 'max-100x100'})
+        self.assertEqual(renditions['width-400'], existing_rendition)
+        self.assertEqual(renditions['max-100x100'].width, 100)
+
+        # existing renditions are all fetched in one query
+        with self.assertNumQueries(1):
+            renditions = self.image.get_renditions('width-400', 'max-100x100')
+        self.assertEqual(renditions['max-100x100'].filter_spec, 'max-100x100')
+
+    def test_prefetch_renditions(self):
+        width_rendition = self.image.get_rendition('width-400')
+        max_rendition = self.image.get_rendition('max-100x100')
+        self.image.get_rendition('min-120x120')
+
+        with self.assertNumQueries(2):
+            image = Image.objects.prefetch_renditions('width-400', 'max-100x100').get(id=self.image.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(image.get_rendition('width-400'), width_rendition)
+            self.assertEqual(image.get_rendition('max-100x100'), max_rendition)
+            self.assertEqual(image.get_renditions('width-400', 'max-100x100'), {
+                'width-400': width_rendition,
+                'max-100x100': max_rendition,
+            })
+            self.assertEqual(image.get_rendition('width-400').alt, "Test image")
+
+        # renditions that weren't prefetched are still found
+        with self.assertNumQueries(1):
+            self.assertEqual(image.get_rendition('min-120x120').width, 160)
+
+    def test_prefetch_all_renditions(self):
+        rendition = self.image.get_rendition('width-400')
+
+        image = Image.objects.prefetch_renditions().get(id=self.image.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(image.get_rendition('width-400'), rendition)
+
+    def test_prefetched_renditions_respect_focal_point(self):
+        self.image.get_rendition('fill-100x100')
+        self.image.set_focal_point(Rect(100, 100, 200, 200))
+        self.image.save()
+
+        image = Image.objects.prefetch_renditions('fill-100x100').get(id=self.image.id)
+        rendition = image.get_rendition('fill-100x100')
+
+        self.assertNotEqual(rendition.focal_point_key, '')
+
+
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'renditions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'renditions'},
+    },
+    WAGTAILIMAGES_RENDITION_CACHE='renditions',
+)
+class TestRenditionCache(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+
+    def tearDown(self):
+        caches['renditions'].clear()
+
+    def test_get_rendition_from_cache(self):
+        rendition = self.image.get_rendition('width-400')
+
+        with self.assertNumQueries(0):
+            cached_rendition = self.image.get_rendition('width-400')
+            self.assertEqual(cached_rendition.id, rendition.id)
+            self.assertEqual(cached_rendition.url, rendition.url)
+            self.assertEqual(cached_rendition.width, 400)
+            self.assertEqual(cached_rendition.height, 300)
+            self.assertEqual(cached_rendition.alt, "Test image")
+            self.assertEqual(cached_rendition.img_tag(), rendition.img_tag())
+
+    def test_get_renditions_from_cache(self):
+        self.image.get_renditions('width-400', 'max-100x100')
+
+        with self.assertNumQueries(0):
+            renditions = self.image.get_renditions('width-400', 'max-100x100')
+        self.assertEqual(renditions['width-400'].width, 400)
+        self.assertEqual(renditions['max-100x100'].width, 100)
+
+    def test_existing_rendition_is_cached_on_first_use(self):
+        rendition = self.image.get_rendition('width-400')
+        caches['renditions'].clear()
+
+        with self.assertNumQueries(1):
+            self.image.get_rendition('width-400')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.image.get_rendition('width-400').id, rendition.id)
+
+    def test_saving_image_clears_cache(self):
+        rendition = self.image.get_rendition('width-400')
+        self.image.title = "New title"
+        self.image.save()
+
+        self.assertIsNone(caches['renditions'].get(rendition.get_cache_key()))
+
+    def test_deleting_rendition_clears_cache(self):
+        rendition = self.image.get_rendition('width-400')
+        self.image.renditions.all().delete()
+
+        self.assertIsNone(caches['renditions'].get(rendition.get_cache_key()))
+        self.assertNotEqual(self.image.get_rendition('width-400').id, rendition.id)
+
+    def test_changing_focal_point_uses_new_rendition(self):
+        rendition = self.image.get_rendition('fill-100x100')
+        self.image.set_focal_point(Rect(100, 100, 200, 200))
+        self.image.save()
+
+        new_rendition = self.image.get_rendition('fill-100x100')
+        self.assertNotEqual(new_rendition.id, rendition.id)
+        self.assertNotEqual(new_rendition.focal_point_key, rendition.focal_point_key)
+
+    @override_settings(WAGTAILIMAGES_RENDITION_CACHE='nonexistent')
+    def test_invalid_cache_alias(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.image.get_rendition('width-400')
+
 
 class TestUsageCount(TestCase):
     fixtures = ['test.json']
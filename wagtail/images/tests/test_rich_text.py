@@ -114,3 +114,25 @@ class TestFrontendImageEmbedHandler(TestCase, WagtailTestUtils):
             'format': 'left',
         })
         self.assertTagInHTML('<img class="richtext-image left" alt="" />', result, allow_extra_attrs=True)
+
+    def test_expand_db_attributes_many_for_frontend(self):
+        Image.objects.create(id=1, title='Test', file=get_test_image_file())
+        Image.objects.create(id=2, title='Test 2', file=get_test_image_file())
+        result = FrontendImageEmbedHandler.expand_db_attributes_many([
+            {'id': 1, 'alt': 'first', 'format': 'left'},
+            {'id': 0, 'format': 'left'},
+            {'id': 2, 'alt': 'second', 'format': 'right'},
+        ])
+        self.assertEqual(len(result), 3)
+        self.assertTagInHTML('<img class="richtext-image left" alt="first" />', result[0], allow_extra_attrs=True)
+        self.assertEqual(result[1], '<img alt="">')
+        self.assertTagInHTML('<img class="richtext-image right" alt="second" />', result[2], allow_extra_attrs=True)
+
+    def test_expand_db_attributes_many_uses_overridden_expand_db_attributes(self):
+        class CustomImageEmbedHandler(FrontendImageEmbedHandler):
+            @classmethod
+            def expand_db_attributes(cls, attrs):
+                return '<img alt="custom %s">' % attrs['id']
+
+        result = CustomImageEmbedHandler.expand_db_attributes_many([{'id': 1, 'format': 'left'}, {'id': 0}])
+        self.assertEqual(result, ['<img alt="custom 1">', '<img alt="custom 0">'])
@@ -0,0 +1,116 @@
+import threading
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from wagtail.core.models import Collection
+from wagtail.images.tasks import (
+    generate_eager_renditions, generate_renditions, get_eager_rendition_filter_specs,
+    get_task_runner, run_in_thread_pool, run_synchronously)
+
+from .utils import Image, get_test_image_file
+
+
+class TestEagerRenditionFilterSpecs(TestCase):
+    def setUp(self):
+        root_collection = Collection.get_first_root_node()
+        self.gallery = root_collection.add_child(name="Gallery")
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        self.gallery_image = Image.objects.create(
+            title="Gallery image",
+            file=get_test_image_file(),
+            collection=self.gallery,
+        )
+
+    def test_no_eager_renditions_by_default(self):
+        self.assertEqual(get_eager_rendition_filter_specs(self.image), [])
+
+    @override_settings(WAGTAILIMAGES_EAGER_RENDITIONS=['max-165x165', 'width-800'])
+    def test_global_filter_specs(self):
+        self.assertEqual(get_eager_rendition_filter_specs(self.image), ['max-165x165', 'width-800'])
+        self.assertEqual(get_eager_rendition_filter_specs(self.gallery_image), ['max-165x165', 'width-800'])
+
+    @override_settings(WAGTAILIMAGES_EAGER_RENDITIONS={
+        '*': ['max-165x165'],
+        'Gallery': ['max-165x165', 'fill-300x300'],
+    })
+    def test_per_collection_filter_specs(self):
+        self.assertEqual(get_eager_rendition_filter_specs(self.image), ['max-165x165'])
+        self.assertEqual(get_eager_rendition_filter_specs(self.gallery_image), ['max-165x165', 'fill-300x300'])
+
+
+class TestGenerateRenditions(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+
+    def test_generate_renditions(self):
+        generate_renditions(self.image.id, ['width-400', 'max-100x100'])
+
+        self.assertEqual(
+            set(self.image.renditions.values_list('filter_spec', flat=True)),
+            {'width-400', 'max-100x100'}
+        )
+
+    def test_generate_renditions_for_deleted_image(self):
+        image_id = self.image.id
+        self.image.delete()
+
+        # should do nothing
+        generate_renditions(image_id, ['width-400'])
+
+    @override_settings(
+        WAGTAILIMAGES_EAGER_RENDITIONS=['width-400'],
+        WAGTAILIMAGES_TASK_RUNNER='wagtail.images.tasks.run_synchronously',
+    )
+    def test_generate_eager_renditions_on_commit(self):
+        with mock.patch('wagtail.images.tasks.transaction.on_commit') as on_commit:
+            generate_eager_renditions(self.image)
+
+        # nothing is generated until the transaction is committed
+        self.assertFalse(self.image.renditions.exists())
+
+        on_commit.call_args[0][0]()
+        self.assertEqual(list(self.image.renditions.values_list('filter_spec', flat=True)), ['width-400'])
+
+    def test_generate_eager_renditions_with_no_filter_specs(self):
+        with mock.patch('wagtail.images.tasks.transaction.on_commit') as on_commit:
+            generate_eager_renditions(self.image)
+
+        on_commit.assert_not_called()
+
+
+class TestTaskRunners(TestCase):
+    def test_default_task_runner(self):
+        self.assertIs(get_task_runner(), run_in_thread_pool)
+
+    @override_settings(WAGTAILIMAGES_TASK_RUNNER='wagtail.images.tasks.run_synchronously')
+    def test_custom_task_runner(self):
+        self.assertIs(get_task_runner(), run_synchronously)
+
+    def test_run_synchronously_logs_errors(self):
+        def fail():
+            raise ValueError("Oh no")
+
+        with self.assertLogs('wagtail.images', level='ERROR'):
+            run_synchronously(fail)
+
+    def test_run_in_thread_pool(self):
+        done = threading.Event()
+        results = []
+
+        def task(value):
+            results.append((value, threading.current_thread().name))
+            done.set()
+
+        run_in_thread_pool(task, 42)
+
+        self.assertTrue(done.wait(timeout=10))
+        value, thread_name = results[0]
+        self.assertEqual(value, 42)
+        self.assertTrue(thread_name.startswith('wagtailimages'))
@@ -4,7 +4,9 @@ import unittest
 from django import forms, template
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from taggit.forms import TagField, TagWidget
 
@@ -441,6 +443,65 @@ class TestFrontendServeView(TestCase):
         # Check response
         self.assertEqual(response.status_code, 410)
 
+    def get_serve_url(self, filter_spec='fill-800x600'):
+        signature = generate_signature(self.image.id, filter_spec)
+        return reverse('wagtailimages_serve', args=(signature, self.image.id, filter_spec))
+
+    def test_cache_headers(self):
+        response = self.client.get(self.get_serve_url())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+        self.assertIn('max-age=3600', response['Cache-Control'])
+
+        # The URL doesn't change with the rendition, so caches must check back
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.get_serve_url())['ETag']
+
+        # The rendition isn't fetched
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.get_serve_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertFalse([query for query in queries if 'wagtailimages_rendition' in query['sql']])
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('max-age=3600', response['Cache-Control'])
+
+    def test_etag_changes_with_rendition(self):
+        etag = self.client.get(self.get_serve_url())['ETag']
+
+        # The focal point affects fill renditions, but not width renditions
+        self.image.focal_point_x = 10
+        self.image.focal_point_y = 10
+        self.image.focal_point_width = 20
+        self.image.focal_point_height = 20
+        self.image.save()
+
+        response = self.client.get(self.get_serve_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        self.assertEqual(
+            self.client.get(self.get_serve_url('width-400'))['ETag'],
+            self.client.get(self.get_serve_url('width-400'))['ETag'],
+        )
+
+    def test_content_type_from_rendition_format(self):
+        response = self.client.get(self.get_serve_url('width-400|format-webp'))
+
+        self.assertEqual(response['Content-Type'], 'image/webp')
+
+    def test_redirect_action_ignores_if_none_match(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        url = reverse('wagtailimages_serve_action_redirect', args=(signature, self.image.id, 'fill-800x600'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+
+        self.assertEqual(response.status_code, 301)
+        self.assertNotIn('ETag', response)
+
 
 class TestFrontendSendfileView(TestCase):
 
@@ -14,6 +14,7 @@ from wagtail.images import get_image_model
 from wagtail.images.formats import get_image_format
 from wagtail.images.forms import ImageInsertionForm, get_image_form
 from wagtail.images.permissions import permission_policy
+from wagtail.images.tasks import generate_eager_renditions
 from wagtail.search import index as search_index
 
 permission_checker = PermissionPolicyChecker(permission_policy)
@@ -164,6 +165,8 @@ def chooser_upload(request):
 
             form.save()
 
+            generate_eager_renditions(image)
+
             # Reindex the image to make sure all tags are indexed
             search_index.insert_or_update_object(image)
 
@@ -19,6 +19,7 @@ from wagtail.images.exceptions import InvalidFilterSpecError
 from wagtail.images.forms import URLGeneratorForm, get_image_form
 from wagtail.images.models import Filter, SourceImageIOError
 from wagtail.images.permissions import permission_policy
+from wagtail.images.tasks import generate_eager_renditions
 from wagtail.images.views.serve import generate_signature
 from wagtail.search import index as search_index
 
@@ -132,6 +133,9 @@ def edit(request, image_id):
                 original_file.storage.delete(original_file.name)
                 image.renditions.all().delete()
 
+            if {'file', 'focal_point_x', 'focal_point_y', 'focal_point_width', 'focal_point_height'} & set(form.changed_data):
+                generate_eager_renditions(image)
+
             # Reindex the image to make sure all tags are indexed
             search_index.insert_or_update_object(image)
 
@@ -282,6 +286,8 @@ def add(request):
 
             form.save()
 
+            generate_eager_renditions(image)
+
             # Reindex the image to make sure all tags are indexed
             search_index.insert_or_update_object(image)
 
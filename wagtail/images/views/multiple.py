@@ -12,6 +12,7 @@ from wagtail.images import get_image_model
 from wagtail.images.fields import ALLOWED_EXTENSIONS
 from wagtail.images.forms import get_image_form
 from wagtail.images.permissions import permission_policy
+from wagtail.images.tasks import generate_eager_renditions
 from wagtail.search.backends import get_search_backends
 
 permission_checker = PermissionPolicyChecker(permission_policy)
@@ -73,6 +74,8 @@ def add(request):
             image.file.seek(0)
             image.save()
 
+            generate_eager_renditions(image)
+
             # Success! Send back an edit form for this image to the user
             return JsonResponse({
                 'success': True,
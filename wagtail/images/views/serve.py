@@ -2,6 +2,7 @@ import base64
 import hashlib
 import hmac
 import imghdr
+import os
 from wsgiref.util import FileWrapper
 
 from django.conf import settings
@@ -9,15 +10,24 @@ from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.http import HttpResponse, HttpResponsePermanentRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import classonlymethod
 from django.utils.encoding import force_str
 from django.views.generic import View
 
 from wagtail.images import get_image_model
 from wagtail.images.exceptions import InvalidFilterSpecError
-from wagtail.images.models import SourceImageIOError
+from wagtail.images.models import Filter, SourceImageIOError
 from wagtail.utils.sendfile import sendfile
 
+# The content types of the file extensions given to renditions
+CONTENT_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
 
 def generate_signature(image_id, filter_spec, key=None):
     if key is None:
@@ -49,6 +59,11 @@ class ServeView(View):
     action = 'serve'
     key = None
 
+    # How long browsers and caches may keep served images for without checking back
+    # (one hour). The URL of a rendition stays the same when the image's file is replaced
+    # or its focal point moves, so they revalidate with the ETag after that.
+    cache_max_age = 60 * 60
+
     @classonlymethod
     def as_view(cls, **initkwargs):
         if 'action' in initkwargs:
@@ -63,22 +78,55 @@ class ServeView(View):
 
         image = get_object_or_404(self.model, id=image_id)
 
+        try:
+            etag = self.get_etag(image, filter_spec)
+        except InvalidFilterSpecError:
+            return HttpResponse("Invalid filter spec: " + filter_spec, content_type='text/plain', status=400)
+
+        if self.action == 'serve':
+            # Answer requests from browsers and caches that already have the image
+            # without fetching the rendition
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                return self.add_cache_headers(response, etag)
+
         # Get/generate the rendition
         try:
             rendition = image.get_rendition(filter_spec)
         except SourceImageIOError:
             return HttpResponse("Source image file not found", content_type='text/plain', status=410)
-        except InvalidFilterSpecError:
-            return HttpResponse("Invalid filter spec: " + filter_spec, content_type='text/plain', status=400)
 
-        return getattr(self, self.action)(rendition)
+        response = getattr(self, self.action)(rendition)
+        if self.action == 'serve':
+            self.add_cache_headers(response, etag)
+        return response
+
+    def get_etag(self, image, filter_spec):
+        """
+        Return the ETag of the rendition of the image for the filter spec. This changes
+        whenever the rendition would (when the image's file or focal point changes) but
+        doesn't need the rendition to be fetched.
+        """
+        filter = Filter(spec=filter_spec)
+        key = '{}|{}|{}'.format(image.file.name, filter.spec, filter.get_cache_key(image))
+        return '"%s"' % hashlib.sha1(key.encode()).hexdigest()
+
+    def add_cache_headers(self, response, etag):
+        response['ETag'] = etag
+        if self.cache_max_age is not None:
+            patch_cache_control(response, public=True, max_age=self.cache_max_age)
+        return response
 
     def serve(self, rendition):
         # Open and serve the file
         rendition.file.open('rb')
-        image_format = imghdr.what(rendition.file)
-        return StreamingHttpResponse(FileWrapper(rendition.file),
-                                     content_type='image/' + image_format)
+
+        # Renditions are saved with the extension of their format, so the file only
+        # needs inspecting if that has been changed
+        extension = os.path.splitext(rendition.file.name)[1].lower()
+        content_type = CONTENT_TYPES.get(extension) or 'image/' + imghdr.what(rendition.file)
+
+        return StreamingHttpResponse(FileWrapper(rendition.file), content_type=content_type)
 
     def redirect(self, rendition):
         # Redirect to the file's public location
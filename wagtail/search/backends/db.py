@@ -1,16 +1,121 @@
 from collections import OrderedDict
 from warnings import warn
 
+import django
 from django.core.exceptions import FieldDoesNotExist
-from django.db import models
+from django.db import connections, models, transaction
 from django.db.models import Count
-from django.db.models.expressions import Value
+from django.db.models.expressions import RawSQL, Value
+from django.db.models.functions import Cast
+from django.utils.encoding import force_str
 
 from wagtail.search.backends.base import (
     BaseSearchBackend, BaseSearchQueryCompiler, BaseSearchResults, FilterFieldError)
+from wagtail.search.index import Indexed, RelatedFields, SearchField
 from wagtail.search.query import And, Boost, MatchAll, Not, Or, PlainText
 from wagtail.search.utils import AND, OR
 
+# Whether the body column of the IndexEntry table has a full-text index, by database alias
+_body_indexes = {}
+
+# The minimum length of the terms that can be found with the full-text index
+MIN_INDEXED_TERM_LENGTH = {
+    'sqlite': 3,
+    'mysql': 2,
+}
+
+
+class RawSubquery(RawSQL):
+    """
+    A raw SQL subquery for use with the ``__in`` lookup, which is wrapped in exactly
+    one pair of brackets. Lookups add brackets around expressions themselves before
+    Django 3.0 (but not since), and doubling them up makes databases compare against
+    the first row of the subquery only.
+    """
+    def as_sql(self, compiler, connection):
+        if django.VERSION < (3, 0):
+            return self.sql, self.params
+        return super().as_sql(compiler, connection)
+
+
+def has_body_index(connection):
+    """
+    Return True if the migrations managed to create a full-text index of the body of
+    IndexEntry on this SQLite or MySQL database (see migration 0007_indexentry)
+    """
+    if connection.alias not in _body_indexes:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                has_index = 'wagtailsearch_indexentry_fts' in connection.introspection.table_names(cursor)
+            elif connection.vendor == 'mysql':
+                constraints = connection.introspection.get_constraints(cursor, 'wagtailsearch_indexentry')
+                has_index = 'wagtailsearch_indexentry_body_ft' in constraints
+            else:
+                has_index = False
+        _body_indexes[connection.alias] = has_index
+
+    return _body_indexes[connection.alias]
+
+
+def get_toplevel_model(model):
+    """
+    Return the model at the top of the indexed inheritance tree of the given model.
+    The search text of an object is stored under the content type of this model, so
+    that each object has a single entry whichever class it was indexed as.
+    """
+    return [parent for parent in [model] + model._meta.get_parent_list() if issubclass(parent, Indexed)][-1]
+
+
+def get_content_type_ids(models):
+    from django.contrib.contenttypes.models import ContentType
+    return [content_type.pk for content_type in ContentType.objects.get_for_models(*models).values()]
+
+
+def get_pk_field(model):
+    # Follow the parent link of multi-table inheritance models to the actual primary key
+    field = model._meta.pk
+    while field.is_relation:
+        field = field.target_field
+    return field
+
+
+def prepare_value(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ' '.join(prepare_value(item) for item in value)
+    if isinstance(value, dict):
+        return ' '.join(prepare_value(item) for item in value.values())
+    if value is None:
+        return ''
+    return force_str(value)
+
+
+def get_search_text(obj, search_fields):
+    """
+    Return the text of the searchable fields of the object (including the fields of
+    related objects) as one lower case string
+    """
+    text = []
+
+    for field in search_fields:
+        if isinstance(field, SearchField):
+            text.append(prepare_value(field.get_value(obj)))
+        elif isinstance(field, RelatedFields):
+            sub_obj = field.get_value(obj)
+            if sub_obj is None:
+                continue
+            if isinstance(sub_obj, models.Manager):
+                sub_objs = sub_obj.all()
+            else:
+                if callable(sub_obj):
+                    sub_obj = sub_obj()
+                sub_objs = [sub_obj]
+            for sub_obj in sub_objs:
+                text.append(get_search_text(sub_obj, field.fields))
+
+    return ' '.join(value for value in text if value).lower()
+
 
 class DatabaseSearchQueryCompiler(BaseSearchQueryCompiler):
     DEFAULT_OPERATOR = 'and'
@@ -96,6 +201,43 @@ class DatabaseSearchQueryCompiler(BaseSearchQueryCompiler):
             % query.__class__.__name__)
 
 
+class DatabaseSearchTextQueryCompiler(DatabaseSearchQueryCompiler):
+    """
+    Searches the text stored in the IndexEntry table, when the SEARCH_TEXT_TABLE
+    option of the backend is enabled. This uses the full-text index of the table on
+    SQLite and MySQL, and its trigram index on PostgreSQL (which is used by LIKE
+    queries), so only the entries containing the terms are read.
+    """
+    def build_single_term_filter(self, term):
+        from wagtail.search.models import IndexEntry
+
+        if self.fields:
+            # The search text table can't tell which field the text came from
+            return super().build_single_term_filter(term)
+
+        model = self.queryset.model
+        connection = connections[self.queryset.db]
+        term = term.lower()
+
+        # Entries are stored under the top-level model, and the queryset of the model
+        # being searched leaves out the objects of other classes
+        entries = IndexEntry.objects.filter(content_type_id=get_content_type_ids([get_toplevel_model(model)])[0])
+
+        if has_body_index(connection) and len(term) >= MIN_INDEXED_TERM_LENGTH[connection.vendor]:
+            phrase = '"%s"' % term.replace('"', '""')
+            if connection.vendor == 'sqlite':
+                sql = 'SELECT rowid FROM wagtailsearch_indexentry_fts WHERE wagtailsearch_indexentry_fts MATCH %s'
+            else:
+                sql = 'SELECT id FROM wagtailsearch_indexentry WHERE MATCH (body) AGAINST (%s IN BOOLEAN MODE)'
+            entries = entries.filter(id__in=RawSubquery(sql, [phrase]))
+        else:
+            entries = entries.filter(body__contains=term)
+
+        return models.Q(pk__in=entries.values_list(
+            Cast('object_id', output_field=get_pk_field(model)), flat=True
+        ))
+
+
 class DatabaseSearchResults(BaseSearchResults):
     def get_queryset(self):
         queryset = self.query_compiler.queryset
@@ -140,12 +282,94 @@ class DatabaseSearchResults(BaseSearchResults):
         ])
 
 
+class DatabaseIndex:
+    """
+    Stores the search text of objects in the IndexEntry table, when the
+    SEARCH_TEXT_TABLE option of the database search backend is enabled
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = 'default'
+
+    def add_model(self, model):
+        pass
+
+    def refresh(self):
+        pass
+
+    def reset(self):
+        from wagtail.search.models import IndexEntry
+        IndexEntry.objects.all().delete()
+
+    def add_item(self, item):
+        self.add_items(type(item), [item])
+
+    def add_items(self, model, items):
+        from wagtail.search.models import IndexEntry
+
+        search_fields = model.get_search_fields()
+        if not search_fields or not items:
+            return
+
+        content_type_id = get_content_type_ids([get_toplevel_model(model)])[0]
+        entries = [
+            IndexEntry(content_type_id=content_type_id, object_id=force_str(item.pk), body=get_search_text(item, search_fields))
+            for item in items
+        ]
+
+        with transaction.atomic():
+            IndexEntry.objects.filter(
+                content_type_id=content_type_id,
+                object_id__in=[entry.object_id for entry in entries],
+            ).delete()
+            IndexEntry.objects.bulk_create(entries)
+
+    def delete_item(self, item):
+        from wagtail.search.models import IndexEntry
+
+        IndexEntry.objects.filter(
+            content_type_id=get_content_type_ids([get_toplevel_model(type(item))])[0],
+            object_id=force_str(item.pk),
+        ).delete()
+
+    def __str__(self):
+        return self.name
+
+
+class DatabaseSearchRebuilder:
+    def __init__(self, index):
+        self.index = index
+
+    def start(self):
+        self.index.reset()
+        return self.index
+
+    def finish(self):
+        pass
+
+
 class DatabaseSearchBackend(BaseSearchBackend):
     query_compiler_class = DatabaseSearchQueryCompiler
     results_class = DatabaseSearchResults
 
+    def __init__(self, params):
+        super().__init__(params)
+
+        # Keep the searchable text of every object in the IndexEntry table, and search
+        # that rather than the fields of the models
+        self.search_text_table = params.get('SEARCH_TEXT_TABLE', False)
+        if self.search_text_table:
+            self.query_compiler_class = DatabaseSearchTextQueryCompiler
+            self.rebuilder_class = DatabaseSearchRebuilder
+
+    def get_index_for_model(self, model):
+        if self.search_text_table:
+            return DatabaseIndex(self)
+        return super().get_index_for_model(model)
+
     def reset_index(self):
-        pass  # Not needed
+        if self.search_text_table:
+            DatabaseIndex(self).reset()
 
     def add_type(self, model):
         pass  # Not needed
@@ -153,14 +377,5 @@ class DatabaseSearchBackend(BaseSearchBackend):
     def refresh_index(self):
         pass  # Not needed
 
-    def add(self, obj):
-        pass  # Not needed
-
-    def add_bulk(self, model, obj_list):
-        return  # Not needed
-
-    def delete(self, obj):
-        pass  # Not needed
-
 
 SearchBackend = DatabaseSearchBackend
@@ -0,0 +1,128 @@
+"""
+Buffering of search query hits in memory, so that they are written to the database
+in bulk rather than with several queries for every search
+"""
+
+import atexit
+import collections
+import threading
+import time
+
+import django
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from wagtail.search.utils import normalise_query_string
+
+
+def get_hits_buffer_size():
+    """
+    Return the number of hits to collect before writing them to the database, as
+    given by the WAGTAILSEARCH_HITS_BUFFER_SIZE setting. Hits aren't buffered if this
+    is None (the default).
+    """
+    return getattr(settings, 'WAGTAILSEARCH_HITS_BUFFER_SIZE', None)
+
+
+class HitBuffer:
+    """
+    Counts the hits of each (normalised query string, date) pair in memory, and writes
+    them to the Query and QueryDailyHits tables once the number of hits reaches the
+    WAGTAILSEARCH_HITS_BUFFER_SIZE setting, or once WAGTAILSEARCH_HITS_BUFFER_TIMEOUT
+    seconds (default 60) have passed since the last write.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = collections.Counter()
+        self.last_flushed = time.monotonic()
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def add(self, query_string, date=None):
+        if date is None:
+            date = timezone.now().date()
+
+        with self.lock:
+            self.counts[(normalise_query_string(query_string), date)] += 1
+            should_flush = (
+                sum(self.counts.values()) >= get_hits_buffer_size()
+                or time.monotonic() - self.last_flushed >= getattr(settings, 'WAGTAILSEARCH_HITS_BUFFER_TIMEOUT', 60)
+            )
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered hits to the database and empty the buffer
+        """
+        with self.lock:
+            counts, self.counts = self.counts, collections.Counter()
+            self.last_flushed = time.monotonic()
+
+        if counts:
+            write_hits(counts)
+
+
+def create_ignoring_conflicts(model, objs):
+    """
+    Insert the given objects into the database, skipping any that conflict with rows
+    that already exist
+    """
+    if django.VERSION >= (2, 2):
+        model.objects.bulk_create(objs, ignore_conflicts=True)
+        return
+
+    # bulk_create can't ignore conflicts before Django 2.2, so insert them one by one
+    for obj in objs:
+        try:
+            with transaction.atomic():
+                obj.save(force_insert=True)
+        except IntegrityError:
+            pass
+
+
+def write_hits(counts):
+    """
+    Add the given numbers of hits, as a mapping of (normalised query string, date) to
+    number of hits, to the database. Rows are created with no hits and then
+    incremented, so hits written by other processes at the same time aren't lost.
+    """
+    from wagtail.search.models import Query, QueryDailyHits
+
+    query_strings = {query_string for query_string, date in counts}
+
+    with transaction.atomic():
+        query_ids = dict(Query.objects.filter(query_string__in=query_strings).values_list('query_string', 'id'))
+        missing = query_strings - set(query_ids)
+        if missing:
+            create_ignoring_conflicts(Query, [Query(query_string=query_string) for query_string in missing])
+            query_ids.update(Query.objects.filter(query_string__in=missing).values_list('query_string', 'id'))
+
+        create_ignoring_conflicts(QueryDailyHits, [
+            QueryDailyHits(query_id=query_ids[query_string], date=date)
+            for query_string, date in counts
+        ])
+
+        # One update for each date and number of hits
+        query_ids_by_increment = collections.defaultdict(list)
+        for (query_string, date), hits in counts.items():
+            query_ids_by_increment[(date, hits)].append(query_ids[query_string])
+
+        for (date, hits), ids in query_ids_by_increment.items():
+            QueryDailyHits.objects.filter(date=date, query_id__in=ids).update(hits=models.F('hits') + hits)
+
+
+hit_buffer = HitBuffer()
+
+
+def flush_hits():
+    """
+    Write any buffered search query hits to the database
+    """
+    hit_buffer.flush()
+
+
+atexit.register(flush_hits)
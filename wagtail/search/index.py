@@ -78,13 +78,21 @@ class Indexed:
     def get_indexed_objects(cls):
         queryset = cls.objects.all()
 
-        # Add prefetch/select related for RelatedFields
+        # Add prefetch/select related for RelatedFields and fields on many-to-many relations
         for field in cls.get_search_fields():
-            if isinstance(field, RelatedFields):
-                queryset = field.select_on_queryset(queryset)
+            queryset = field.select_on_queryset(queryset)
 
         return queryset
 
+    @classmethod
+    def get_search_timestamp_fields(cls):
+        """
+        Returns the names of the date/time fields that are updated whenever an object
+        changes, used by ``update_index --incremental`` to find the objects that need
+        reindexing. Objects of models without any are not indexed incrementally.
+        """
+        return list(cls.search_timestamp_fields)
+
     def get_indexed_instance(self):
         """
         If the indexed model uses multi table inheritance, override this method
@@ -121,6 +129,7 @@ class Indexed:
         return errors
 
     search_fields = []
+    search_timestamp_fields = []
 
 
 def get_indexed_models():
@@ -216,11 +225,47 @@ class BaseField:
         except FieldDoesNotExist:
             return 'CharField'
 
+    def get_related_lookups(self, model, prefix=''):
+        """
+        Returns the lists of select_related and prefetch_related lookups that fetch
+        the value of this field from objects of the given model. Only many-to-many
+        relations (such as tags) need prefetching, as their values would otherwise
+        take a query for each object.
+        """
+        try:
+            field = self.get_field(model)
+        except FieldDoesNotExist:
+            return [], []
+
+        if isinstance(field, RelatedField) and field.many_to_many and not isinstance(field, ParentalManyToManyField):
+            return [], [prefix + self.field_name]
+
+        return [], []
+
+    def select_on_queryset(self, queryset):
+        """
+        This method runs prefetch_related on the queryset if the field is a
+        many-to-many relation, to improve indexing speed.
+        """
+        select_related, prefetch_related = self.get_related_lookups(queryset.model)
+
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+
+        return queryset
+
     def get_value(self, obj):
         from taggit.managers import TaggableManager
 
         try:
             field = self.get_field(obj.__class__)
+
+            prefetched_objects = getattr(obj, '_prefetched_objects_cache', {})
+            if isinstance(field, TaggableManager) and field.name in prefetched_objects:
+                # Use the tags fetched by select_on_queryset, as value_from_object
+                # would query for them again
+                return list(prefetched_objects[field.name])
+
             value = field.value_from_object(obj)
             if hasattr(field, 'get_searchable_content'):
                 value = field.get_searchable_content(value)
@@ -283,33 +328,64 @@ class RelatedFields:
         if isinstance(field, (RelatedField, ForeignObjectRel)):
             return getattr(obj, self.field_name)
 
-    def select_on_queryset(self, queryset):
+    def get_related_lookups(self, model, prefix=''):
         """
-        This method runs either prefetch_related or select_related on the queryset
-        to improve indexing speed of the relation.
-
-        It decides which method to call based on the number of related objects:
-         - single (eg ForeignKey, OneToOne), it runs select_related
-         - multiple (eg ManyToMany, reverse ForeignKey) it runs prefetch_related
+        Returns the lists of select_related and prefetch_related lookups that fetch
+        this relation from objects of the given model, along with the relations of
+        any fields nested inside it, prefixed with the given lookup prefix.
+
+        It decides which method to use for each relation based on the number of
+        related objects:
+         - single (eg ForeignKey, OneToOne), it uses select_related
+         - multiple (eg ManyToMany, reverse ForeignKey) it uses prefetch_related
         """
         try:
-            field = self.get_field(queryset.model)
+            field = self.get_field(model)
         except FieldDoesNotExist:
-            return queryset
+            return [], []
 
         if isinstance(field, RelatedField) and not isinstance(field, ParentalManyToManyField):
             if field.many_to_one or field.one_to_one:
-                queryset = queryset.select_related(self.field_name)
+                is_single = True
             elif field.one_to_many or field.many_to_many:
-                queryset = queryset.prefetch_related(self.field_name)
+                is_single = False
+            else:
+                return [], []
 
         elif isinstance(field, ForeignObjectRel):
             # Reverse relation
-            if isinstance(field, OneToOneRel):
-                # select_related for reverse OneToOneField
-                queryset = queryset.select_related(self.field_name)
+            # select_related for reverse OneToOneField, prefetch_related for anything else
+            is_single = isinstance(field, OneToOneRel)
+
+        else:
+            return [], []
+
+        lookup = prefix + self.field_name
+        select_related, prefetch_related = ([lookup], []) if is_single else ([], [lookup])
+
+        for nested_field in self.fields:
+            nested_select_related, nested_prefetch_related = nested_field.get_related_lookups(
+                field.related_model, prefix=lookup + '__')
+
+            if is_single:
+                select_related.extend(nested_select_related)
+                prefetch_related.extend(nested_prefetch_related)
             else:
-                # prefetch_related for anything else (reverse ForeignKey/ManyToManyField)
-                queryset = queryset.prefetch_related(self.field_name)
+                # Relations of prefetched objects have to be prefetched too
+                prefetch_related.extend(nested_select_related + nested_prefetch_related)
+
+        return select_related, prefetch_related
+
+    def select_on_queryset(self, queryset):
+        """
+        This method runs prefetch_related and/or select_related on the queryset
+        to improve indexing speed of the relation and any relations nested in it.
+        """
+        select_related, prefetch_related = self.get_related_lookups(queryset.model)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
 
         return queryset
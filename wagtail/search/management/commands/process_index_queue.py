@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from wagtail.search.queue import process_database_queue
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = "Sends the search index changes queued in the database to the search backends"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE, dest='batch_size',
+            help="Number of queued changes to process at a time (default %d)" % DEFAULT_BATCH_SIZE)
+
+    def handle(self, **options):
+        processed = process_database_queue(batch_size=options['batch_size'])
+
+        if options['verbosity'] >= 1:
+            self.stdout.write("Processed %d queued changes" % processed)
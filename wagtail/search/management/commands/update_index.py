@@ -1,11 +1,19 @@
 import collections
+import datetime
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 from wagtail.search.backends import get_search_backend
 from wagtail.search.index import get_indexed_models
+from wagtail.search.models import IndexWatermark
 
 DEFAULT_CHUNK_SIZE = 1000
 
@@ -51,8 +59,110 @@ def group_models_by_index(backend, models):
     ])
 
 
+class Checkpoint:
+    """
+    Records how far a rebuild has got in a JSON file, so that an interrupted rebuild
+    can be resumed. For each index being rebuilt, this stores the name of the index
+    that objects are being added to, and the primary key of the last object indexed
+    for each model.
+    """
+    def __init__(self, path, data=None):
+        self.path = path
+        self.data = data or {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                return cls(path, json.load(f))
+        except FileNotFoundError:
+            return cls(path)
+
+    def save(self):
+        # Write to a temporary file first, so a crash can't leave a truncated checkpoint
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(self.data, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def delete(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get_index(self, backend_name, index_name):
+        return self.data.get(backend_name, {}).get(index_name)
+
+    def start_index(self, backend_name, index_name, building_index_name):
+        self.data.setdefault(backend_name, {})[index_name] = {
+            'index': building_index_name,
+            'models': {},
+        }
+        self.save()
+
+    def get_last_pk(self, backend_name, index_name, model):
+        return self.data[backend_name][index_name]['models'].get(model._meta.label)
+
+    def set_last_pk(self, backend_name, index_name, model, pk):
+        if not isinstance(pk, int):
+            # such as UUIDs, which can be filtered on as strings
+            pk = str(pk)
+        self.data[backend_name][index_name]['models'][model._meta.label] = pk
+        self.save()
+
+    def finish_index(self, backend_name, index_name):
+        del self.data[backend_name][index_name]
+        self.save()
+
+
+def index_chunk(index, model, pks):
+    """
+    Index the objects of the given model with the given primary keys. Run on the
+    worker threads.
+    """
+    try:
+        objects = list(model.get_indexed_objects().filter(pk__in=pks))
+        index.add_items(model, objects)
+        return len(objects)
+    finally:
+        # Database connections are per-thread, so close the one opened by this chunk
+        connections.close_all()
+
+
+def parse_since(value):
+    """
+    Parse the value of the --since option, which may be a date or a date and time,
+    into an aware datetime
+    """
+    try:
+        since = parse_datetime(value)
+        if since is None:
+            date = parse_date(value)
+            if date is not None:
+                since = datetime.datetime.combine(date, datetime.time())
+    except ValueError:
+        since = None
+
+    if since is None:
+        raise CommandError("Invalid --since value '%s', expected a date or date and time such as 2020-01-31T12:00" % value)
+
+    if settings.USE_TZ and timezone.is_naive(since):
+        since = timezone.make_aware(since)
+
+    return since
+
+
+def get_changed_filter(model, since):
+    """
+    Return a Q object matching the objects of the model that have changed since the
+    given datetime, according to its search timestamp fields
+    """
+    changed = Q()
+    for field_name in model.get_search_timestamp_fields():
+        changed |= Q(**{field_name + '__gte': since})
+    return changed
+
+
 class Command(BaseCommand):
-    def update_backend(self, backend_name, schema_only=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    def update_backend(self, backend_name, schema_only=False, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, checkpoint=None):
         self.stdout.write("Updating backend: " + backend_name)
 
         backend = get_search_backend(backend_name)
@@ -66,11 +176,31 @@ class Command(BaseCommand):
             self.stdout.write(backend_name + ": No indices to rebuild")
 
         for index, models in models_grouped_by_index:
-            self.stdout.write(backend_name + ": Rebuilding index %s" % index.name)
-
-            # Start rebuild
+            index_name = index.name
             rebuilder = backend.rebuilder_class(index)
-            index = rebuilder.start()
+            started_at = timezone.now()
+
+            # Transactional rebuilds can only be written to from the connection that
+            # started them, and leave nothing behind to resume if they fail
+            index_workers = 1 if getattr(rebuilder, 'transactional', False) else workers
+            index_checkpoint = None if getattr(rebuilder, 'transactional', False) else checkpoint
+
+            resume_from = index_checkpoint.get_index(backend_name, index_name) if index_checkpoint else None
+            if resume_from is not None:
+                self.stdout.write(backend_name + ": Resuming rebuild of index %s" % index_name)
+
+                # Carry on adding objects to the index that the interrupted rebuild created
+                if resume_from['index'] != rebuilder.index.name:
+                    rebuilder.index = backend.index_class(backend, resume_from['index'])
+                index = rebuilder.index
+            else:
+                self.stdout.write(backend_name + ": Rebuilding index %s" % index_name)
+
+                # Start rebuild
+                index = rebuilder.start()
+
+                if index_checkpoint:
+                    index_checkpoint.start_index(backend_name, index_name, index.name)
 
             # Add models
             for model in models:
@@ -82,19 +212,132 @@ class Command(BaseCommand):
                 for model in models:
                     self.stdout.write('{}: {}.{} '.format(backend_name, model._meta.app_label, model.__name__).ljust(35), ending='')
 
+                    start_after = None
+                    if index_checkpoint:
+                        start_after = index_checkpoint.get_last_pk(backend_name, index_name, model)
+
                     # Add items (chunk_size at a time)
-                    for chunk in self.print_iter_progress(self.queryset_chunks(model.get_indexed_objects().order_by('pk'), chunk_size)):
-                        index.add_items(model, chunk)
-                        object_count += len(chunk)
+                    for last_pk, count in self.print_iter_progress(self.index_model(index, model, chunk_size, index_workers, start_after)):
+                        object_count += count
+                        if index_checkpoint:
+                            index_checkpoint.set_last_pk(backend_name, index_name, model, last_pk)
 
                     self.print_newline()
 
             # Finish rebuild
             rebuilder.finish()
 
+            if index_checkpoint:
+                index_checkpoint.finish_index(backend_name, index_name)
+
+            # Incremental updates only need to index what changes after this rebuild started
+            if not schema_only:
+                for model in models:
+                    if model.get_search_timestamp_fields():
+                        IndexWatermark.set_for_model(backend_name, model, started_at)
+
             self.stdout.write(backend_name + ": indexed %d objects" % object_count)
             self.print_newline()
 
+    def update_backend_incremental(self, backend_name, since=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+        """
+        Index the objects that have changed since the given datetime (or, for each model,
+        since the last time it was indexed into this backend) into the existing indexes,
+        and remove changed objects that are no longer indexed from them
+        """
+        self.stdout.write("Updating backend incrementally: " + backend_name)
+
+        backend = get_search_backend(backend_name)
+
+        if not backend.rebuilder_class:
+            self.stdout.write("Backend '%s' doesn't require rebuilding" % backend_name)
+            return
+
+        for index, models in group_models_by_index(backend, get_indexed_models()).items():
+            object_count = 0
+            indexed_keys = set()
+            stale_objects = []
+
+            for model in models:
+                model_name = '{}.{}'.format(model._meta.app_label, model.__name__)
+                if not model.get_search_timestamp_fields():
+                    self.stdout.write("{}: {} has no search_timestamp_fields, skipping".format(backend_name, model_name))
+                    continue
+
+                started_at = timezone.now()
+                model_since = since or IndexWatermark.get_for_model(backend_name, model)
+                queryset = model.get_indexed_objects()
+
+                if model_since is not None:
+                    changed = get_changed_filter(model, model_since)
+                    queryset = queryset.filter(changed)
+
+                    # Objects that are indexed under the same document ID as another model
+                    # (such as pages and their specific page types) share a key here
+                    key_prefix = model.indexed_get_toplevel_content_type()
+                    indexed_pks = set(queryset.values_list('pk', flat=True))
+                    indexed_keys.update((key_prefix, pk) for pk in indexed_pks)
+                    stale_objects.extend(
+                        (key_prefix, model, pk)
+                        for pk in model._default_manager.filter(changed).values_list('pk', flat=True)
+                        if pk not in indexed_pks
+                    )
+
+                self.stdout.write('{}: {} '.format(backend_name, model_name).ljust(35), ending='')
+                for last_pk, count in self.print_iter_progress(self.index_model(index, model, chunk_size, workers, queryset=queryset)):
+                    object_count += count
+                self.print_newline()
+
+                IndexWatermark.set_for_model(backend_name, model, started_at)
+
+            # Remove the changed objects that aren't indexed under any model any more
+            deleted_keys = set()
+            for key_prefix, model, pk in stale_objects:
+                key = (key_prefix, pk)
+                if key not in indexed_keys and key not in deleted_keys:
+                    index.delete_item(model(pk=pk))
+                    deleted_keys.add(key)
+
+            self.stdout.write(backend_name + ": indexed %d objects and removed %d objects from index %s" % (
+                object_count, len(deleted_keys), index.name))
+            self.print_newline()
+
+    def index_model(self, index, model, chunk_size, workers, start_after=None, queryset=None):
+        """
+        Add all indexed objects of the model (or the objects in the given queryset of
+        them) to the index, chunk_size at a time,
+        spreading the chunks across the given number of worker threads. Yields the
+        primary key of the last object of each chunk and the number of objects
+        indexed, in order of primary key, as each chunk (and all the chunks before
+        it) has been indexed.
+        """
+        if queryset is None:
+            queryset = model.get_indexed_objects()
+        queryset = queryset.order_by('pk')
+
+        if workers <= 1:
+            for chunk in self.queryset_chunks(queryset, chunk_size, start_after):
+                index.add_items(model, chunk)
+                yield chunk[-1].pk, len(chunk)
+            return
+
+        # Only the primary keys are fetched here, the worker threads fetch the objects
+        pk_chunks = self.queryset_chunks(queryset.values_list('pk', flat=True), chunk_size, start_after, get_pk=lambda pk: pk)
+        pending = collections.deque()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for pks in pk_chunks:
+                pending.append((pks[-1], executor.submit(index_chunk, index, model, pks)))
+
+                # Don't let fetching primary keys get too far ahead of the workers
+                while len(pending) >= workers * 2:
+                    last_pk, future = pending.popleft()
+                    yield last_pk, future.result()
+
+            while pending:
+                last_pk, future = pending.popleft()
+                yield last_pk, future.result()
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--backend', action='store', dest='backend_name', default=None,
@@ -105,8 +348,38 @@ class Command(BaseCommand):
         parser.add_argument(
             '--chunk_size', action='store', dest='chunk_size', default=DEFAULT_CHUNK_SIZE, type=int,
             help="Set number of records to be fetched at once for inserting into the index")
+        parser.add_argument(
+            '--workers', action='store', dest='workers', default=1, type=int,
+            help="Set number of threads to index chunks of records in parallel")
+        parser.add_argument(
+            '--checkpoint', action='store', dest='checkpoint', default=None,
+            help="Record progress in this file, so that an interrupted rebuild can be resumed with --resume")
+        parser.add_argument(
+            '--resume', action='store_true', dest='resume', default=False,
+            help="Resume the rebuild recorded in the --checkpoint file")
+        parser.add_argument(
+            '--incremental', action='store_true', dest='incremental', default=False,
+            help="Only index the objects that have changed since they were last indexed, without rebuilding the indexes")
+        parser.add_argument(
+            '--since', action='store', dest='since', default=None,
+            help="Only index the objects that have changed since this date or date and time (implies --incremental)")
 
     def handle(self, **options):
+        if options.get('resume') and not options.get('checkpoint'):
+            raise CommandError("--resume requires a --checkpoint file")
+
+        since = parse_since(options['since']) if options.get('since') else None
+        incremental = options.get('incremental') or since is not None
+        if incremental and (options.get('checkpoint') or options.get('schema_only')):
+            raise CommandError("--checkpoint and --schema-only can't be used with an incremental update")
+
+        checkpoint = None
+        if options.get('checkpoint'):
+            if options.get('resume'):
+                checkpoint = Checkpoint.load(options['checkpoint'])
+            else:
+                checkpoint = Checkpoint(options['checkpoint'])
+
         # Get list of backends to index
         if options['backend_name']:
             # index only the passed backend
@@ -118,13 +391,25 @@ class Command(BaseCommand):
             # index the 'default' backend only
             backend_names = ['default']
 
+        if incremental:
+            for backend_name in backend_names:
+                self.update_backend_incremental(
+                    backend_name, since=since, chunk_size=options.get('chunk_size'), workers=options.get('workers', 1)
+                )
+            return
+
         # Update backends
         for backend_name in backend_names:
             self.update_backend(
                 backend_name,
-                schema_only=options.get('schema_only', False), chunk_size=options.get('chunk_size')
+                schema_only=options.get('schema_only', False), chunk_size=options.get('chunk_size'),
+                workers=options.get('workers', 1), checkpoint=checkpoint
             )
 
+        # Everything has been indexed, so there is nothing left to resume
+        if checkpoint:
+            checkpoint.delete()
+
     def print_newline(self):
         self.stdout.write('')
 
@@ -151,19 +436,20 @@ class Command(BaseCommand):
 
             self.stdout.flush()
 
-    # Atomic so the count of models doesnt change as it is iterated
-    @transaction.atomic
-    def queryset_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE):
+    def queryset_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE, start_after=None, get_pk=lambda obj: obj.pk):
         """
-        Yield a queryset in chunks of at most ``chunk_size``. The chunk yielded
-        will be a list, not a queryset. Iterating over the chunks is done in a
-        transaction so that the order and count of items in the queryset
-        remains stable.
+        Yield a queryset ordered by primary key in chunks of at most ``chunk_size``,
+        starting after the given primary key. The chunk yielded will be a list, not
+        a queryset. Each chunk is fetched by filtering on the last primary key seen
+        rather than with an offset, so that fetching later chunks doesn't get slower
+        and the order of items remains stable without holding a transaction open.
         """
-        i = 0
+        last_pk = start_after
+
         while True:
-            items = list(qs[i * chunk_size:][:chunk_size])
+            chunk_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            items = list(chunk_qs[:chunk_size])
             if not items:
                 break
             yield items
-            i += 1
+            last_pk = get_pk(items[-1])
@@ -0,0 +1,30 @@
+# Generated by Django 3.0.14 on 2026-10-18 05:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wagtailsearch', '0004_querydailyhits_verbose_name_plural'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexQueueEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(max_length=255)),
+                ('action', models.CharField(choices=[('update', 'update'), ('delete', 'delete')], max_length=10)),
+                ('queued_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'Index queue entry',
+                'verbose_name_plural': 'Index queue entries',
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+    ]
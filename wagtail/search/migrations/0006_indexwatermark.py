@@ -0,0 +1,29 @@
+# Generated by Django 3.0.14 on 2026-10-18 05:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wagtailsearch', '0005_indexqueueentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('backend_name', models.CharField(max_length=255)),
+                ('last_indexed_at', models.DateTimeField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'Index watermark',
+                'verbose_name_plural': 'Index watermarks',
+                'unique_together': {('backend_name', 'content_type')},
+            },
+        ),
+    ]
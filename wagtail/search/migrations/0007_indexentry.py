@@ -0,0 +1,90 @@
+# Generated by Django 3.0.14 on 2026-10-18 05:23
+
+from django.db import DatabaseError, migrations, models, transaction
+import django.db.models.deletion
+
+
+def create_body_index(apps, schema_editor):
+    """
+    Index the body column for substring searches, using whatever the database
+    supports. If the database can't do this (for example, if SQLite was built
+    without FTS5, or the PostgreSQL user can't create the pg_trgm extension), the
+    database search backend falls back on scanning the table.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        statements = [
+            """
+            CREATE VIRTUAL TABLE wagtailsearch_indexentry_fts USING fts5(
+                body, content='wagtailsearch_indexentry', content_rowid='id', tokenize='trigram'
+            )
+            """,
+            """
+            CREATE TRIGGER wagtailsearch_indexentry_fts_insert AFTER INSERT ON wagtailsearch_indexentry BEGIN
+                INSERT INTO wagtailsearch_indexentry_fts (rowid, body) VALUES (new.id, new.body);
+            END
+            """,
+            """
+            CREATE TRIGGER wagtailsearch_indexentry_fts_delete AFTER DELETE ON wagtailsearch_indexentry BEGIN
+                INSERT INTO wagtailsearch_indexentry_fts (wagtailsearch_indexentry_fts, rowid, body) VALUES ('delete', old.id, old.body);
+            END
+            """,
+            """
+            CREATE TRIGGER wagtailsearch_indexentry_fts_update AFTER UPDATE ON wagtailsearch_indexentry BEGIN
+                INSERT INTO wagtailsearch_indexentry_fts (wagtailsearch_indexentry_fts, rowid, body) VALUES ('delete', old.id, old.body);
+                INSERT INTO wagtailsearch_indexentry_fts (rowid, body) VALUES (new.id, new.body);
+            END
+            """,
+        ]
+    elif vendor == 'postgresql':
+        statements = [
+            'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            'CREATE INDEX wagtailsearch_indexentry_body_trgm ON wagtailsearch_indexentry USING gin (body gin_trgm_ops)',
+        ]
+    elif vendor == 'mysql':
+        statements = [
+            'ALTER TABLE wagtailsearch_indexentry ADD FULLTEXT INDEX wagtailsearch_indexentry_body_ft (body) WITH PARSER ngram',
+        ]
+    else:
+        return
+
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            for statement in statements:
+                schema_editor.execute(statement)
+    except DatabaseError:
+        pass
+
+
+def drop_body_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS wagtailsearch_indexentry_fts')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS wagtailsearch_indexentry_body_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wagtailsearch', '0006_indexwatermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'Index entry',
+                'verbose_name_plural': 'Index entries',
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_body_index, drop_body_index),
+    ]
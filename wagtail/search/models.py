@@ -1,10 +1,12 @@
 import datetime
 
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from wagtail.search.hits import get_hits_buffer_size, hit_buffer
 from wagtail.search.utils import MAX_QUERY_STRING_LENGTH, normalise_query_string
 
 
@@ -18,6 +20,10 @@ class Query(models.Model):
         super().save(*args, **kwargs)
 
     def add_hit(self, date=None):
+        if get_hits_buffer_size():
+            hit_buffer.add(self.query_string, date)
+            return
+
         if date is None:
             date = timezone.now().date()
         daily_hits, created = QueryDailyHits.objects.get_or_create(query=self, date=date)
@@ -45,6 +51,17 @@ class Query(models.Model):
     def get(cls, query_string):
         return cls.objects.get_or_create(query_string=normalise_query_string(query_string))[0]
 
+    @classmethod
+    def add_hit_for_query_string(cls, query_string, date=None):
+        """
+        Record a hit for the given query string. When hits are buffered (see the
+        WAGTAILSEARCH_HITS_BUFFER_SIZE setting), this doesn't query the database.
+        """
+        if get_hits_buffer_size():
+            hit_buffer.add(query_string, date)
+        else:
+            cls.get(query_string).add_hit(date)
+
     @classmethod
     def get_most_popular(cls, date_since=None):
         # TODO: Implement date_since
@@ -74,3 +91,80 @@ class QueryDailyHits(models.Model):
         )
         verbose_name = _('Query Daily Hits')
         verbose_name_plural = _('Query Daily Hits')
+
+
+class IndexQueueEntry(models.Model):
+    """
+    An object waiting to be added to (or deleted from) the search index, when
+    WAGTAILSEARCH_INDEX_QUEUE is set to 'database'
+    """
+    ACTION_UPDATE = 'update'
+    ACTION_DELETE = 'delete'
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    object_id = models.CharField(max_length=255)
+    action = models.CharField(max_length=10, choices=[
+        (ACTION_UPDATE, _('update')),
+        (ACTION_DELETE, _('delete')),
+    ])
+    queued_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (
+            ('content_type', 'object_id'),
+        )
+        verbose_name = _('Index queue entry')
+        verbose_name_plural = _('Index queue entries')
+
+
+class IndexWatermark(models.Model):
+    """
+    Records when the objects of a model were last indexed into a search backend, so
+    that ``update_index --incremental`` only needs to index the objects that have
+    changed since
+    """
+    backend_name = models.CharField(max_length=255)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    last_indexed_at = models.DateTimeField()
+
+    @classmethod
+    def get_for_model(cls, backend_name, model):
+        watermark = cls.objects.filter(
+            backend_name=backend_name,
+            content_type=ContentType.objects.get_for_model(model, for_concrete_model=False),
+        ).first()
+        return watermark.last_indexed_at if watermark else None
+
+    @classmethod
+    def set_for_model(cls, backend_name, model, last_indexed_at):
+        cls.objects.update_or_create(
+            backend_name=backend_name,
+            content_type=ContentType.objects.get_for_model(model, for_concrete_model=False),
+            defaults={'last_indexed_at': last_indexed_at},
+        )
+
+    class Meta:
+        unique_together = (
+            ('backend_name', 'content_type'),
+        )
+        verbose_name = _('Index watermark')
+        verbose_name_plural = _('Index watermarks')
+
+
+class IndexEntry(models.Model):
+    """
+    The searchable text of an object, used by the database search backend when its
+    ``SEARCH_TEXT_TABLE`` option is enabled. Searching this one narrow table (which is
+    indexed for substring matching where the database supports it) is much quicker
+    than searching every field of the model.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    object_id = models.CharField(max_length=255)
+    body = models.TextField()
+
+    class Meta:
+        unique_together = (
+            ('content_type', 'object_id'),
+        )
+        verbose_name = _('Index entry')
+        verbose_name_plural = _('Index entries')
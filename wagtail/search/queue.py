@@ -0,0 +1,290 @@
+"""
+Queueing of the search index updates made by the signal handlers, so that they can be
+sent to the search backends in bulk rather than one object at a time
+"""
+
+import logging
+import queue
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.utils import timezone
+
+from wagtail.search.backends import get_search_backends_with_name
+from wagtail.search.index import Indexed, get_indexed_instance
+
+logger = logging.getLogger('wagtail.search.index')
+
+ACTION_UPDATE = 'update'
+ACTION_DELETE = 'delete'
+
+INDEX_QUEUE_MODES = ('transaction', 'thread', 'database')
+
+# Changes made by the current thread that are waiting for their transaction to be committed
+_local = threading.local()
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_index_queue_mode():
+    """
+    Return the value of the WAGTAILSEARCH_INDEX_QUEUE setting, which is None if the
+    signal handlers update the search index straight away
+    """
+    mode = getattr(settings, 'WAGTAILSEARCH_INDEX_QUEUE', None)
+    if mode is not None and mode not in INDEX_QUEUE_MODES:
+        raise ImproperlyConfigured(
+            "WAGTAILSEARCH_INDEX_QUEUE must be one of %s, not %r" % (", ".join(INDEX_QUEUE_MODES), mode)
+        )
+    return mode
+
+
+class IndexQueue:
+    """
+    A set of objects that need to be updated in, or deleted from, the search index.
+    Each object is only recorded once, so an object that is saved several times is
+    only indexed once when the queue is flushed.
+    """
+    def __init__(self):
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, model, pk, action):
+        key = (model, pk)
+
+        # The latest action for an object wins
+        self.entries.pop(key, None)
+        self.entries[key] = action
+
+    def add_update(self, instance):
+        self.add(type(instance), instance.pk, ACTION_UPDATE)
+
+    def add_delete(self, instance):
+        # The object is gone once the queue is flushed, so find its indexed class now
+        indexed_instance = get_indexed_instance(instance, check_exists=False)
+        if indexed_instance:
+            self.add(type(indexed_instance), indexed_instance.pk, ACTION_DELETE)
+
+    def merge(self, other):
+        for (model, pk), action in other.entries.items():
+            self.add(model, pk, action)
+
+    def get_objects_to_index(self, model, pks):
+        """
+        Yield (model, objects) tuples for the objects of the given model and primary
+        keys that should be in the index, converted to the classes they are indexed as
+        """
+        if model.get_indexed_instance is Indexed.get_indexed_instance:
+            pks_by_model = {model: pks}
+        else:
+            pks_by_model = OrderedDict()
+            for instance in model._default_manager.filter(pk__in=pks):
+                indexed_instance = instance.get_indexed_instance()
+                if indexed_instance is not None:
+                    pks_by_model.setdefault(type(indexed_instance), []).append(indexed_instance.pk)
+
+        for indexed_model, indexed_pks in pks_by_model.items():
+            objects = list(indexed_model.get_indexed_objects().filter(pk__in=indexed_pks))
+            if objects:
+                yield indexed_model, objects
+
+    def flush(self):
+        """
+        Send the queued changes to all search backends that have AUTO_UPDATE enabled
+        and empty the queue.
+
+        The objects are reloaded from the database, so an object that was queued for
+        deletion in a transaction that was rolled back is indexed again rather than
+        deleted, and an object that no longer exists is not indexed.
+        """
+        entries, self.entries = self.entries, OrderedDict()
+        backends = list(get_search_backends_with_name(with_auto_update=True))
+        if not entries or not backends:
+            return
+
+        actions_by_model = OrderedDict()
+        for (model, pk), action in entries.items():
+            actions_by_model.setdefault(model, OrderedDict())[pk] = action
+
+        for model, actions in actions_by_model.items():
+            indexed_pks = set()
+
+            for indexed_model, objects in self.get_objects_to_index(model, list(actions.keys())):
+                indexed_pks.update(obj.pk for obj in objects)
+
+                for backend_name, backend in backends:
+                    try:
+                        backend.add_bulk(indexed_model, objects)
+                    except Exception:
+                        # Catch and log all errors
+                        logger.exception("Exception raised while adding %d %s objects into the '%s' search backend", len(objects), indexed_model.__name__, backend_name)
+
+            for pk, action in actions.items():
+                if action != ACTION_DELETE or pk in indexed_pks:
+                    continue
+
+                obj = model(pk=pk)
+                for backend_name, backend in backends:
+                    try:
+                        backend.delete(obj)
+                    except Exception:
+                        # Catch and log all errors
+                        logger.exception("Exception raised while deleting %r from the '%s' search backend", obj, backend_name)
+
+
+class IndexQueueWorker(threading.Thread):
+    """
+    A thread that flushes index queues in the background. Any queues that are waiting
+    when the worker picks up the next one are merged into it, so that objects changed
+    by several transactions are only indexed once.
+    """
+    def __init__(self):
+        super().__init__(name='wagtailsearch-index-queue', daemon=True)
+        self.queue = queue.Queue()
+
+    def put(self, index_queue):
+        self.queue.put(index_queue)
+
+    def run(self):
+        while True:
+            index_queue = self.queue.get()
+            merged = 1
+
+            while True:
+                try:
+                    index_queue.merge(self.queue.get_nowait())
+                    merged += 1
+                except queue.Empty:
+                    break
+
+            try:
+                index_queue.flush()
+            except Exception:
+                logger.exception("Exception raised while flushing the search index queue")
+            finally:
+                # Database connections are per-thread, so close the ones opened by this one
+                connections.close_all()
+
+                for i in range(merged):
+                    self.queue.task_done()
+
+
+def get_worker():
+    """
+    Return the IndexQueueWorker of this process, starting it if it isn't running yet
+    """
+    global _worker
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = IndexQueueWorker()
+            _worker.start()
+
+    return _worker
+
+
+def get_transaction_queue():
+    """
+    Return the queue of changes made by the current thread in the current transaction
+    """
+    try:
+        return _local.queue
+    except AttributeError:
+        _local.queue = IndexQueue()
+        return _local.queue
+
+
+def commit_transaction_queue():
+    """
+    Called once the current transaction is committed, to flush the changes that were
+    queued during it (either straight away or on the worker thread)
+    """
+    index_queue = get_transaction_queue()
+    if not index_queue:
+        # Already handled by an earlier callback of this transaction
+        return
+
+    _local.queue = IndexQueue()
+
+    if get_index_queue_mode() == 'thread':
+        get_worker().put(index_queue)
+    else:
+        index_queue.flush()
+
+
+def enqueue(instance, action):
+    """
+    Queue the given instance to be updated in, or deleted from, the search index
+    according to the WAGTAILSEARCH_INDEX_QUEUE setting
+    """
+    if get_index_queue_mode() == 'database':
+        enqueue_in_database(instance, action)
+        return
+
+    index_queue = get_transaction_queue()
+    if action == ACTION_DELETE:
+        index_queue.add_delete(instance)
+    else:
+        index_queue.add_update(instance)
+
+    # The callbacks of a transaction that is rolled back are discarded, so register one
+    # for every change. Changes left behind by the rolled back transaction are flushed
+    # along with the next one, which is harmless as objects are reloaded when flushed.
+    transaction.on_commit(commit_transaction_queue)
+
+
+def enqueue_in_database(instance, action):
+    from django.contrib.contenttypes.models import ContentType
+    from wagtail.search.models import IndexQueueEntry
+
+    if action == ACTION_DELETE:
+        instance = get_indexed_instance(instance, check_exists=False)
+        if not instance:
+            return
+
+    IndexQueueEntry.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(instance, for_concrete_model=False),
+        object_id=str(instance.pk),
+        defaults={'action': action},
+    )
+
+
+def process_database_queue(batch_size=100):
+    """
+    Flush the changes stored in the IndexQueueEntry table in batches, removing them
+    from the table as they are indexed. Returns the number of entries processed.
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from wagtail.search.models import IndexQueueEntry
+
+    processed = 0
+    last_pk = 0
+
+    while True:
+        started_at = timezone.now()
+        entries = list(IndexQueueEntry.objects.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+        if not entries:
+            return processed
+
+        index_queue = IndexQueue()
+        for entry in entries:
+            model = ContentType.objects.get_for_id(entry.content_type_id).model_class()
+            if model is not None:
+                index_queue.add(model, model._meta.pk.to_python(entry.object_id), entry.action)
+
+        index_queue.flush()
+
+        # Entries that were queued again while this batch was indexed are left for the next run
+        IndexQueueEntry.objects.filter(
+            pk__in=[entry.pk for entry in entries],
+            queued_at__lt=started_at,
+        ).delete()
+
+        processed += len(entries)
+        last_pk = entries[-1].pk
@@ -1,9 +1,15 @@
 from django.db.models.signals import post_delete, post_save
 
 from wagtail.search import index
+from wagtail.search.queue import ACTION_DELETE, ACTION_UPDATE, enqueue, get_index_queue_mode
 
 
 def post_save_signal_handler(instance, update_fields=None, **kwargs):
+    if get_index_queue_mode():
+        # Queued objects are reloaded from the database when they are indexed
+        enqueue(instance, ACTION_UPDATE)
+        return
+
     if update_fields is not None:
         # fetch a fresh copy of instance from the database to ensure
         # that we're not indexing any of the unsaved data contained in
@@ -14,6 +20,10 @@ def post_save_signal_handler(instance, update_fields=None, **kwargs):
 
 
 def post_delete_signal_handler(instance, **kwargs):
+    if get_index_queue_mode():
+        enqueue(instance, ACTION_DELETE)
+        return
+
     index.remove_object(instance)
 
 
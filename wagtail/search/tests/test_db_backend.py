@@ -1,6 +1,13 @@
 import unittest
 
-from django.test import TestCase
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from wagtail.search.backends.db import has_body_index
+from wagtail.search.models import IndexEntry
+from wagtail.tests.search import models
 
 from .test_backends import BackendTests
 
@@ -62,3 +69,83 @@ class TestDBBackend(BackendTests, TestCase):
     @unittest.expectedFailure
     def test_boost(self):
         super().test_boost()
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS={
+    'default': {
+        'BACKEND': 'wagtail.search.backends.db',
+        'SEARCH_TEXT_TABLE': True,
+    }
+})
+class TestDBBackendSearchTextTable(TestDBBackend):
+    # The search text includes related and callable fields, and the fields of child classes
+    def test_search_child_class_field_from_parent(self):
+        super().test_search_child_class_field_from_parent()
+
+    def test_search_on_related_fields(self):
+        super().test_search_on_related_fields()
+
+    def test_search_callable_field(self):
+        super().test_search_callable_field()
+
+    def test_index_entries(self):
+        novel = models.Novel.objects.get(title="A Game of Thrones")
+
+        # Entries are stored under the top-level model
+        entry = IndexEntry.objects.get(
+            content_type=ContentType.objects.get_for_model(models.Book), object_id=str(novel.pk))
+
+        self.assertIn("a game of thrones", entry.body)
+        self.assertIn("george r.r. martin", entry.body)
+
+    def test_search_uses_index_entries(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(self.backend.search("thrones", models.Book))
+
+        self.assertIn('wagtailsearch_indexentry', queries[-1]['sql'])
+
+        # Without a full-text index, the entries are searched with LIKE
+        if has_body_index(connection):
+            self.assertNotIn('LIKE', queries[-1]['sql'])
+        else:
+            self.assertIn('LIKE', queries[-1]['sql'])
+
+    def test_short_terms(self):
+        # Terms shorter than the trigrams of the full-text index fall back on LIKE
+        results = self.backend.search("ga", models.Novel)
+        self.assertIn("A Game of Thrones", [result.title for result in results])
+
+    def test_delete_removes_index_entry(self):
+        novel = models.Novel.objects.get(title="A Game of Thrones")
+        novel_id = novel.pk
+        novel.delete()
+
+        self.assertFalse(IndexEntry.objects.filter(
+            content_type=ContentType.objects.get_for_model(models.Book), object_id=str(novel_id)).exists())
+        self.assertEqual(list(self.backend.search("thrones", models.Book)), [])
+
+    def test_update_reindexes_object(self):
+        book = models.Book.objects.get(title="Learning Python")
+        book.title = "Learning Rust"
+        book.save()
+
+        self.assertEqual(
+            [result.title for result in self.backend.search("learning rust", models.Book)],
+            ["Learning Rust"]
+        )
+
+    def test_update_replaces_entry_of_every_class(self):
+        novel = models.Novel.objects.get(title="A Game of Thrones")
+
+        # Index the novel as a book too, as update_index does
+        self.backend.add_bulk(models.Book, [models.Book.objects.get(pk=novel.pk)])
+        self.backend.add_bulk(models.Novel, [novel])
+
+        novel.title = "A Dance with Dragons"
+        novel.save()
+
+        self.assertEqual(list(self.backend.search("thrones", models.Book)), [])
+        self.assertEqual(
+            [result.title for result in self.backend.search("dance with dragons", models.Book)],
+            ["A Dance with Dragons"]
+        )
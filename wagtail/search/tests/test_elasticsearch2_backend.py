@@ -583,6 +583,18 @@ class TestElasticsearch2Mapping(TestCase):
         self.assertDictEqual(document, expected_result)
 
 
+    def test_get_document_uses_prefetched_objects(self):
+        mapping = Elasticsearch2SearchBackend.mapping_class(models.Novel)
+
+        # authors, tags and characters are prefetched; protagonist is selected
+        with self.assertNumQueries(4):
+            novels = list(models.Novel.get_indexed_objects())
+
+        with self.assertNumQueries(0):
+            for novel in novels:
+                mapping.get_document(novel)
+
+
 class TestElasticsearch2MappingInheritance(TestCase):
     fixtures = ['search']
 
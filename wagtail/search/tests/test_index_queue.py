@@ -0,0 +1,195 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core import management
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from wagtail.search import queue
+from wagtail.search.backends.base import BaseSearchBackend
+from wagtail.search.models import IndexQueueEntry
+from wagtail.tests.search import models
+
+# Calls made to the backend below, as (method, model, primary keys) tuples
+calls = []
+
+
+class SearchBackend(BaseSearchBackend):
+    """
+    A search backend that records the objects that are added to and deleted from it
+    """
+    def add(self, obj):
+        calls.append(('add', type(obj), [obj.pk]))
+
+    def add_bulk(self, model, obj_list):
+        calls.append(('add_bulk', model, [obj.pk for obj in obj_list]))
+
+    def delete(self, obj):
+        calls.append(('delete', type(obj), [obj.pk]))
+
+
+BACKENDS = {
+    'default': {
+        'BACKEND': 'wagtail.search.tests.test_index_queue',
+    },
+}
+
+
+def create_book(title="Test book"):
+    return models.Book.objects.create(title=title, publication_date=datetime.date(2020, 1, 1), number_of_pages=100)
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=BACKENDS)
+class TestIndexQueue(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_coalesces_changes(self):
+        book = create_book()
+        other_book = create_book("Other book")
+
+        calls.clear()
+        index_queue = queue.IndexQueue()
+        index_queue.add_update(book)
+        index_queue.add_update(other_book)
+        index_queue.add_update(book)
+        self.assertEqual(len(index_queue), 2)
+
+        index_queue.flush()
+
+        self.assertEqual(calls, [('add_bulk', models.Book, [book.pk, other_book.pk])])
+        self.assertEqual(len(index_queue), 0)
+
+    def test_indexes_specific_class(self):
+        novel = models.Novel.objects.create(
+            title="Test novel", publication_date=datetime.date(2020, 1, 1), number_of_pages=100, setting="Space")
+
+        calls.clear()
+        index_queue = queue.IndexQueue()
+        index_queue.add_update(models.Book.objects.get(pk=novel.pk))
+        index_queue.flush()
+
+        self.assertEqual(calls, [('add_bulk', models.Novel, [novel.pk])])
+
+    def test_skips_objects_not_indexed(self):
+        book = create_book("Don't index me!")
+
+        calls.clear()
+        index_queue = queue.IndexQueue()
+        index_queue.add_update(book)
+        index_queue.flush()
+
+        self.assertEqual(calls, [])
+
+    def test_deletes_objects(self):
+        book = create_book()
+        models.Book.objects.filter(pk=book.pk).delete()
+
+        calls.clear()
+        index_queue = queue.IndexQueue()
+        index_queue.add_update(book)
+        index_queue.add_delete(book)
+        index_queue.flush()
+
+        self.assertEqual(calls, [('delete', models.Book, [book.pk])])
+
+    def test_reindexes_objects_that_still_exist(self):
+        # For example, if the transaction deleting the object was rolled back
+        book = create_book()
+
+        calls.clear()
+        index_queue = queue.IndexQueue()
+        index_queue.add(models.Book, book.pk, queue.ACTION_DELETE)
+        index_queue.flush()
+
+        self.assertEqual(calls, [('add_bulk', models.Book, [book.pk])])
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=BACKENDS, WAGTAILSEARCH_INDEX_QUEUE='transaction')
+class TestTransactionIndexQueue(TestCase):
+    def setUp(self):
+        calls.clear()
+        queue._local.queue = queue.IndexQueue()
+
+        self.callbacks = []
+        patcher = mock.patch('wagtail.search.queue.transaction.on_commit', side_effect=self.callbacks.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def commit(self):
+        for callback in self.callbacks:
+            callback()
+
+    def test_indexes_on_commit(self):
+        book = create_book()
+        book.title = "Updated"
+        book.save()
+        other_book = create_book("Other book")
+
+        self.assertEqual(calls, [])
+
+        self.commit()
+
+        self.assertEqual(calls, [('add_bulk', models.Book, [book.pk, other_book.pk])])
+
+    def test_deletes_on_commit(self):
+        book = create_book()
+        book_id = book.pk
+        book.delete()
+
+        self.commit()
+
+        self.assertEqual(calls, [('delete', models.Book, [book_id])])
+
+    @override_settings(WAGTAILSEARCH_INDEX_QUEUE='foo')
+    def test_invalid_setting(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        with self.assertRaises(ImproperlyConfigured):
+            create_book()
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=BACKENDS, WAGTAILSEARCH_INDEX_QUEUE='database')
+class TestDatabaseIndexQueue(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_stores_changes(self):
+        book = create_book()
+        book.save()
+        other_book = create_book("Other book")
+        other_book_id = other_book.pk
+        other_book.delete()
+
+        self.assertEqual(calls, [])
+        self.assertEqual(
+            set(IndexQueueEntry.objects.values_list('object_id', 'action')),
+            {(str(book.pk), 'update'), (str(other_book_id), 'delete')}
+        )
+
+    def test_process_index_queue_command(self):
+        book_ids = [create_book("Book %d" % i).pk for i in range(3)]
+        models.Book.objects.get(pk=book_ids[1]).delete()
+
+        management.call_command('process_index_queue', batch_size=2, stdout=StringIO())
+
+        self.assertEqual(calls, [
+            ('add_bulk', models.Book, [book_ids[0]]),
+            ('delete', models.Book, [book_ids[1]]),
+            ('add_bulk', models.Book, [book_ids[2]]),
+        ])
+        self.assertFalse(IndexQueueEntry.objects.exists())
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=BACKENDS, WAGTAILSEARCH_INDEX_QUEUE='thread')
+class TestThreadIndexQueue(TransactionTestCase):
+    # The worker thread has its own database connection, so changes must be committed
+    def setUp(self):
+        calls.clear()
+
+    def test_indexes_on_worker_thread(self):
+        book = create_book()
+
+        queue.get_worker().queue.join()
+
+        self.assertEqual(calls, [('add_bulk', models.Book, [book.pk])])
@@ -1,12 +1,14 @@
 import datetime
 import json
 from io import StringIO
+from unittest import mock
 
+from django import VERSION as DJANGO_VERSION
 from django.core import management
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 
 from wagtail.contrib.search_promotions.models import SearchPromotion
-from wagtail.search import models
+from wagtail.search import hits, models
 from wagtail.search.utils import normalise_query_string, separate_filters_from_query
 from wagtail.tests.utils import WagtailTestUtils
 
@@ -31,6 +33,72 @@ class TestHitCounter(TestCase):
         self.assertEqual(models.Query.get("Hello").hits, 10)
 
 
+@override_settings(WAGTAILSEARCH_HITS_BUFFER_SIZE=5)
+class TestBufferedHitCounter(TestCase):
+    def setUp(self):
+        hits.flush_hits()
+
+    def test_hits_are_buffered(self):
+        with self.assertNumQueries(0):
+            for i in range(4):
+                models.Query.add_hit_for_query_string("Hello")
+
+        self.assertFalse(models.Query.objects.exists())
+
+        hits.flush_hits()
+
+        self.assertEqual(models.Query.get("Hello").hits, 4)
+
+    def test_flushed_at_buffer_size(self):
+        for i in range(3):
+            models.Query.add_hit_for_query_string("  Hello ")
+        models.Query.get("World").add_hit()
+        models.Query.add_hit_for_query_string("hello")
+
+        self.assertEqual(len(hits.hit_buffer), 0)
+        self.assertEqual(models.Query.get("Hello").hits, 4)
+        self.assertEqual(models.Query.get("World").hits, 1)
+
+    def test_adds_to_existing_hits(self):
+        query = models.Query.get("Hello")
+        models.QueryDailyHits.objects.create(query=query, date=datetime.date(2020, 1, 1), hits=10)
+
+        for i in range(2):
+            query.add_hit(date=datetime.date(2020, 1, 1))
+        query.add_hit(date=datetime.date(2020, 1, 2))
+
+        if DJANGO_VERSION >= (2, 2):
+            # savepoint, find queries, create daily hits, two updates (one per date and number of hits), release savepoint
+            with self.assertNumQueries(6):
+                hits.flush_hits()
+        else:
+            # daily hits are created one at a time, see test_adds_to_existing_hits_before_django_2_2
+            hits.flush_hits()
+
+        self.assertEqual(query.daily_hits.get(date=datetime.date(2020, 1, 1)).hits, 12)
+        self.assertEqual(query.daily_hits.get(date=datetime.date(2020, 1, 2)).hits, 1)
+
+    def test_adds_to_existing_hits_before_django_2_2(self):
+        query = models.Query.get("Hello")
+        models.QueryDailyHits.objects.create(query=query, date=datetime.date(2020, 1, 1), hits=10)
+
+        hits.write_hits({("hello", datetime.date(2020, 1, 1)): 2, ("world", datetime.date(2020, 1, 1)): 1})
+
+        # bulk_create doesn't support ignore_conflicts, so objects are inserted one by one
+        with mock.patch('django.VERSION', (2, 1, 0, 'final', 0)):
+            hits.write_hits({("hello", datetime.date(2020, 1, 1)): 2, ("world", datetime.date(2020, 1, 2)): 1})
+
+        self.assertEqual(query.daily_hits.get(date=datetime.date(2020, 1, 1)).hits, 14)
+        self.assertEqual(models.Query.get("World").daily_hits.get(date=datetime.date(2020, 1, 1)).hits, 1)
+        self.assertEqual(models.Query.get("World").daily_hits.get(date=datetime.date(2020, 1, 2)).hits, 1)
+
+    @override_settings(WAGTAILSEARCH_HITS_BUFFER_TIMEOUT=0)
+    def test_flushed_after_timeout(self):
+        models.Query.add_hit_for_query_string("Hello")
+
+        self.assertEqual(models.Query.get("Hello").hits, 1)
+
+
 class TestQueryStringNormalisation(TestCase):
     def setUp(self):
         self.query = models.Query.get("  Hello  World!  ")
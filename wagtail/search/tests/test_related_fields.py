@@ -84,3 +84,53 @@ class TestSelectOnQuerySet(TestCase):
         # Tags should be prefetch_related
         self.assertIn('tags', queryset._prefetch_related_lookups)
         self.assertFalse(queryset.query.select_related)
+
+    def test_select_on_queryset_with_nested_foreign_key(self):
+        fields = index.RelatedFields('protagonist', [
+            index.RelatedFields('novel', [
+                index.SearchField('title'),
+            ]),
+        ])
+
+        queryset = fields.select_on_queryset(Novel.objects.all())
+
+        # ForeignKeys nested in a ForeignKey should be select_related together
+        self.assertFalse(queryset._prefetch_related_lookups)
+        self.assertEqual(queryset.query.select_related, {'protagonist': {'novel': {}}})
+
+    def test_select_on_queryset_with_nested_reverse_foreign_key(self):
+        fields = index.RelatedFields('categories', [
+            index.RelatedFields('category', [
+                index.SearchField('name')
+            ])
+        ])
+
+        queryset = fields.select_on_queryset(ManyToManyBlogPage.objects.all())
+
+        # relations nested in a prefetched relation should be prefetched along with it
+        self.assertEqual(queryset._prefetch_related_lookups, ('categories', 'categories__category'))
+
+    def test_select_on_queryset_with_nested_taggable_manager(self):
+        fields = index.RelatedFields('protagonist', [
+            index.RelatedFields('novel', [
+                index.FilterField('tags'),
+            ]),
+        ])
+
+        queryset = fields.select_on_queryset(Novel.objects.all())
+
+        self.assertEqual(queryset._prefetch_related_lookups, ('protagonist__novel__tags', ))
+
+    def test_filter_field_select_on_queryset_with_taggable_manager(self):
+        queryset = index.FilterField('tags').select_on_queryset(Novel.objects.all())
+
+        # Tags should be prefetch_related
+        self.assertIn('tags', queryset._prefetch_related_lookups)
+        self.assertFalse(queryset.query.select_related)
+
+    def test_filter_field_select_on_queryset_with_foreign_key(self):
+        queryset = index.FilterField('protagonist').select_on_queryset(Novel.objects.all())
+
+        # Only the ID is needed, so nothing should be fetched
+        self.assertFalse(queryset._prefetch_related_lookups)
+        self.assertFalse(queryset.query.select_related)
@@ -0,0 +1,241 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core import management
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from wagtail.core.models import Page
+from wagtail.search.backends.base import BaseSearchBackend
+from wagtail.search.models import IndexWatermark
+from wagtail.tests.search import models
+from wagtail.tests.testapp.models import EventPage, SimplePage
+
+# Indexes created by the backend below, by name, so the tests can inspect them
+indexes = {}
+
+
+class RecordingIndex:
+    def __init__(self, name):
+        self.name = name
+        self.items = []
+        self.deleted = []
+        self.started = 0
+        self.fail_after = None
+        self.lock = threading.Lock()
+
+    def add_model(self, model):
+        pass
+
+    def add_items(self, model, items):
+        with self.lock:
+            if self.fail_after is not None and len(self.items) >= self.fail_after:
+                raise RuntimeError("Indexing failed")
+
+            self.items.extend(item.pk for item in items)
+
+    def delete_item(self, item):
+        self.deleted.append(item.pk)
+
+
+class RecordingRebuilder:
+    def __init__(self, index):
+        self.index = index
+
+    def start(self):
+        self.index.started += 1
+        self.index.items = []
+        return self.index
+
+    def finish(self):
+        pass
+
+
+class SearchBackend(BaseSearchBackend):
+    """
+    A search backend that only indexes novels and pages, and records the IDs of the
+    objects that are added to its indexes
+    """
+    rebuilder_class = RecordingRebuilder
+
+    def index_class(self, backend, name):
+        return indexes[name]
+
+    def get_index_for_model(self, model):
+        if model is models.Novel:
+            return indexes.setdefault('novels', RecordingIndex('novels'))
+        if issubclass(model, Page):
+            return indexes.setdefault('pages', RecordingIndex('pages'))
+
+
+BACKENDS = {
+    'default': {
+        'BACKEND': 'wagtail.search.backends.db',
+    },
+    'recording': {
+        'BACKEND': 'wagtail.search.tests.test_update_index',
+        'AUTO_UPDATE': False,
+    },
+}
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=BACKENDS)
+class TestUpdateIndexCommand(TestCase):
+    fixtures = ['search']
+
+    def setUp(self):
+        indexes.clear()
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(self.checkpoint_dir, 'checkpoint.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.checkpoint_dir)
+
+    def run_command(self, **options):
+        management.call_command('update_index', backend_name='recording', stdout=StringIO(), **options)
+
+    def get_novel_ids(self):
+        return list(models.Novel.objects.order_by('pk').values_list('pk', flat=True))
+
+    def test_indexes_all_objects(self):
+        self.run_command(chunk_size=3)
+
+        self.assertEqual(indexes['novels'].items, self.get_novel_ids())
+
+    def test_chunks_fetched_by_primary_key(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.run_command(chunk_size=3)
+
+        novel_queries = [query['sql'] for query in queries if 'searchtests_novel' in query['sql']]
+        self.assertTrue(novel_queries)
+        for sql in novel_queries:
+            self.assertNotIn('OFFSET', sql)
+
+    def test_resume_from_checkpoint(self):
+        novel_ids = self.get_novel_ids()
+        indexes['novels'] = RecordingIndex('novels')
+        indexes['novels'].fail_after = 6
+
+        with self.assertRaises(RuntimeError):
+            self.run_command(chunk_size=3, checkpoint=self.checkpoint_path)
+
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        self.assertEqual(checkpoint['recording']['novels']['models']['searchtests.Novel'], novel_ids[5])
+
+        indexes['novels'].fail_after = None
+        self.run_command(chunk_size=3, checkpoint=self.checkpoint_path, resume=True)
+
+        # The index was not started again, and indexing carried on after the checkpoint
+        self.assertEqual(indexes['novels'].started, 1)
+        self.assertEqual(indexes['novels'].items, novel_ids)
+
+        # Everything was indexed, so the checkpoint is removed
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_resume_without_checkpoint_file_rebuilds(self):
+        self.run_command(chunk_size=3, checkpoint=self.checkpoint_path, resume=True)
+
+        self.assertEqual(indexes['novels'].started, 1)
+        self.assertEqual(indexes['novels'].items, self.get_novel_ids())
+
+    def test_resume_requires_checkpoint(self):
+        with self.assertRaises(CommandError):
+            self.run_command(resume=True)
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=BACKENDS)
+class TestUpdateIndexCommandWorkers(TransactionTestCase):
+    # Worker threads have their own database connections, so the fixtures need committing
+    fixtures = ['search']
+
+    def setUp(self):
+        indexes.clear()
+
+    def test_indexes_all_objects(self):
+        management.call_command('update_index', backend_name='recording', stdout=StringIO(), chunk_size=2, workers=3)
+
+        self.assertEqual(
+            sorted(indexes['novels'].items),
+            list(models.Novel.objects.order_by('pk').values_list('pk', flat=True))
+        )
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=BACKENDS)
+class TestUpdateIndexCommandIncremental(TestCase):
+    fixtures = ['test']
+
+    def setUp(self):
+        indexes.clear()
+
+    def run_command(self, **options):
+        output = StringIO()
+        management.call_command('update_index', backend_name='recording', stdout=output, **options)
+        return output.getvalue()
+
+    def test_indexes_everything_without_watermark(self):
+        self.run_command(incremental=True)
+
+        self.assertEqual(sorted(indexes['pages'].items), sorted(Page.objects.values_list('pk', flat=True)))
+        self.assertTrue(IndexWatermark.objects.filter(backend_name='recording').exists())
+
+    def test_indexes_changed_pages(self):
+        self.run_command()
+        indexes['pages'].items = []
+
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_page.title = "Christmas 2020"
+        christmas_page.save_revision()
+
+        output = self.run_command(incremental=True)
+
+        self.assertEqual(indexes['pages'].items, [christmas_page.pk])
+        self.assertEqual(indexes['pages'].deleted, [])
+        self.assertIn("searchtests.Novel has no search_timestamp_fields, skipping", output)
+
+        # The watermark has moved on, so nothing is indexed the next time
+        indexes['pages'].items = []
+        self.run_command(incremental=True)
+        self.assertEqual(indexes['pages'].items, [])
+
+    def test_removes_changed_pages_that_are_no_longer_indexed(self):
+        self.run_command()
+
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_page.save_revision()
+
+        indexed_objects = EventPage.get_indexed_objects().exclude(pk=christmas_page.pk)
+        with mock.patch.object(EventPage, 'get_indexed_objects', return_value=indexed_objects):
+            self.run_command(incremental=True)
+
+        self.assertEqual(indexes['pages'].deleted, [christmas_page.pk])
+
+    def test_since(self):
+        page = SimplePage.objects.first()
+        page.save_revision()
+        indexes.clear()
+
+        self.run_command(since='2000-01-01')
+
+        # pages that have never been edited have no timestamps to compare
+        self.assertIn(page.pk, indexes['pages'].items)
+        self.assertNotIn(Page.objects.get(depth=1).pk, indexes['pages'].items)
+
+        indexes.clear()
+        self.run_command(since='2100-01-01T12:00')
+        self.assertEqual(indexes['pages'].items, [])
+
+    def test_invalid_since(self):
+        with self.assertRaises(CommandError):
+            self.run_command(since='yesterday')
+
+    def test_incremental_with_checkpoint(self):
+        with self.assertRaises(CommandError):
+            self.run_command(incremental=True, checkpoint='checkpoint.json')